@@ -0,0 +1,73 @@
+"""Benchmark the Jira cache backends with 100k cached issues.
+
+For each backend (a JSON file per issue, or one SQLite database), times
+writing the issues one at a time and in one batch, looking them all up
+one by one (what fetch_issue does) and in one batch (what enrichment
+does), a lookup of 3,000 issues in the full cache, and clearing it.
+
+Usage: python benchmarks/bench_cache.py [NUM_ISSUES]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from reportminer import cache
+from reportminer.cache import CACHE_BACKENDS, FileCache
+
+# Issues looked up by a typical enrichment
+LOOKUP_KEYS = 3000
+
+
+def make_issue(i: int) -> dict:
+    return {
+        "key": f"TMS-{i}",
+        "summary": f"Verify that feature {i} handles edge case {i % 97}",
+        "test_steps": "\n".join(f"{n}. Do step {n} of test {i}" for n in range(1, 6)),
+    }
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench(backend: str, count: int, root: Path) -> None:
+    cache.CACHE_DIR = root / backend
+    issues = {f"TMS-{i}": make_issue(i) for i in range(count)}
+    keys = list(issues)
+    subset = keys[::max(count // LOOKUP_KEYS, 1)][:LOOKUP_KEYS]
+
+    file_cache = FileCache("jira", backend=backend)
+    set_each = timed(lambda: [file_cache.set(key, value) for key, value in issues.items()])
+    file_cache.clear()
+    set_batch = timed(lambda: file_cache.set_many(issues))
+
+    # Fresh caches, so each lookup pays for opening the store
+    file_cache = FileCache("jira", backend=backend)
+    get_each = timed(lambda: [file_cache.lookup(key) for key in keys])
+    file_cache = FileCache("jira", backend=backend)
+    get_batch = timed(lambda: file_cache.lookup_many(keys))
+    file_cache = FileCache("jira", backend=backend)
+    get_subset = timed(lambda: file_cache.lookup_many(subset))
+    clear = timed(file_cache.clear)
+
+    print(
+        f"{backend:<8}{set_each:>9.2f}s {set_batch:>9.2f}s {get_each:>9.2f}s "
+        f"{get_batch:>9.2f}s {get_subset * 1000:>10.1f}ms {clear:>8.2f}s"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{count} cached issues")
+    print(f"{'backend':<8}{'set each':>10} {'set batch':>9} {'get each':>9} {'get batch':>9} {'get ' + str(LOOKUP_KEYS):>12} {'clear':>8}")
+    with tempfile.TemporaryDirectory() as root:
+        for backend in CACHE_BACKENDS:
+            bench(backend, count, Path(root))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark writing formatted output for 100k failures.
+
+Compares building the whole output as one string and writing it (what
+the CLI did before) against streaming it line by line with write_to,
+for -f detailed (long, multi-line reasons) and grouped raw output. Then
+times the export formats, with logs built on demand like parsed reports
+have them. Peak memory is traced Python allocation above the results
+table.
+
+Usage: python benchmarks/bench_formatters.py [NUM_FAILURES]
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from functools import partial
+
+from reportminer.formatters import get_formatter
+from reportminer.models import TestResult, TestStatus
+from reportminer.table import ResultTable
+
+# Traceback-like reasons, a few hundred bytes each
+REASON_LINES = 8
+# Execution logs, a few kilobytes each
+LOG_LINES = 40
+
+
+def make_log(i: int) -> str:
+    return "\n".join(f"2024-01-15 10:32:{n % 60:02d} INFO [worker-{i}] step {n} done" for n in range(LOG_LINES))
+
+
+def make_result(i: int) -> TestResult:
+    result = TestResult(
+        tms_number=f"TMS_{100000 + i}",
+        test_name=f"test_case_{i}",
+        test_id=f"tests/test_mod.py::test_case_{i}",
+        status=TestStatus.FAILED,
+        failure_reason="\n".join(
+            f"  File \"tests/test_mod.py\", line {i % 500 + n}, in step_{n}: expected {i} got {i + n}"
+            for n in range(REASON_LINES)
+        ),
+    )
+    result.defer_execution_log(partial(make_log, i))
+    return result
+
+
+def make_table(count: int) -> ResultTable:
+    return ResultTable.from_results(map(make_result, range(count)))
+
+
+def build_string(formatter, table, path):
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(formatter.format(table) + "\n")
+
+
+def stream(formatter, table, path):
+    with open(path, "wb" if formatter.binary else "w", **({} if formatter.binary else {"encoding": "utf-8"})) as fp:
+        formatter.write_to(table, fp)
+
+
+def measure(func, formatter, table, path) -> tuple:
+    # Warm up, so reason keys are already computed for grouped output
+    func(formatter, table, path)
+    start = time.perf_counter()
+    func(formatter, table, path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(formatter, table, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    table = make_table(count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.txt")
+        print(f"{count} failures")
+        print(f"{'':<22}{'output':>10}{'string time':>13}{'peak':>10}{'stream time':>13}{'peak':>10}")
+        for label, formatter in [("detailed", get_formatter("detailed")), ("raw -g", get_formatter("raw", group=True))]:
+            old_time, old_peak = measure(build_string, formatter, table, path)
+            size = os.path.getsize(path)
+            new_time, new_peak = measure(stream, formatter, table, path)
+            print(
+                f"{label:<22}{size / 1e6:>8.1f}MB{old_time:>12.2f}s{old_peak / 1e6:>8.1f}MB"
+                f"{new_time:>12.2f}s{new_peak / 1e6:>8.1f}MB"
+            )
+
+        print()
+        print(f"{'export':<22}{'output':>10}{'time':>13}{'peak':>10}")
+        exports = ["ndjson", "csv"]
+        if importlib.util.find_spec("pyarrow"):
+            exports.append("parquet")
+        for name in exports:
+            for with_logs in (False, True):
+                formatter = get_formatter(name, with_logs=with_logs)
+                elapsed, peak = measure(stream, formatter, table, path)
+                label = f"{name} --with-logs" if with_logs else name
+                print(f"{label:<22}{os.path.getsize(path) / 1e6:>8.1f}MB{elapsed:>12.2f}s{peak / 1e6:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark the group-by-reason stage on 100k failures.
+
+Grouped output used to normalize every failure reason each time a
+formatter grouped the results. Reason keys are now memoized on each
+TestResult (and computed per distinct reason for a ResultTable), so
+grouping the same results again, as the formatters, the compare sections
+and the TUI do, reuses them. Times the first and repeated grouping of a
+list and of a table against normalizing each reason on every call.
+
+Usage: python benchmarks/bench_grouping.py [NUM_FAILURES]
+"""
+
+import sys
+import time
+
+from bench_signatures import make_reasons
+
+from reportminer.grouping import group_by_reason
+from reportminer.models import TestResult, TestStatus
+from reportminer.signatures import MAX_KEY_LENGTH, NO_REASON, failure_signature, reason_key
+from reportminer.table import ResultTable
+
+
+def uncached_key(reason):
+    """The reason key without any caching, as every call computed it before."""
+    key = failure_signature(reason) or NO_REASON
+    if len(key) > MAX_KEY_LENGTH:
+        key = key[:MAX_KEY_LENGTH - 3] + "..."
+    return key
+
+
+def uncached_group(results: list) -> list:
+    """Grouping that normalizes every reason on every call."""
+    groups = {}
+    for r in results:
+        groups.setdefault(uncached_key(r.failure_reason), []).append(r)
+    return sorted(groups.items(), key=lambda x: -len(x[1]))
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def make_results(reasons: list) -> list:
+    return [
+        TestResult(tms_number=f"TMS_{i}", test_name="t", test_id="t", status=TestStatus.FAILED, failure_reason=reason)
+        for i, reason in enumerate(reasons)
+    ]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    reasons = make_reasons(count)
+    results = make_results(reasons)
+    table = ResultTable.from_results(make_results(reasons))
+
+    print(f"{count} failures, {len(set(reasons))} distinct reasons")
+    print(f"{'':<28}{'first':>10}{'again':>10}")
+    old_first = timed(lambda: uncached_group(results))
+    old_again = timed(lambda: uncached_group(results))
+    print(f"{'uncached (list)':<28}{old_first * 1000:>8.0f}ms{old_again * 1000:>8.0f}ms")
+
+    reason_key.cache_clear()
+    first = timed(lambda: group_by_reason(results))
+    again = timed(lambda: group_by_reason(results))
+    print(f"{'group_by_reason (list)':<28}{first * 1000:>8.0f}ms{again * 1000:>8.0f}ms")
+
+    reason_key.cache_clear()
+    first = timed(lambda: group_by_reason(table))
+    again = timed(lambda: group_by_reason(table))
+    print(f"{'group_by_reason (table)':<28}{first * 1000:>8.0f}ms{again * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Benchmark enriching 3,000 failures from a Jira with simulated latency.
+
+A fake Jira answers every request after a fixed delay, standing in for
+the round trip to Jira Cloud. Compares one GET per issue (what
+enrich_results did first) against batched JQL searches, one at a time
+and MINE_JIRA_CONCURRENCY at once, each from a cold cache.
+
+Then enriches ten times as many failures from a Jira that allows
+RATE_LIMIT requests per second and answers the rest with 429 and
+Retry-After, with and without the client pacing itself to that rate.
+
+Finally enriches from a cache whose entries have all expired, timing
+how soon enrichment returns (stale issues are served at once) and when
+the background refresh is done. Before stale-while-revalidate, expiry
+meant waiting for the whole refetch.
+
+Usage: python benchmarks/bench_jira.py [NUM_FAILURES] [LATENCY_MS]
+"""
+
+import asyncio
+import json
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from reportminer import cache, config
+from reportminer.jira_client import JiraClient
+from reportminer.models import TestResult, TestStatus
+
+# Requests per second the rate-limited fake Jira allows
+RATE_LIMIT = 10
+
+
+def make_results(count: int) -> list[TestResult]:
+    return [
+        TestResult(tms_number=f"TMS_{i}", test_name=f"test_{i}", test_id=f"test_{i}", status=TestStatus.FAILED)
+        for i in range(count)
+    ]
+
+
+def issue(key: str) -> dict:
+    return {"key": key, "fields": {"summary": f"Summary of {key}"}}
+
+
+def respond(request: httpx.Request) -> httpx.Response:
+    if request.method == "GET":
+        return httpx.Response(200, json=issue(request.url.path.rsplit("/", 1)[1]))
+    body = json.loads(request.content)
+    keys = re.fullmatch(r"key in \((.*)\)", body["jql"]).group(1).split(", ")
+    return httpx.Response(200, json={"issues": [issue(key) for key in keys], "isLast": True})
+
+
+def make_client(latency: float, rate_limit: float = 0) -> tuple[JiraClient, list]:
+    requests = []
+    # Jira's own token bucket: rate_limit per second, bursts of as many
+    bucket = [float(rate_limit), time.monotonic()]
+
+    def limited() -> bool:
+        if not rate_limit:
+            return False
+        now = time.monotonic()
+        bucket[0] = min(rate_limit, bucket[0] + (now - bucket[1]) * rate_limit)
+        bucket[1] = now
+        if bucket[0] < 1:
+            return True
+        bucket[0] -= 1
+        return False
+
+    def handle(request):
+        requests.append(request)
+        time.sleep(latency)
+        return respond(request)
+
+    async def handle_async(request):
+        requests.append(request)
+        await asyncio.sleep(latency)
+        if limited():
+            return httpx.Response(429, headers={"Retry-After": "1"})
+        return respond(request)
+
+    client = JiraClient(
+        transport=httpx.MockTransport(handle),
+        async_transport=httpx.MockTransport(handle_async),
+    )
+    return client, requests
+
+
+def per_issue(client: JiraClient, results: list[TestResult]) -> None:
+    for result in results:
+        result.jira_summary = client.fetch_issue(result.tms_jira_format).summary
+
+
+def batched(client: JiraClient, results: list[TestResult]) -> None:
+    client.enrich_results(results)
+
+
+def run(label, enrich, count, latency, cache_root, rate_limit=0):
+    cache.CACHE_DIR = Path(tempfile.mkdtemp(dir=cache_root))
+    client, requests = make_client(latency, rate_limit)
+    results = make_results(count)
+    start = time.perf_counter()
+    enrich(client, results)
+    elapsed = time.perf_counter() - start
+    metrics = client.metrics
+    enriched = sum(1 for result in results if result.jira_summary)
+    print(
+        f"{label:<34} {len(requests):>6} requests  {elapsed:>8.2f}s  "
+        f"{metrics.rate_limited:>4} limited  {metrics.retries:>4} retries  {enriched:>6} enriched"
+    )
+
+
+def run_stale(count, latency, cache_root):
+    cache.CACHE_DIR = Path(tempfile.mkdtemp(dir=cache_root))
+    client, _ = make_client(latency)
+    client.enrich_results(make_results(count))
+
+    # Every entry is past a zero TTL
+    ttl, cache.CACHE_TTL_HOURS = cache.CACHE_TTL_HOURS, 0
+    client, requests = make_client(latency)
+    cache.CACHE_TTL_HOURS = ttl
+    results = make_results(count)
+    start = time.perf_counter()
+    client.enrich_results(results)
+    returned = time.perf_counter() - start
+    client.wait_for_revalidation()
+    refreshed = time.perf_counter() - start
+    print(f"{'expired cache':<34} {len(requests):>6} requests  {returned:>8.2f}s to return, {refreshed:.2f}s to refresh")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    config.JIRA_BASE_URL = "https://jira.example.com"
+    config.JIRA_EMAIL = "bench@example.com"
+    config.JIRA_TOKEN = "token"
+    # Unpaced unless a run sets a rate
+    config.JIRA_RATE_LIMIT = 0
+    concurrency = config.JIRA_CONCURRENCY
+
+    print(f"Enriching {count} failures, {latency * 1000:.0f}ms per request")
+    with tempfile.TemporaryDirectory() as cache_root:
+        run("one GET per issue", per_issue, count, latency, cache_root)
+        config.JIRA_CONCURRENCY = 1
+        run("batched searches, 1 at a time", batched, count, latency, cache_root)
+        config.JIRA_CONCURRENCY = concurrency
+        run(f"batched searches, {concurrency} at a time", batched, count, latency, cache_root)
+
+        print()
+        print(f"Enriching {count * 10} failures, Jira allowing {RATE_LIMIT} requests/s")
+        run("unpaced", batched, count * 10, latency, cache_root, RATE_LIMIT)
+        config.JIRA_RATE_LIMIT = RATE_LIMIT
+        run(f"paced to {RATE_LIMIT}/s", batched, count * 10, latency, cache_root, RATE_LIMIT)
+
+        print()
+        config.JIRA_RATE_LIMIT = 0
+        run_stale(count, latency, cache_root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark log cleaning on synthetic logs of 1, 10 and 100 MB.
+
+Usage: python benchmarks/bench_logclean.py [SIZE_MB ...]
+"""
+
+import html
+import re
+import sys
+import time
+
+from reportminer.logclean import clean_log_content
+
+
+def five_pass_clean(content: str) -> str:
+    """The previous implementation, for comparison."""
+    content = html.unescape(content)
+    content = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])").sub("", content)
+    content = content.replace("\r\n", "\n").replace("\r", "\n")
+    content = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", content)
+    content = re.sub(r"\n{3,}", "\n\n", content)
+    return content.strip()
+
+
+LINES = {
+    "plain": "2024-05-01 12:00:{n:02d},123 INFO [worker-3] step {n} finished in 0.{n:03d}s\n",
+    "ansi": "\x1b[32m2024-05-01 12:00:{n:02d}\x1b[0m \x1b[1mINFO\x1b[0m [worker-3] step {n} finished\n",
+    "crlf": "2024-05-01 12:00:{n:02d},123 INFO [worker-3] step {n} finished in 0.{n:03d}s\r\n",
+    "escaped": "2024-05-01 12:00:{n:02d} DEBUG response=&lt;Response [{n}]&gt; body=&quot;ok&quot;\n",
+    "unicode": "2024-05-01 12:00:{n:02d},123 INFO [worker-3] \u2713 étape {n} terminée\n",
+}
+
+
+def make_log(kind: str, size: int) -> str:
+    """A log of roughly size characters, with an occasional blank-line gap."""
+    block = "".join(LINES[kind].format(n=n % 60) for n in range(100)) + "\n\n\n"
+    return block * (size // len(block) + 1)
+
+
+def timed(func, content: str) -> float:
+    start = time.perf_counter()
+    func(content)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100]
+    print(f"{'log':<10}{'MB':>6}{'five-pass':>12}{'pre-checked':>14}{'speedup':>10}")
+    for size_mb in sizes:
+        for kind in LINES:
+            content = make_log(kind, size_mb << 20)
+            assert clean_log_content(content) == five_pass_clean(content)
+            old = timed(five_pass_clean, content)
+            new = timed(clean_log_content, content)
+            print(f"{kind:<10}{size_mb:>6}{old:>11.3f}s{new:>13.3f}s{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
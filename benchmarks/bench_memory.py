@@ -0,0 +1,86 @@
+"""Benchmark peak RSS and time of the report reading modes.
+
+Each mode runs in a fresh subprocess so peak RSS isn't shared (Linux only).
+
+Usage: python benchmarks/bench_memory.py [NUM_TESTS] [PADDING_MB]
+"""
+
+import html
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_parser import make_test_data
+
+
+MODES = {
+    # What parse_report did before memory-mapping
+    "read_text": (
+        "from reportminer.parser import extract_json_data\n"
+        "data = extract_json_data(path.read_text(encoding='utf-8'))\n"
+        "count = sum(len(runs) for runs in data['tests'].values())\n"
+    ),
+    "mmap": (
+        "from reportminer.parser import parse_report\n"
+        "count = sum(1 for _ in parse_report(path, statuses=()))\n"
+    ),
+    "low_memory": (
+        "from reportminer.parser import parse_report\n"
+        "count = sum(1 for _ in parse_report(path, statuses=(), low_memory=True))\n"
+    ),
+}
+
+# Peak RSS comes from VmHWM: ru_maxrss survives exec on Linux and would
+# include the parent's report generation
+RUNNER = """
+import sys, time
+from pathlib import Path
+path = Path(sys.argv[1])
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+status = Path("/proc/self/status").read_text()
+peak_kb = int(status.split("VmHWM:")[1].split()[0])
+print(f"{{elapsed:.3f}} {{peak_kb / 1024:.1f}}")
+"""
+
+
+def write_report(path: Path, num_tests: int, padding_mb: int) -> None:
+    """Write a pytest-html style report with inline assets around the blob."""
+    tests = {
+        f"tests/test_mod.py::test_TMS_{100000 + i}_case": [make_test_data(i)]
+        for i in range(num_tests)
+    }
+    blob = html.escape(json.dumps({"tests": tests}))
+    padding = "/* inline css and js */\n" * (padding_mb * 1024 * 1024 // 24)
+    path.write_text(
+        f"<html><head><style>{padding}</style></head><body>"
+        f'<div id="data-container" data-jsonblob="{blob}"></div>'
+        f"<script>{padding}</script></body></html>",
+        encoding="utf-8",
+    )
+
+
+def main() -> None:
+    num_tests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    padding_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "report.html"
+        write_report(report, num_tests, padding_mb)
+        print(f"{num_tests} tests, {report.stat().st_size / 1e6:.1f} MB report")
+
+        for mode, body in MODES.items():
+            output = subprocess.run(
+                [sys.executable, "-c", RUNNER.format(body=body), str(report)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            print(f"{mode:<12} {float(output[0]):8.3f}s  peak RSS {float(output[1]):8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark memory held by parsed results: dataclass vs slotted TestResult.
+
+Simulates a week of runs of one suite - the same tests reported again and
+again, with each result's strings freshly decoded as the parser would.
+
+Usage: python benchmarks/bench_models.py [NUM_RESULTS ...]
+
+tracemalloc slows allocation down, so 1M results take a couple of minutes.
+"""
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from reportminer.models import ReasonTable, TestResult, TestStatus
+
+
+@dataclass
+class DataclassResult:
+    """The previous dict-backed TestResult, for comparison."""
+    tms_number: str
+    test_name: str
+    test_id: str
+    status: TestStatus
+    failure_reason: Optional[str] = None
+    duration: Optional[str] = None
+    timestamp: Optional[str] = None
+    jira_summary: Optional[str] = None
+    jira_test_steps: Optional[str] = None
+    execution_log: Optional[str] = None
+
+
+# Distinct tests in the suite; results beyond this are reruns across reports
+SUITE_SIZE = 20_000
+
+REASONS = [
+    "AssertionError: Expected status 200 but got 500",
+    "TimeoutError: Timed out after 30 seconds waiting for element",
+    "ConnectionError: Connection refused by device under test",
+]
+
+
+def fresh(text: str) -> str:
+    """A new string object, like json.loads produces for every report."""
+    return "".join(list(text))
+
+
+def make_results(cls, count: int) -> list:
+    # The parser shares reasons for the slotted results
+    share = ReasonTable().share if cls is TestResult else (lambda reason: reason)
+    results = []
+    for i in range(count):
+        test = i % SUITE_SIZE
+        failed = i % 10 == 0
+        results.append(cls(
+            tms_number=fresh(f"TMS_{100000 + test}"),
+            test_name=fresh(f"test_TMS_{100000 + test}_case"),
+            test_id=fresh(f"tests/suite_{test % 40}/test_module.py::test_TMS_{100000 + test}_case"),
+            status=TestStatus.FAILED if failed else TestStatus.PASSED,
+            failure_reason=share(fresh(REASONS[i % len(REASONS)])) if failed else None,
+            duration=fresh(f"00:00:{i % 60:02d}"),
+            timestamp=fresh(f"12:{(i // 60) % 60:02d}:{i % 60:02d}"),
+        ))
+    return results
+
+
+def measure(cls, count: int) -> float:
+    """MB allocated by count results that are still alive."""
+    gc.collect()
+    tracemalloc.start()
+    results = make_results(cls, count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return current / (1 << 20)
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    print(f"{'results':>10}{'dataclass':>12}{'slotted':>12}{'saved':>8}")
+    for count in counts:
+        before = measure(DataclassResult, count)
+        after = measure(TestResult, count)
+        print(f"{count:>10}{before:>10.1f}MB{after:>10.1f}MB{1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
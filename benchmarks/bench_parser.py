@@ -0,0 +1,73 @@
+"""Benchmark per-test parsing cost on a synthetic pytest-html report.
+
+Usage: python benchmarks/bench_parser.py [NUM_TESTS]
+"""
+
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from reportminer import parser
+from reportminer.logclean import clean_log_content
+
+
+def make_test_data(i: int) -> dict:
+    """One pytest-html test entry with a reason cell and a logged <pre> block."""
+    status = "failed" if i % 10 == 0 else "passed"
+    reason = "AssertionError: Expected [200] but got [500]" if status == "failed" else ""
+    log_lines = "\n".join(f"INFO [worker-{i}] step {n} &lt;ok&gt;" for n in range(20))
+    return {
+        "result": status.capitalize(),
+        "duration": "00:00:01",
+        "resultsTableRow": [
+            f"<td class=\"col-result\">{status.capitalize()}</td>",
+            f"<td class=\"col-name\">tests/test_mod.py::test_TMS_{100000 + i}_case</td>",
+            "<td class=\"col-duration\">00:00:01</td>",
+            f"<td class=\"col-reason\"><b>{reason}</b></td>",
+            f"<td class=\"extra\"><div class=\"log\"><pre>{log_lines}</pre></div></td>",
+        ],
+    }
+
+
+def soup_row_parse(test_data: dict) -> None:
+    """The BeautifulSoup-per-cell approach, for comparison."""
+    row = test_data["resultsTableRow"]
+    BeautifulSoup(row[3], "html.parser").get_text(strip=True)
+    for cell in row:
+        if "log" in cell.lower() or "pre" in cell.lower():
+            for pre in BeautifulSoup(cell, "html.parser").find_all("pre"):
+                clean_log_content(pre.get_text())
+
+
+def parse_with_log(test_id: str, test_data: dict) -> None:
+    """parse_test_result, also building the log it defers.
+
+    The baseline cleans every log, so the timed work has to match.
+    """
+    result = parser.parse_test_result(test_id, test_data)
+    if result:
+        result.execution_log
+
+
+def bench(label: str, func, items: list) -> None:
+    start = time.perf_counter()
+    for test_id, test_data in items:
+        func(test_id, test_data)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  {elapsed / len(items) * 1e6:8.1f} us/test")
+
+
+def main() -> None:
+    num_tests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    items = [
+        (f"tests/test_mod.py::test_TMS_{100000 + i}_case", make_test_data(i))
+        for i in range(num_tests)
+    ]
+    print(f"{num_tests} tests")
+    bench("parse_test_result + log", parse_with_log, items)
+    bench("BeautifulSoup row cells", lambda _, data: soup_row_parse(data), items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark failure grouping and signature clustering on 100k failures.
+
+Reasons come from a couple of thousand distinct failures, each filled
+in with ids, numbers, paths, timestamps and a changing name, the way the
+same failures look across a large suite. Shows the number of groups
+by first line (the old grouping), by signature, and with clustering, and
+times cluster_signatures against comparing every pair of signatures.
+
+Usage: python benchmarks/bench_signatures.py [NUM_FAILURES]
+"""
+
+import itertools
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+
+from reportminer.grouping import group_by_reason
+from reportminer.models import TestResult, TestStatus
+from reportminer.signatures import TOKEN_PATTERN, cluster_signatures, failure_signature
+from reportminer.table import ResultTable
+
+# Distinct failures in the suite, each a sentence from a shared vocabulary
+NUM_TEMPLATES = 2000
+FILLERS = {
+    "n": lambda rng: rng.randint(1, 10_000),
+    "path": lambda rng: f"/srv/run{rng.randint(1, 999)}/pages/p{rng.randint(1, 50)}.html",
+    "time": lambda rng: f"2024-01-{rng.randint(10, 28)}T10:{rng.randint(10, 59)}:00Z",
+    "uuid": lambda rng: uuid.UUID(int=rng.getrandbits(128)),
+    "hex": lambda rng: hex(rng.getrandbits(40)),
+    "word": lambda rng: rng.choice(WORDS),
+}
+ERRORS = ["AssertionError", "TimeoutError", "ConnectionError", "KeyError", "RuntimeError"]
+# Letters only, so the number mask leaves them alone
+VOCABULARY = ["".join(letters) for letters in itertools.product("bcdfgklmnprstvz", "aeiou", "bcdfgklmnprstvz")][:3000]
+WORDS = ["".join(letters) for letters in itertools.product("xyz", "aeiou", "klmnp")]
+
+
+def make_templates(rng: random.Random) -> list:
+    templates = []
+    for _ in range(NUM_TEMPLATES):
+        words = rng.sample(VOCABULARY, rng.randint(8, 12))
+        for placeholder in rng.sample(list(FILLERS), 2):
+            words.insert(rng.randrange(len(words) + 1), "{" + placeholder + "}")
+        templates.append(f"{rng.choice(ERRORS)}: {' '.join(words)}")
+    return templates
+
+
+def make_reasons(count: int) -> list:
+    rng = random.Random(0)
+    templates = make_templates(rng)
+    reasons = []
+    for _ in range(count):
+        template = rng.choice(templates)
+        reasons.append(template.format(**{name: fill(rng) for name, fill in FILLERS.items()}))
+    return reasons
+
+
+def pairwise_clusters(counts: dict, threshold: float = 0.7) -> dict:
+    """Leader clustering comparing each signature with every cluster."""
+    leaders = []
+    representatives = {}
+    for signature in sorted(counts, key=lambda s: (-counts[s], s)):
+        tokens = TOKEN_PATTERN.findall(signature)
+        token_set = frozenset(tokens)
+        best, best_score = signature, threshold
+        for leader, head, leader_set in leaders:
+            if head == tokens[0]:
+                score = len(token_set & leader_set) / len(token_set | leader_set)
+                if score > best_score or (score >= best_score and best == signature):
+                    best, best_score = leader, score
+        if best == signature:
+            leaders.append((signature, tokens[0], token_set))
+        representatives[signature] = best
+    return representatives
+
+
+def timed(func):
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    reasons = make_reasons(count)
+    results = ResultTable.from_results(
+        TestResult(tms_number=f"TMS_{i}", test_name="t", test_id="t", status=TestStatus.FAILED, failure_reason=reason)
+        for i, reason in enumerate(reasons)
+    )
+
+    signatures = Counter()
+    for reason, size in Counter(reasons).items():
+        signatures[failure_signature(reason)] += size
+
+    print(f"{count} failures")
+    print(f"  groups by first line        {len(set(reasons)):>7}")
+    print(f"  groups by signature         {len(signatures):>7}")
+
+    clusters, indexed = timed(lambda: cluster_signatures(signatures))
+    pairs, pairwise = timed(lambda: pairwise_clusters(signatures))
+    print(f"  clusters                    {len(set(clusters.values())):>7}")
+    print(f"  cluster_signatures         {indexed * 1000:>7.1f} ms")
+    print(f"  pairwise comparison        {pairwise * 1000:>7.1f} ms (same clusters: {clusters == pairs})")
+
+    groups, grouping = timed(lambda: group_by_reason(results, cluster=True))
+    print(f"  group_by_reason(cluster)   {grouping * 1000:>7.1f} ms, {len(groups)} groups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark status lookup inside parse_test_result on a million rows.
+
+Compares TestStatus.from_string against the old lowercase-and-scan lookup,
+both on its own and as part of parse_test_result with a status filter that
+rejects most rows right after the lookup (what `mine -s error` does).
+
+Usage: python benchmarks/bench_status.py [NUM_ROWS]
+"""
+
+import sys
+import time
+from unittest import mock
+
+from bench_parser import make_test_data
+
+from reportminer import parser
+from reportminer.models import TestStatus
+
+
+def scan_from_string(value: str) -> TestStatus:
+    """The previous implementation, for comparison."""
+    normalized = value.lower().strip()
+    for status in TestStatus:
+        if status.value == normalized:
+            return status
+    raise ValueError(f"Unknown test status: {value}")
+
+
+SPELLINGS = ["Passed", "Failed", "Skipped", "XFailed", "XPassed", "Rerun", "Error"]
+
+
+def make_rows(num_rows: int) -> list:
+    """num_rows (test_id, test_data) pairs sharing a few thousand entries."""
+    entries = []
+    for i in range(5000):
+        test_data = make_test_data(i)
+        test_data["result"] = SPELLINGS[i % len(SPELLINGS)]
+        entries.append((f"tests/test_mod.py::test_TMS_{100000 + i}_case", test_data))
+    return [entries[i % len(entries)] for i in range(num_rows)]
+
+
+def timed(func, rows: list) -> float:
+    start = time.perf_counter()
+    for test_id, test_data in rows:
+        func(test_id, test_data)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rows = make_rows(num_rows)
+    statuses = {TestStatus.ERROR}
+
+    cases = {
+        "from_string": lambda _, data: TestStatus.from_string(data["result"]),
+        "parse_test_result -s error": lambda test_id, data: parser.parse_test_result(test_id, data, statuses),
+    }
+
+    print(f"{num_rows} rows")
+    print(f"{'':<28}{'scan':>10}{'lookup':>10}{'saved/row':>12}")
+    for label, func in cases.items():
+        with mock.patch.object(TestStatus, "from_string", staticmethod(scan_from_string)):
+            old = timed(func, rows)
+        new = timed(func, rows)
+        saved = (old - new) / num_rows * 1e9
+        print(f"{label:<28}{old:>9.3f}s{new:>9.3f}s{saved:>9.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark building a RunHistory from many runs of a large suite.
+
+Feeds NUM_RUNS runs of NUM_TESTS tests straight into RunHistory (no report
+parsing), with a few percent of tests flaky, and reports the time taken
+and the size of the history's bitsets afterwards. (tracemalloc would
+slow the byte-row building several times over, so sizes are summed with
+sys.getsizeof instead.)
+
+Usage: python benchmarks/bench_trend.py [NUM_RUNS] [NUM_TESTS]
+"""
+
+import random
+import sys
+import time
+
+from reportminer.models import TestStatus
+from reportminer.trend import RunHistory, sort_trends
+
+# Distinct status columns to rotate through; building a fresh one per run
+# would dominate the timing
+VARIANTS = 16
+
+
+def make_status_columns(num_tests: int) -> list:
+    rng = random.Random(0)
+    flaky = set(rng.sample(range(num_tests), num_tests // 20))
+    columns = []
+    for _ in range(VARIANTS):
+        columns.append([
+            TestStatus.FAILED if i in flaky and rng.random() < 0.3
+            else TestStatus.SKIPPED if i % 97 == 0
+            else TestStatus.PASSED
+            for i in range(num_tests)
+        ])
+    return columns
+
+
+def history_size(history: RunHistory) -> int:
+    """Bytes held by the per-test bitsets and their lists."""
+    bitsets = history._ran + history._failed
+    return sum(map(sys.getsizeof, bitsets)) + 4 * sys.getsizeof(history._ran)
+
+
+def main() -> None:
+    num_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    num_tests = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+
+    tms_numbers = [f"TMS_{100000 + i}" for i in range(num_tests)]
+    columns = make_status_columns(num_tests)
+
+    start = time.perf_counter()
+    history = RunHistory()
+    for run in range(num_runs):
+        history.add_run(f"run{run}", tms_numbers, columns[run % VARIANTS])
+    trends = sort_trends(history.trends(failing_only=True))
+    elapsed = time.perf_counter() - start
+
+    print(f"{num_runs} runs x {num_tests} tests")
+    print(f"  built and analyzed in {elapsed:.2f}s ({elapsed / num_runs * 1000:.1f} ms/run)")
+    print(f"  bitsets hold {history_size(history) / (1 << 20):.1f} MB")
+    print(f"  {len(trends)} tests failed at least once, flakiest {trends[0].tms_number} ({trends[0].flakiness:.2f})")
+
+
+if __name__ == "__main__":
+    main()
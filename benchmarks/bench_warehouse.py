@@ -0,0 +1,88 @@
+"""Benchmark `mine query` lookups against re-parsing the same reports.
+
+Fills a warehouse with NUM_RUNS runs of a suite and times typical queries,
+then times parsing the equivalent reports (bench_parser's synthetic data)
+the way plain `mine -s failed` does.
+
+Usage: python benchmarks/bench_warehouse.py [NUM_RUNS] [TESTS_PER_RUN]
+"""
+
+import html
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_parser import make_test_data
+
+from reportminer.models import TestResult, TestStatus
+from reportminer.parser import parse_reports
+from reportminer.warehouse import Warehouse
+
+
+def make_report(tests: int) -> str:
+    data = {"tests": {
+        f"tests/test_mod.py::test_TMS_{100000 + i}_case": [make_test_data(i)]
+        for i in range(tests)
+    }}
+    blob = html.escape(json.dumps(data))
+    return f'<html><body><div id="data-container" data-jsonblob="{blob}"></div></body></html>'
+
+
+def make_run(run: int, tests: int) -> list:
+    return [
+        TestResult(
+            tms_number=f"TMS_{100000 + i}",
+            test_name=f"test_TMS_{100000 + i}_case",
+            test_id=f"tests/test_mod.py::test_TMS_{100000 + i}_case",
+            status=TestStatus.FAILED if (i + run) % 20 == 0 else TestStatus.PASSED,
+            failure_reason=f"AssertionError: expected 200 got {500 + run}" if (i + run) % 20 == 0 else None,
+            duration="00:00:01",
+            timestamp="12:00:00",
+        )
+        for i in range(tests)
+    ]
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    num_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    tests = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        with Warehouse(tmp / "warehouse.db") as warehouse:
+            runs = [make_run(run, tests) for run in range(num_runs)]
+            fill = timed(lambda: [
+                warehouse.add_run(f"run{run}.html", f"digest{run}", f"2024-01-01T00:{run // 60:02d}:{run % 60:02d}", results)
+                for run, results in enumerate(runs)
+            ])
+            print(f"{num_runs} runs x {tests} tests stored in {fill:.2f}s")
+
+            failed = {TestStatus.FAILED}
+            queries = {
+                "failed, last run": lambda: warehouse.query(statuses=failed, last_runs=1),
+                "failed, last 10 runs": lambda: warehouse.query(statuses=failed, last_runs=10),
+                "one TMS, all runs": lambda: warehouse.query(tms_numbers=["TMS_100042"]),
+                "failed, all runs": lambda: warehouse.query(statuses=failed),
+            }
+            for label, query in queries.items():
+                print(f"  query {label:<24}{timed(query) * 1000:>9.1f} ms")
+
+        reports = []
+        for run in range(min(num_runs, 10)):
+            path = tmp / f"report{run}.html"
+            path.write_text(make_report(tests), encoding="utf-8")
+            reports.append(path)
+        parse = timed(lambda: parse_reports(reports, jobs=1, statuses=failed))
+        print(f"  parse {len(reports)} reports -s failed  {parse * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
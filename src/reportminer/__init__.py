@@ -4,6 +4,7 @@ __version__ = "1.0.0"
 
 from .models import TestResult, TestStatus
 from .parser import parse_report, parse_reports
+from .table import ResultTable
 
 __all__ = [
     "__version__",
@@ -11,4 +12,5 @@ __all__ = [
     "TestStatus",
     "parse_report",
     "parse_reports",
+    "ResultTable",
 ]
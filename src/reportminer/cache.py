@@ -1,64 +1,504 @@
-"""File-based cache for Jira API responses."""
+"""File-based caches for Jira API responses and parsed reports."""
 
 import json
 import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Any
+from typing import Collection, Iterable, Optional, Any
 
-from .config import CACHE_DIR, CACHE_TTL_HOURS
+from .config import CACHE_BACKEND, CACHE_DIR, CACHE_STALE_HOURS, CACHE_TTL_HOURS, PARSE_CACHE_DAYS
+from .models import TestResult, TestStatus
 
 
-class FileCache:
-    """Simple file-based cache with TTL."""
+# A stored entry: (cached_at as a POSIX timestamp, TTL in seconds or None
+# for the cache's default, value)
+Record = tuple[float, Optional[float], Any]
 
-    def __init__(self, namespace: str = "jira"):
-        self.cache_dir = CACHE_DIR / namespace
-        self.ttl = timedelta(hours=CACHE_TTL_HOURS)
+# Keys per SQL statement, under SQLite's limit on bound parameters
+SQLITE_BATCH_KEYS = 500
+
+
+@dataclass
+class CacheEntry:
+    """A cached value, and whether it is past its TTL."""
+    value: Any
+    stale: bool
+
+
+class CacheBackend(ABC):
+    """Storage of a FileCache's records, by key."""
+
+    @abstractmethod
+    def get_many(self, keys: Iterable[str]) -> dict[str, Record]:
+        """Records of the keys that have one."""
+
+    @abstractmethod
+    def set_many(self, records: dict[str, Record]) -> None:
+        """Store records, replacing existing ones."""
+
+    @abstractmethod
+    def delete(self, keys: Iterable[str]) -> None:
+        """Delete the records of keys, if they have one."""
+
+    @abstractmethod
+    def sweep(self, default_ttl: float, max_stale: float, now: float) -> int:
+        """Delete records stale for longer than max_stale. Returns count deleted."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Delete every record. Returns count deleted."""
+
+    def close(self) -> None:
+        """Release open resources; the backend reopens them if used again."""
+
+
+class JsonFileBackend(CacheBackend):
+    """One JSON file per key in a directory."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
 
     def _get_cache_path(self, key: str) -> Path:
         """Get file path for a cache key."""
         key_hash = hashlib.sha256(key.encode()).hexdigest()[:16]
         return self.cache_dir / f"{key_hash}.json"
 
+    def get_many(self, keys: Iterable[str]) -> dict[str, Record]:
+        records = {}
+        for key in keys:
+            path = self._get_cache_path(key)
+            if not path.exists():
+                continue
+            try:
+                data = json.loads(path.read_text())
+                cached_at = datetime.fromisoformat(data["cached_at"]).timestamp()
+                records[key] = (cached_at, data.get("ttl"), data["value"])
+            except (json.JSONDecodeError, KeyError, ValueError, TypeError):
+                continue
+        return records
+
+    def set_many(self, records: dict[str, Record]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for key, (cached_at, ttl, value) in records.items():
+            path = self._get_cache_path(key)
+            data = {
+                "cached_at": datetime.fromtimestamp(cached_at).isoformat(),
+                "key": key,
+                "value": value,
+            }
+            if ttl is not None:
+                data["ttl"] = ttl
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2))
+            # Atomic swap: entries are refreshed in the background while read
+            os.replace(tmp_path, path)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._get_cache_path(key).unlink(missing_ok=True)
+
+    def sweep(self, default_ttl: float, max_stale: float, now: float) -> int:
+        # Listing every file costs more than it saves; expired files are
+        # deleted as they are looked up instead
+        return 0
+
+    def clear(self) -> int:
+        if not self.cache_dir.exists():
+            return 0
+
+        count = 0
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink()
+            count += 1
+        # Left behind by writes that were interrupted
+        for path in self.cache_dir.glob("*.tmp"):
+            path.unlink(missing_ok=True)
+        return count
+
+
+class SqliteBackend(CacheBackend):
+    """Records of every namespace in one SQLite database.
+
+    The database is in WAL mode, so readers don't block the writer (e.g.
+    a background refresh) or concurrent runs. Batches are one statement
+    per SQLITE_BATCH_KEYS keys, and writes one transaction per batch.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        cached_at REAL NOT NULL,
+        ttl REAL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (namespace, key)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: Path, namespace: str):
+        self.path = path
+        self.namespace = namespace
+        self._conn: Optional[sqlite3.Connection] = None
+        # One connection, shared with background refresh threads
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open (and if needed create) the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Record]:
+        keys = list(keys)
+        records = {}
+        with self._lock:
+            for start in range(0, len(keys), SQLITE_BATCH_KEYS):
+                batch = keys[start:start + SQLITE_BATCH_KEYS]
+                rows = self.conn.execute(
+                    "SELECT key, cached_at, ttl, value FROM entries "
+                    f"WHERE namespace = ? AND key IN ({', '.join('?' * len(batch))})",
+                    (self.namespace, *batch),
+                )
+                for key, cached_at, ttl, value in rows:
+                    try:
+                        records[key] = (cached_at, ttl, json.loads(value))
+                    except json.JSONDecodeError:
+                        continue
+        return records
+
+    def set_many(self, records: dict[str, Record]) -> None:
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (
+                    (self.namespace, key, cached_at, ttl, json.dumps(value))
+                    for key, (cached_at, ttl, value) in records.items()
+                ),
+            )
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                ((self.namespace, key) for key in keys),
+            )
+
+    def sweep(self, default_ttl: float, max_stale: float, now: float) -> int:
+        with self._lock, self.conn:
+            return self.conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND cached_at + COALESCE(ttl, ?) + ? < ?",
+                (self.namespace, default_ttl, max_stale, now),
+            ).rowcount
+
+    def clear(self) -> int:
+        if not self.path.exists():
+            return 0
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,)).rowcount
+
+
+CACHE_BACKENDS = ("json", "sqlite")
+
+
+def make_backend(namespace: str, backend: Optional[str] = None) -> CacheBackend:
+    """Cache backend for a namespace, by name (default MINE_CACHE_BACKEND)."""
+    backend = backend or CACHE_BACKEND
+    if backend == "json":
+        return JsonFileBackend(CACHE_DIR / namespace)
+    if backend == "sqlite":
+        return SqliteBackend(CACHE_DIR / "cache.db", namespace)
+    raise ValueError(f"Unknown cache backend: {backend}. Valid: {', '.join(CACHE_BACKENDS)}")
+
+
+class FileCache:
+    """Simple cache with TTL, stored by a pluggable backend.
+
+    Entries live in one JSON file each, or in a shared SQLite database
+    with MINE_CACHE_BACKEND=sqlite (see make_backend).
+
+    Entries past their TTL are stale: get ignores them, but lookup still
+    returns them, so callers can serve them while fetching a fresh value
+    (stale-while-revalidate). Entries stale for longer than max_stale are
+    deleted.
+    """
+
+    def __init__(self, namespace: str = "jira", backend: Optional[str] = None):
+        self.backend = make_backend(namespace, backend)
+        self.ttl = timedelta(hours=CACHE_TTL_HOURS)
+        self.max_stale = timedelta(hours=CACHE_STALE_HOURS)
+        self._swept = False
+
+    def lookup_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """Entries of the keys that have one, stale or not."""
+        default_ttl = self.ttl.total_seconds()
+        max_stale = self.max_stale.total_seconds()
+        if not self._swept:
+            # Drop long-stale entries once per cache, where that's cheap
+            self._swept = True
+            self.backend.sweep(default_ttl, max_stale, time.time())
+
+        now = time.time()
+        entries = {}
+        expired = []
+        for key, (cached_at, ttl, value) in self.backend.get_many(keys).items():
+            ttl = default_ttl if ttl is None else ttl
+            age = now - cached_at
+            if age > ttl + max_stale:
+                expired.append(key)
+            else:
+                entries[key] = CacheEntry(value, stale=age > ttl)
+        if expired:
+            self.backend.delete(expired)
+        return entries
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Get the entry for a key, stale or not; None if there is none.
+
+        Unlike get, this tells a cached None (e.g. a known missing item)
+        apart from no entry.
+        """
+        return self.lookup_many([key]).get(key)
+
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired."""
+        entry = self.lookup(key)
+        if entry is None or entry.stale:
+            return None
+        return entry.value
+
+    def set_many(self, values: dict[str, Any], ttl: Optional[timedelta] = None) -> None:
+        """Store values, expiring after ttl instead of the cache's TTL if given."""
+        now = time.time()
+        seconds = ttl.total_seconds() if ttl is not None else None
+        self.backend.set_many({key: (now, seconds, value) for key, value in values.items()})
+
+    def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> None:
+        """Store value in cache (see set_many)."""
+        self.set_many({key: value}, ttl)
+
+    def clear(self) -> int:
+        """Clear all cached items. Returns count of items cleared."""
+        return self.backend.clear()
+
+    def close(self) -> None:
+        """Close the backend (e.g. its database connection)."""
+        self.backend.close()
+
+
+class ParseCache:
+    """Binary cache of parsed reports, invalidated by file size and mtime.
+
+    Each report (and status filter it was parsed with) gets one pickle file,
+    so re-parsing a changed report replaces its entry instead of adding one.
+    Entries not used for max_age are deleted when the cache next stores one,
+    so reports that are never read again don't pile up.
+    """
+
+    # Bump when the stored row layout changes
+    FORMAT_VERSION = 2
+
+    def __init__(self, namespace: str = "parsed"):
+        self.cache_dir = CACHE_DIR / namespace
+        self.max_age = timedelta(days=PARSE_CACHE_DAYS)
+        self._swept = False
+
+    def _get_key(
+        self,
+        file_path: Path,
+        statuses: Optional[Collection[TestStatus]],
+        detail_statuses: Optional[Collection[TestStatus]] = None,
+    ) -> str:
+        """Cache key for a report parsed with optional status filters."""
+        key = str(file_path.resolve())
+        if statuses is not None:
+            key += "|" + ",".join(sorted(status.value for status in statuses))
+        if detail_statuses is not None:
+            key += "|detail:" + ",".join(sorted(status.value for status in detail_statuses))
+        return key
+
+    def _get_cache_path(self, key: str) -> Path:
+        """Get cache file path for a key."""
+        key_hash = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return self.cache_dir / f"{key_hash}.pickle"
+
+    def _get_header(self, file_path: Path, key: str) -> tuple:
+        """Header identifying the exact report contents an entry was built from.
+
+        Archive members report the stat of their archive.
+        """
+        stat = file_path.stat()
+        return (self.FORMAT_VERSION, key, stat.st_size, stat.st_mtime_ns)
+
+    def _load(
+        self,
+        file_path: Path,
+        statuses: Optional[Collection[TestStatus]],
+        detail_statuses: Optional[Collection[TestStatus]] = None,
+    ) -> Optional[list]:
+        """Load cached rows if the report hasn't changed since caching."""
+        key = self._get_key(file_path, statuses, detail_statuses)
         path = self._get_cache_path(key)
 
-        if not path.exists():
+        try:
+            with path.open("rb") as f:
+                if pickle.load(f) != self._get_header(file_path, key):
+                    return None
+                rows = pickle.load(f)
+        except (
+            OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError,
+            # Stored log loaders that no longer resolve after an upgrade
+            AttributeError, ImportError,
+        ):
             return None
 
         try:
-            data = json.loads(path.read_text())
-            cached_at = datetime.fromisoformat(data["cached_at"])
+            # The entry's age counts from its last use
+            os.utime(path)
+        except OSError:
+            pass
+        return rows
 
-            if datetime.now() - cached_at > self.ttl:
-                path.unlink()
-                return None
+    def get(
+        self,
+        file_path: Path,
+        statuses: Optional[Collection[TestStatus]] = None,
+        detail_statuses: Optional[Collection[TestStatus]] = None,
+    ) -> Optional[list[TestResult]]:
+        """Get parsed results, optionally limited to the given statuses.
+
+        A filtered lookup is also served from the report's unfiltered entry,
+        whose results have every detail detail_statuses would skip.
+        """
+        rows = self._load(file_path, statuses, detail_statuses)
+        if rows is None and (statuses is not None or detail_statuses is not None):
+            rows = self._load(file_path, None)
+            if rows is not None and statuses is not None:
+                wanted = {status.value for status in statuses}
+                rows = [row for row in rows if row[3] in wanted]
 
-            return data["value"]
-        except (json.JSONDecodeError, KeyError, ValueError):
+        if rows is None:
+            return None
+        try:
+            return [_row_to_result(row) for row in rows]
+        except (ValueError, TypeError):
             return None
 
-    def set(self, key: str, value: Any) -> None:
-        """Store value in cache."""
+    def set(
+        self,
+        file_path: Path,
+        results: list[TestResult],
+        statuses: Optional[Collection[TestStatus]] = None,
+        detail_statuses: Optional[Collection[TestStatus]] = None,
+    ) -> None:
+        """Store parsed results for a report parsed with the given status filters."""
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if not self._swept:
+            # Drop unused entries once per cache, when it grows anyway
+            self._swept = True
+            self.sweep()
 
+        key = self._get_key(file_path, statuses, detail_statuses)
         path = self._get_cache_path(key)
-        data = {
-            "cached_at": datetime.now().isoformat(),
-            "key": key,
-            "value": value,
-        }
-        path.write_text(json.dumps(data, indent=2))
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(self._get_header(file_path, key), f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump([_result_to_row(r) for r in results], f, pickle.HIGHEST_PROTOCOL)
+        # Atomic swap so concurrent runs never read a partial entry
+        os.replace(tmp_path, path)
+
+    def sweep(self) -> int:
+        """Delete entries not used for max_age. Returns count of files deleted.
+
+        Temporary files of interrupted writes that old are deleted too.
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        cutoff = time.time() - self.max_age.total_seconds()
+        count = 0
+        for path in self.cache_dir.iterdir():
+            if path.suffix not in (".pickle", ".tmp"):
+                continue
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                path.unlink()
+            except OSError:
+                # Deleted or replaced by a concurrent run
+                continue
+            count += 1
+        return count
 
     def clear(self) -> int:
-        """Clear all cached items. Returns count of items cleared."""
+        """Clear all cached reports. Returns count of items cleared."""
         if not self.cache_dir.exists():
             return 0
 
         count = 0
-        for path in self.cache_dir.glob("*.json"):
+        for path in self.cache_dir.glob("*.pickle"):
             path.unlink()
             count += 1
+        # Left behind by writes that were interrupted
+        for path in self.cache_dir.glob("*.tmp"):
+            path.unlink(missing_ok=True)
         return count
+
+
+def _result_to_row(result: TestResult) -> tuple:
+    """Flatten a parsed result into a plain tuple for pickling.
+
+    Logs that haven't been built yet are stored as their loader, so caching
+    doesn't force log cleaning.
+    """
+    loader = result.log_loader
+    return (
+        result.tms_number,
+        result.test_name,
+        result.test_id,
+        result.status.value,
+        result.failure_reason,
+        result.duration,
+        result.timestamp,
+        None if loader else result.execution_log,
+        loader,
+    )
+
+
+def _row_to_result(row: tuple) -> TestResult:
+    """Rebuild a parsed result from a cached tuple."""
+    (
+        tms_number, test_name, test_id, status, failure_reason,
+        duration, timestamp, execution_log, log_loader,
+    ) = row
+    result = TestResult(
+        tms_number=tms_number,
+        test_name=test_name,
+        test_id=test_id,
+        status=TestStatus(status),
+        failure_reason=failure_reason,
+        duration=duration,
+        timestamp=timestamp,
+        execution_log=execution_log,
+    )
+    if log_loader:
+        result.defer_execution_log(log_loader)
+    return result
@@ -1,35 +1,42 @@
 """Command line interface."""
 
+import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import IO, Callable, Iterable, Iterator, Optional, Union
 
 import click
 
 from .clipboard import copy_to_clipboard
 from .compare import compare_reports, format_compare_result
-from .formatters import get_formatter
-from .jira_client import get_jira_client, JiraClientError
-from .models import TestResult, TestStatus
+from .formatters import Formatter, get_formatter, write_lines
+from .jira_client import REVALIDATION_WAIT, JiraClient, get_jira_client, JiraClientError
+from .models import TestStatus
 from .parser import collect_html_files, parse_reports
 from .progress import Spinner, create_progress_callback, get_random_phrase
+from .table import ResultTable, Results, result_columns
 
 
-FORMATS = ["raw", "pytest", "names", "full", "detailed", "jira", "jira-md", "wiki"]
+FORMATS = ["raw", "pytest", "names", "full", "detailed", "jira", "jira-md", "wiki", "ndjson", "csv", "parquet"]
 STATUSES = ["failed", "passed", "skipped", "error", "all"]
 
 
-def filter_by_status(results: list[TestResult], status: str) -> list[TestResult]:
+def filter_by_status(results: Results, status: str) -> Results:
     """Keep only results matching the given status."""
     if status == "all":
         return results
 
     target_status = TestStatus.from_string(status)
+    if isinstance(results, ResultTable):
+        return results.filter_status({target_status})
     return [r for r in results if r.status == target_status]
 
 
-def deduplicate(results: list[TestResult]) -> list[TestResult]:
+def deduplicate(results: Results) -> Results:
     """Remove duplicates by TMS number, keep first occurrence."""
+    if isinstance(results, ResultTable):
+        return results.dedupe()
     seen = set()
     unique = []
     for r in results:
@@ -39,12 +46,157 @@ def deduplicate(results: list[TestResult]) -> list[TestResult]:
     return unique
 
 
-def sort_results(results: list[TestResult]) -> list[TestResult]:
+def sort_results(results: Results) -> Results:
     """Sort by TMS number."""
+    if isinstance(results, ResultTable):
+        return results.sort_by_tms()
     return sorted(results, key=lambda r: r.tms_number)
 
 
-@click.command()
+class MineCommand(click.Command):
+    """The mine command, which also dispatches `mine ingest` and `mine query`.
+
+    Subcommand names only count as such when no file or directory with that
+    name exists, so `mine query` still parses a report directory called
+    "query".
+    """
+
+    def main(self, args=None, *posargs, **kwargs):
+        if args is None:
+            args = sys.argv[1:]
+        args = list(args)
+        if args and args[0] in SUBCOMMANDS and not Path(args[0]).exists():
+            kwargs.setdefault("prog_name", f"mine {args[0]}")
+            return SUBCOMMANDS[args[0]].main(args[1:], *posargs, **kwargs)
+        return super().main(args, *posargs, **kwargs)
+
+
+def emit_output(
+    formatted: Union[str, Iterable[str]],
+    output: Optional[str],
+    copy: bool,
+    spinner: Optional[Spinner] = None,
+) -> None:
+    """Print formatted output, or write it to a file, and optionally copy it.
+
+    formatted is the text or its lines (e.g. a formatter's iter_format).
+    Lines are streamed to the file or stdout one at a time, so the whole
+    output is only built as a string when it is copied.
+
+    With a spinner, it spins while the file is written and shows where the
+    output went.
+    """
+    lines = [formatted] if isinstance(formatted, str) else formatted
+    if copy:
+        text = "\n".join(lines)
+        lines = [text]
+        if copy_to_clipboard(text):
+            click.echo("(copied to clipboard)", err=True)
+        else:
+            click.echo("(clipboard copy failed)", err=True)
+
+    if output:
+        with open_output(output, spinner) as fp:
+            write_lines(lines, fp)
+    else:
+        write_lines(lines, sys.stdout)
+
+
+@contextmanager
+def open_output(output: str, spinner: Optional[Spinner] = None, binary: bool = False) -> Iterator[IO]:
+    """Open the output file, then report where the results went.
+
+    A regular file (not a link) is written under a temporary name and
+    renamed into place, so a failed write doesn't leave a truncated file
+    behind.
+    """
+    if spinner:
+        spinner.start(get_random_phrase("writing"))
+    path = Path(output)
+    if path.is_symlink() or (path.exists() and not path.is_file()):
+        # A link, device or pipe such as /dev/stdout: write straight to it
+        tmp_path = path
+    else:
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") if binary else open(tmp_path, "w", encoding="utf-8") as fp:
+            yield fp
+        if tmp_path != path:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path != path:
+            tmp_path.unlink(missing_ok=True)
+        raise
+    if spinner:
+        spinner.stop(f"Results written to {output}")
+    else:
+        click.echo(f"Results written to {output}", err=True)
+
+
+def output_formatter(
+    output_format: str,
+    output: Optional[str],
+    copy: bool,
+    group: bool = False,
+    cluster: bool = False,
+    with_logs: bool = False,
+) -> Formatter:
+    """Formatter for the output options, checked before any parsing."""
+    formatter = get_formatter(output_format, group=group, cluster=cluster, with_logs=with_logs)
+    if formatter.binary and (copy or not output):
+        raise ValueError(f"{output_format} output is binary: write it to a file with -o (no --copy)")
+    return formatter
+
+
+def emit_formatted(
+    formatter: Formatter,
+    results: Results,
+    output: Optional[str],
+    copy: bool,
+    spinner: Optional[Spinner] = None,
+) -> None:
+    """emit_output for a formatter, streaming with write_to unless copying."""
+    if copy:
+        emit_output(formatter.iter_format(results), output, copy, spinner)
+    elif output:
+        with open_output(output, spinner, binary=formatter.binary) as fp:
+            formatter.write_to(results, fp)
+    else:
+        formatter.write_to(results, sys.stdout)
+
+
+def enrich_from_jira(
+    jira_client: JiraClient,
+    results: Results,
+    progress_callback: Optional[Callable] = None,
+) -> None:
+    """Enrich results with Jira data, warning about requests that failed.
+
+    Stale issues are refreshed in the background; the command waits up to
+    REVALIDATION_WAIT seconds for that once it is done, so the refresh is
+    cached for the next run, then closes the client.
+    """
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None:
+        def finish():
+            jira_client.wait_for_revalidation(REVALIDATION_WAIT)
+            jira_client.close()
+
+        ctx.call_on_close(finish)
+    try:
+        jira_client.enrich_results(results, progress_callback=progress_callback)
+    except JiraClientError as e:
+        click.echo(f"Warning: Jira enrichment failed: {e}", err=True)
+        return
+    failed = jira_client.metrics.failed
+    if failed:
+        click.echo(
+            f"Warning: {failed} Jira requests still failed after retrying; some results have no Jira data",
+            err=True,
+        )
+
+
+@click.command(cls=MineCommand)
 @click.argument("input_paths", nargs=-1, required=False, type=click.Path(exists=True))
 @click.option(
     "-f", "--format",
@@ -94,6 +246,12 @@ def sort_results(results: list[TestResult]) -> list[TestResult]:
     default=False,
     help="Compare two reports (requires exactly 2 input files)",
 )
+@click.option(
+    "--trend",
+    is_flag=True,
+    default=False,
+    help="Show pass/fail history and flakiness per test across all input reports",
+)
 @click.option(
     "-v", "--view",
     is_flag=True,
@@ -106,17 +264,47 @@ def sort_results(results: list[TestResult]) -> list[TestResult]:
     default=False,
     help="Group output by failure reason (combine with -f for format)",
 )
+@click.option(
+    "--cluster",
+    is_flag=True,
+    default=False,
+    help="Group output, merging similar failure reasons (implies -g)",
+)
+@click.option(
+    "--with-logs",
+    is_flag=True,
+    default=False,
+    help="Include execution logs in ndjson, csv and parquet output",
+)
 @click.option(
     "-r", "--rerun",
     is_flag=True,
     default=False,
     help="Output pytest rerun command for failed tests",
 )
+@click.option(
+    "-j", "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Parse reports in N parallel processes (default: CPU count)",
+)
+@click.option(
+    "--low-memory",
+    is_flag=True,
+    default=False,
+    help="Stream report data instead of loading it whole (slower, bounded memory)",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Re-parse reports instead of using the parse cache",
+)
 @click.option(
     "--clear-cache",
     is_flag=True,
     default=False,
-    help="Clear Jira API cache and exit",
+    help="Clear Jira API and parse caches and exit",
 )
 def main(
     input_paths: tuple[str, ...],
@@ -128,20 +316,31 @@ def main(
     count: bool,
     copy: bool,
     diff: bool,
+    trend: bool,
     view: bool,
     group: bool,
+    cluster: bool,
+    with_logs: bool,
     rerun: bool,
+    jobs: Optional[int],
+    low_memory: bool,
+    no_cache: bool,
     clear_cache: bool,
 ):
     """Parse pytest-html test reports and extract test information.
 
     INPUT_PATHS: One or more HTML report files or directories.
+
+    `mine ingest PATHS` stores reports in the results warehouse and
+    `mine query` reads them back; see `mine ingest --help` and
+    `mine query --help`.
     """
     # Handle clear cache command
     if clear_cache:
-        from .cache import FileCache
-        cache = FileCache("jira")
-        cleared = cache.clear()
+        from .cache import FileCache, ParseCache
+        jira_cache = FileCache("jira")
+        cleared = jira_cache.clear() + ParseCache().clear()
+        jira_cache.close()
         click.echo(f"Cleared {cleared} cached items.")
         return
 
@@ -165,45 +364,78 @@ def main(
             new_file = Path(input_paths[1])
 
             spinner.update(message="Parsing old report...")
-            old_results = list(parse_reports([old_file]))
+            old_results = parse_reports([old_file], use_cache=not no_cache, low_memory=low_memory)
 
             spinner.update(message="Parsing new report...")
-            new_results = list(parse_reports([new_file]))
+            new_results = parse_reports([new_file], use_cache=not no_cache, low_memory=low_memory)
 
             spinner.stop()
 
             result = compare_reports(old_results, new_results)
-            formatted = format_compare_result(result)
+            emit_output(format_compare_result(result, group=group, cluster=cluster), output, copy)
+            return
 
-            if copy:
-                if copy_to_clipboard(formatted):
-                    click.echo("(copied to clipboard)", err=True)
-                else:
-                    click.echo("(clipboard copy failed)", err=True)
+        # Handle trend mode
+        if trend:
+            from .trend import build_history, format_trends, sort_trends
 
-            if output:
-                Path(output).write_text(formatted + "\n", encoding="utf-8")
-                click.echo(f"Results written to {output}", err=True)
-            else:
-                click.echo(formatted)
+            spinner.start(get_random_phrase("loading"))
+            html_files = collect_html_files(list(input_paths))
+            spinner.update(progress=f"({len(html_files)} files)")
+            history = build_history(
+                html_files,
+                jobs=jobs,
+                progress_callback=create_progress_callback(spinner),
+                use_cache=not no_cache,
+                low_memory=low_memory,
+            )
+            spinner.stop()
 
+            # Tests that failed at least once, unless everything is asked for
+            trends = sort_trends(history.trends(failing_only=status != "all"), by_tms=sort)
+            if count:
+                click.echo(len(trends))
+                return
+            emit_output(format_trends(history, trends), output, copy)
             return
 
         # Normal mode
+        formatter = None if rerun or view or count else output_formatter(
+            output_format, output, copy, group=group, cluster=cluster, with_logs=with_logs,
+        )
         spinner.start(get_random_phrase("loading"))
         html_files = collect_html_files(list(input_paths))
         spinner.update(progress=f"({len(html_files)} files)")
 
         spinner.update(message=get_random_phrase("loading"))
         progress_cb = create_progress_callback(spinner)
-        results = parse_reports(html_files, progress_callback=progress_cb)
+        # Skip non-matching tests while parsing (the TUI needs all of them).
+        # --unique keeps each TMS number's first result whatever its status,
+        # so there the others are only read for their TMS number and status,
+        # without failure reasons or logs.
+        statuses = detail_statuses = None
+        if status != "all" and not view:
+            if unique:
+                detail_statuses = {TestStatus.from_string(status)}
+            else:
+                statuses = {TestStatus.from_string(status)}
+        # Filtering, sorting and formatting work column-wise on a table
+        results = ResultTable.from_results(parse_reports(
+            html_files,
+            progress_callback=progress_cb,
+            jobs=jobs,
+            use_cache=not no_cache,
+            statuses=statuses,
+            low_memory=low_memory,
+            detail_statuses=detail_statuses,
+        ))
 
         # Always deduplicate first if requested
         if unique:
             results = deduplicate(results)
 
         # For view mode, keep all results (TUI handles its own filtering)
-        all_results = results.copy() if view else None
+        all_results = results.to_results() if view else None
 
         results = filter_by_status(results, status)
 
@@ -211,16 +443,16 @@ def main(
             results = sort_results(results)
 
         # Enrich with Jira data if needed for format/view
-        results_to_enrich = all_results if view else results
         needs_jira = view or output_format in ("jira-md", "wiki")
+        if needs_jira and not view:
+            # Enrichment fills in fields on result objects
+            results = results.to_results()
+        results_to_enrich = all_results if view else results
         if needs_jira:
             jira_client = get_jira_client()
             if jira_client.is_configured:
                 spinner.update(message="Fetching Jira data...")
-                try:
-                    jira_client.enrich_results(results_to_enrich, progress_callback=progress_cb)
-                except JiraClientError as e:
-                    click.echo(f"Warning: Jira enrichment failed: {e}", err=True)
+                enrich_from_jira(jira_client, results_to_enrich, progress_callback=progress_cb)
             else:
                 click.echo("Warning: Jira not configured. Set MINE_JIRA_URL, MINE_JIRA_EMAIL, MINE_JIRA_TOKEN", err=True)
 
@@ -247,36 +479,175 @@ def main(
         # Handle rerun command output
         if rerun:
             from .config import DEFAULT_RERUN_CMD
-            test_ids = [r.test_id for r in results]
+            test_ids, test_names = result_columns(results, "test_id", "test_name")
             if test_ids:
                 # Use -k with test names for flexible matching
-                test_names = " or ".join(r.test_name for r in results)
+                test_names = " or ".join(test_names)
                 formatted = DEFAULT_RERUN_CMD.format(tests=test_names)
             else:
                 formatted = "# No tests to rerun"
+            emit_output(formatted, output, copy, spinner)
         else:
-            formatter = get_formatter(output_format, group=group)
-            formatted = formatter.format(results)
+            emit_formatted(formatter, results, output, copy, spinner)
 
-        if copy:
-            if copy_to_clipboard(formatted):
-                click.echo("(copied to clipboard)", err=True)
-            else:
-                click.echo("(clipboard copy failed)", err=True)
+    except Exception as e:
+        spinner.stop()
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
 
-        if output:
-            output_path = Path(output)
-            spinner.start(get_random_phrase("writing"))
-            output_path.write_text(formatted + "\n", encoding="utf-8")
-            spinner.stop(f"Results written to {output_path}")
-        else:
-            click.echo(formatted)
 
+@click.command()
+@click.argument("input_paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "-j", "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Parse reports in N parallel processes (default: CPU count)",
+)
+@click.option(
+    "--low-memory",
+    is_flag=True,
+    default=False,
+    help="Stream report data instead of loading it whole (slower, bounded memory)",
+)
+def ingest(input_paths: tuple[str, ...], jobs: Optional[int], low_memory: bool):
+    """Store reports in the results warehouse.
+
+    INPUT_PATHS: One or more HTML report files, directories or archives.
+    Reports already in the warehouse (by content) are skipped.
+    """
+    from .warehouse import Warehouse
+
+    spinner = Spinner()
+    try:
+        spinner.start(get_random_phrase("loading"))
+        html_files = collect_html_files(list(input_paths))
+        spinner.update(progress=f"({len(html_files)} files)")
+        with Warehouse() as warehouse:
+            ingested, skipped = warehouse.ingest(
+                html_files,
+                jobs=jobs,
+                progress_callback=create_progress_callback(spinner),
+                low_memory=low_memory,
+            )
+            spinner.stop()
+            click.echo(f"Ingested {ingested} reports ({skipped} already in {warehouse.path}).", err=True)
     except Exception as e:
         spinner.stop()
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
 
 
+@click.command()
+@click.option(
+    "-f", "--format",
+    "output_format",
+    type=click.Choice(FORMATS, case_sensitive=False),
+    default="raw",
+    help="Output format (default: raw)",
+)
+@click.option(
+    "-s", "--status",
+    type=click.Choice(STATUSES, case_sensitive=False),
+    default="failed",
+    help="Filter by test status (default: failed)",
+)
+@click.option(
+    "-o", "--output",
+    type=click.Path(),
+    default=None,
+    help="Export results to file",
+)
+@click.option(
+    "-u/-U", "--unique/--no-unique",
+    default=True,
+    help="Keep only the most recent result per TMS number (default: unique)",
+)
+@click.option("-S", "--sort", is_flag=True, default=False, help="Sort output alphabetically")
+@click.option("-c", "--count", is_flag=True, default=False, help="Show count only")
+@click.option("--copy", is_flag=True, default=False, help="Copy output to clipboard")
+@click.option(
+    "-g", "--group",
+    is_flag=True,
+    default=False,
+    help="Group output by failure reason (combine with -f for format)",
+)
+@click.option(
+    "--cluster",
+    is_flag=True,
+    default=False,
+    help="Group output, merging similar failure reasons (implies -g)",
+)
+@click.option(
+    "--last",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only look at the N most recent runs",
+)
+@click.option(
+    "--tms",
+    "tms_numbers",
+    multiple=True,
+    help="Only show this TMS number (repeatable)",
+)
+def query(
+    output_format: str,
+    status: str,
+    output: Optional[str],
+    unique: bool,
+    sort: bool,
+    count: bool,
+    copy: bool,
+    group: bool,
+    cluster: bool,
+    last: Optional[int],
+    tms_numbers: tuple[str, ...],
+):
+    """Show results from the results warehouse.
+
+    Takes the same filter and output options as mine, without parsing any
+    reports. Results come newest run first.
+    """
+    from .warehouse import Warehouse
+
+    try:
+        formatter = output_formatter(output_format, output, copy, group=group, cluster=cluster)
+        statuses = None if status == "all" else {TestStatus.from_string(status)}
+        with Warehouse() as warehouse:
+            results = ResultTable.from_results(warehouse.query(
+                statuses=statuses,
+                last_runs=last,
+                tms_numbers=[tms.upper().replace("-", "_") for tms in tms_numbers] or None,
+                latest=unique,
+            ))
+
+        if sort:
+            results = sort_results(results)
+
+        if count:
+            click.echo(len(results))
+            return
+
+        if not results:
+            click.echo("No tests found matching criteria.", err=True)
+            sys.exit(0)
+
+        if output_format in ("jira-md", "wiki"):
+            # Stored results carry no Jira data; enrich like the main command
+            results = results.to_results()
+            jira_client = get_jira_client()
+            if jira_client.is_configured:
+                enrich_from_jira(jira_client, results)
+
+        emit_formatted(formatter, results, output, copy)
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+SUBCOMMANDS = {"ingest": ingest, "query": query}
+
+
 if __name__ == "__main__":
     main()
@@ -2,7 +2,9 @@
 
 from dataclasses import dataclass
 
-from .models import TestResult
+from .grouping import group_by_reason
+from .models import TestResult, TestStatus
+from .table import ResultTable, Results, result_columns
 
 
 @dataclass
@@ -18,112 +20,99 @@ class CompareResult:
 
 
 def compare_reports(
-    old_results: list[TestResult],
-    new_results: list[TestResult],
+    old_results: Results,
+    new_results: Results,
 ) -> CompareResult:
-    """Compare old and new test results."""
+    """Compare old and new test results.
 
-    # Build lookup dicts by TMS number
-    old_by_tms = {r.tms_number: r for r in old_results}
-    new_by_tms = {r.tms_number: r for r in new_results}
+    Works on TMS and status columns, so with ResultTable inputs only the
+    reported rows are materialized.
+    """
+    old_tms, old_status = result_columns(old_results, "tms_number", "status")
+    new_tms, new_status = result_columns(new_results, "tms_number", "status")
 
-    old_failed = {r.tms_number for r in old_results if r.status.value == "failed"}
-    new_failed = {r.tms_number for r in new_results if r.status.value == "failed"}
-    old_error = {r.tms_number for r in old_results if r.status.value == "error"}
-    new_error = {r.tms_number for r in new_results if r.status.value == "error"}
-    old_passed = {r.tms_number for r in old_results if r.status.value == "passed"}
-    new_passed = {r.tms_number for r in new_results if r.status.value == "passed"}
+    # Row of each TMS number in the new results (the last one wins)
+    new_rows = {tms: i for i, tms in enumerate(new_tms)}
 
-    # New failures - failed now but wasn't failing before
-    new_failure_tms = new_failed - old_failed - old_error
-    new_failures = [new_by_tms[tms] for tms in new_failure_tms]
+    def with_status(tms_numbers: list[str], statuses: list[TestStatus], status: TestStatus) -> set[str]:
+        return {tms for tms, s in zip(tms_numbers, statuses) if s is status}
 
-    # Fixed - was failing, now passing
-    fixed_tms = old_failed & new_passed
-    fixed = [new_by_tms[tms] for tms in fixed_tms]
+    def new_results_for(tms_numbers: set[str]) -> list[TestResult]:
+        rows = [new_rows[tms] for tms in sorted(tms_numbers)]
+        if isinstance(new_results, ResultTable):
+            return new_results.take(rows).to_results()
+        return [new_results[i] for i in rows]
 
-    # Still failing - failed in both
-    still_failing_tms = old_failed & new_failed
-    still_failing = [new_by_tms[tms] for tms in still_failing_tms]
-
-    # New errors - error now but wasn't erroring before
-    new_error_tms = new_error - old_error - old_failed
-    new_errors = [new_by_tms[tms] for tms in new_error_tms]
-
-    # Fixed errors - was erroring, now passing
-    fixed_error_tms = old_error & new_passed
-    fixed_errors = [new_by_tms[tms] for tms in fixed_error_tms]
-
-    # Still erroring - error in both
-    still_erroring_tms = old_error & new_error
-    still_erroring = [new_by_tms[tms] for tms in still_erroring_tms]
-
-    # New passes - passing now, wasn't in old report at all
-    new_pass_tms = new_passed - old_passed - old_failed - old_error
-    new_passes = [new_by_tms[tms] for tms in new_pass_tms]
+    old_failed = with_status(old_tms, old_status, TestStatus.FAILED)
+    new_failed = with_status(new_tms, new_status, TestStatus.FAILED)
+    old_error = with_status(old_tms, old_status, TestStatus.ERROR)
+    new_error = with_status(new_tms, new_status, TestStatus.ERROR)
+    old_passed = with_status(old_tms, old_status, TestStatus.PASSED)
+    new_passed = with_status(new_tms, new_status, TestStatus.PASSED)
 
     return CompareResult(
-        new_failures=sorted(new_failures, key=lambda r: r.tms_number),
-        fixed=sorted(fixed, key=lambda r: r.tms_number),
-        still_failing=sorted(still_failing, key=lambda r: r.tms_number),
-        new_errors=sorted(new_errors, key=lambda r: r.tms_number),
-        fixed_errors=sorted(fixed_errors, key=lambda r: r.tms_number),
-        still_erroring=sorted(still_erroring, key=lambda r: r.tms_number),
-        new_passes=sorted(new_passes, key=lambda r: r.tms_number),
+        # New failures - failed now but wasn't failing before
+        new_failures=new_results_for(new_failed - old_failed - old_error),
+        # Fixed - was failing, now passing
+        fixed=new_results_for(old_failed & new_passed),
+        # Still failing - failed in both
+        still_failing=new_results_for(old_failed & new_failed),
+        # New errors - error now but wasn't erroring before
+        new_errors=new_results_for(new_error - old_error - old_failed),
+        # Fixed errors - was erroring, now passing
+        fixed_errors=new_results_for(old_error & new_passed),
+        # Still erroring - error in both
+        still_erroring=new_results_for(old_error & new_error),
+        # New passes - passing now, wasn't in old report at all
+        new_passes=new_results_for(new_passed - old_passed - old_failed - old_error),
     )
 
 
-def format_compare_result(result: CompareResult) -> str:
-    """Format comparison result as readable text."""
-    lines = []
-
-    if result.new_failures:
-        lines.append(f"NEW FAILURES ({len(result.new_failures)}):")
-        for r in result.new_failures:
-            lines.append(f"  - {r.tms_number}: {r.test_name}")
-            if r.failure_reason:
+def _format_section(
+    title: str,
+    results: list[TestResult],
+    marker: str,
+    show_reasons: bool,
+    group: bool,
+    cluster: bool,
+) -> list[str]:
+    """Lines of one compare section (empty for no results)."""
+    if not results:
+        return []
+    lines = [f"{title} ({len(results)}):"]
+    # Fixed tests passed, so only sections with reasons are grouped
+    if show_reasons and (group or cluster):
+        for reason, tests in group_by_reason(results, cluster=cluster):
+            lines.append(f"  [{len(tests)} tests] {reason}")
+            for r in tests:
+                lines.append(f"    {marker} {r.tms_number}: {r.test_name}")
+    else:
+        for r in results:
+            lines.append(f"  {marker} {r.tms_number}: {r.test_name}")
+            if show_reasons and r.failure_reason:
                 for reason_line in r.failure_reason.split("\n"):
                     lines.append(f"    {reason_line}")
-        lines.append("")
-
-    if result.new_errors:
-        lines.append(f"NEW ERRORS ({len(result.new_errors)}):")
-        for r in result.new_errors:
-            lines.append(f"  ! {r.tms_number}: {r.test_name}")
-            if r.failure_reason:
-                for reason_line in r.failure_reason.split("\n"):
-                    lines.append(f"    {reason_line}")
-        lines.append("")
-
-    if result.fixed:
-        lines.append(f"FIXED ({len(result.fixed)}):")
-        for r in result.fixed:
-            lines.append(f"  + {r.tms_number}: {r.test_name}")
-        lines.append("")
-
-    if result.fixed_errors:
-        lines.append(f"FIXED ERRORS ({len(result.fixed_errors)}):")
-        for r in result.fixed_errors:
-            lines.append(f"  + {r.tms_number}: {r.test_name}")
-        lines.append("")
-
-    if result.still_failing:
-        lines.append(f"STILL FAILING ({len(result.still_failing)}):")
-        for r in result.still_failing:
-            lines.append(f"  ~ {r.tms_number}: {r.test_name}")
-            if r.failure_reason:
-                for reason_line in r.failure_reason.split("\n"):
-                    lines.append(f"    {reason_line}")
-        lines.append("")
-
-    if result.still_erroring:
-        lines.append(f"STILL ERRORING ({len(result.still_erroring)}):")
-        for r in result.still_erroring:
-            lines.append(f"  ~ {r.tms_number}: {r.test_name}")
-            if r.failure_reason:
-                for reason_line in r.failure_reason.split("\n"):
-                    lines.append(f"    {reason_line}")
-        lines.append("")
+    lines.append("")
+    return lines
+
+
+def format_compare_result(result: CompareResult, group: bool = False, cluster: bool = False) -> str:
+    """Format comparison result as readable text.
+
+    With group (or cluster), the failing sections list their tests under
+    their reason keys instead of repeating each full failure reason.
+    """
+    sections = [
+        ("NEW FAILURES", result.new_failures, "-", True),
+        ("NEW ERRORS", result.new_errors, "!", True),
+        ("FIXED", result.fixed, "+", False),
+        ("FIXED ERRORS", result.fixed_errors, "+", False),
+        ("STILL FAILING", result.still_failing, "~", True),
+        ("STILL ERRORING", result.still_erroring, "~", True),
+    ]
+    lines = []
+    for title, results, marker, show_reasons in sections:
+        lines.extend(_format_section(title, results, marker, show_reasons, group, cluster))
 
     # Summary
     lines.append("SUMMARY:")
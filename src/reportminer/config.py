@@ -11,6 +11,13 @@ JIRA_EMAIL = os.environ.get("MINE_JIRA_EMAIL", "")
 # Custom field ID for test steps (e.g., customfield_10100)
 JIRA_STEPS_FIELD = os.environ.get("MINE_JIRA_STEPS_FIELD", "")
 
+# Jira requests in flight at once when enriching many results
+JIRA_CONCURRENCY = int(os.environ.get("MINE_JIRA_CONCURRENCY", "8"))
+
+# Jira requests per second at most (0 for no limit), and retries of failed ones
+JIRA_RATE_LIMIT = float(os.environ.get("MINE_JIRA_RATE", "10"))
+JIRA_MAX_RETRIES = int(os.environ.get("MINE_JIRA_RETRIES", "5"))
+
 # Spinner style: "unicode" for fancy stars, "ascii" for basic characters
 SPINNER_STYLE = os.environ.get("MINE_SPINNER", "unicode")
 
@@ -22,6 +29,27 @@ CACHE_DIR = Path(os.environ.get(
 
 CACHE_TTL_HOURS = int(os.environ.get("MINE_CACHE_TTL", "24"))
 
+# Where Jira responses are cached: "json" (a file per issue) or "sqlite" (one database)
+CACHE_BACKEND = os.environ.get("MINE_CACHE_BACKEND", "json")
+
+# Hours expired entries are still served while being refreshed in the background
+CACHE_STALE_HOURS = int(os.environ.get("MINE_CACHE_STALE", "168"))
+
+# Hours Jira issues that weren't found are remembered as missing
+CACHE_NEGATIVE_TTL_HOURS = int(os.environ.get("MINE_CACHE_NEGATIVE_TTL", "1"))
+
+# Days a parsed report stays in the parse cache without being used
+PARSE_CACHE_DAYS = int(os.environ.get("MINE_PARSE_CACHE_DAYS", "14"))
+
+# Results warehouse for `mine ingest` and `mine query` (follows XDG_DATA_HOME convention)
+WAREHOUSE_PATH = Path(os.environ.get(
+    "MINE_WAREHOUSE",
+    Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / "reportminer" / "warehouse.db"
+))
+
+# Token overlap (Jaccard similarity) at which --cluster merges failure groups
+CLUSTER_THRESHOLD = float(os.environ.get("MINE_CLUSTER_THRESHOLD", "0.7"))
+
 # Default CLI options
 DEFAULT_FORMAT = os.environ.get("MINE_FORMAT", "raw")
 DEFAULT_STATUS = os.environ.get("MINE_STATUS", "failed")
@@ -1,214 +1,315 @@
 """Output formatters for different output modes."""
 
+import csv
+import io
+import json
+from typing import IO, Iterable, Iterator, TextIO
+
 from . import config
+from .grouping import group_by_reason
 from .models import TestResult
+from .table import ResultTable, Results, result_batches, result_columns
+
+
+# Rows converted at a time by the export formats, bounding their memory
+EXPORT_BATCH_ROWS = 10_000
+
+# Fields written by the export formats; execution_log is opt-in
+EXPORT_FIELDS = tuple(name for name in TestResult.FIELDS if name != "execution_log")
 
 
 class Formatter:
-    """Base class for formatters."""
+    """Base class for formatters.
+
+    Formatters take a list of TestResult or a ResultTable and read whole
+    columns through result_columns, so tables are never split into rows.
 
-    def format(self, results: list[TestResult]) -> str:
+    Output is produced line by line by iter_format; write_to streams it to
+    a file so large outputs are never held as one string, and format joins
+    it for callers that want the text.
+    """
+
+    # Output can be split into groups by failure reason (-g)
+    groupable = True
+    # Output is bytes: no text form, write_to takes a binary stream
+    binary = False
+
+    def iter_format(self, results: Results) -> Iterator[str]:
+        """Output lines, without line endings.
+
+        An item may hold several lines, e.g. a batch of export rows.
+        """
         raise NotImplementedError
 
+    def format(self, results: Results) -> str:
+        return "\n".join(self.iter_format(results))
+
+    def write_to(self, results: Results, fp: TextIO) -> None:
+        """Write the output to a text stream, each line ending in a newline."""
+        write_lines(self.iter_format(results), fp)
+
+
+def write_lines(lines: Iterable[str], fp: TextIO) -> None:
+    """Write lines to a text stream, each followed by a newline."""
+    for line in lines:
+        fp.write(line)
+        fp.write("\n")
+
 
 class RawFormatter(Formatter):
     """Comma-separated TMS numbers."""
 
-    def format(self, results: list[TestResult]) -> str:
-        tms_numbers = [r.tms_number for r in results]
-        return ", ".join(tms_numbers)
+    def iter_format(self, results: Results) -> Iterator[str]:
+        tms_numbers, = result_columns(results, "tms_number")
+        yield ", ".join(tms_numbers)
 
 
 class PytestFormatter(Formatter):
     """TMS numbers joined with 'or' for pytest -m flag."""
 
-    def format(self, results: list[TestResult]) -> str:
-        tms_numbers = [r.tms_number for r in results]
-        return " or ".join(tms_numbers)
+    def iter_format(self, results: Results) -> Iterator[str]:
+        tms_numbers, = result_columns(results, "tms_number")
+        yield " or ".join(tms_numbers)
 
 
 class NamesFormatter(Formatter):
     """Comma-separated test function names."""
 
-    def format(self, results: list[TestResult]) -> str:
-        names = [r.test_name for r in results]
-        return ", ".join(names)
+    def iter_format(self, results: Results) -> Iterator[str]:
+        names, = result_columns(results, "test_name")
+        yield ", ".join(names)
 
 
 class FullFormatter(Formatter):
     """Full test paths, one per line."""
 
-    def format(self, results: list[TestResult]) -> str:
-        paths = [r.test_id for r in results]
-        return "\n".join(paths)
+    def iter_format(self, results: Results) -> Iterator[str]:
+        paths, = result_columns(results, "test_id")
+        yield from paths
 
 
 class DetailedFormatter(Formatter):
     """Structured blocks with TMS, status, name and full failure reason."""
 
-    def format(self, results: list[TestResult]) -> str:
-        lines = []
+    def iter_format(self, results: Results) -> Iterator[str]:
         separator = "-" * 80
+        columns = result_columns(results, "tms_number", "status", "test_name", "failure_reason")
 
-        for i, r in enumerate(results):
+        for i, (tms_number, status, test_name, reason) in enumerate(zip(*columns)):
             if i > 0:
-                lines.append("")
-            lines.append(separator)
-            lines.append(f"TMS:      {r.tms_number}")
-            lines.append(f"Status:   {r.status.value}")
-            lines.append(f"Test:     {r.test_name}")
+                yield ""
+            yield separator
+            yield f"TMS:      {tms_number}"
+            yield f"Status:   {status.value}"
+            yield f"Test:     {test_name}"
 
-            reason = r.failure_reason or ""
+            reason = reason or ""
             if reason:
-                lines.append("Reason:")
+                yield "Reason:"
                 # Indent each line of the reason
                 for reason_line in reason.split("\n"):
-                    lines.append(f"  {reason_line}")
+                    yield f"  {reason_line}"
 
-        if lines:
-            lines.append(separator)
-
-        return "\n".join(lines)
+        if columns[0]:
+            yield separator
 
 
 class JiraFormatter(Formatter):
     """Jira links, one per line."""
 
-    def format(self, results: list[TestResult]) -> str:
+    def iter_format(self, results: Results) -> Iterator[str]:
         base_url = config.JIRA_BASE_URL.rstrip("/")
-        lines = []
-        for r in results:
-            url = f"{base_url}/browse/{r.tms_jira_format}"
-            lines.append(url)
-        return "\n".join(lines)
-
-
-class GroupedFormatter(Formatter):
-    """Group tests by failure reason."""
-
-    def format(self, results: list[TestResult]) -> str:
-        # Group by failure reason
-        groups: dict[str, list[TestResult]] = {}
-        for r in results:
-            reason = r.failure_reason or "No failure reason"
-            # Normalize reason - take first line, truncate if too long
-            reason = reason.split("\n")[0].strip()
-            if len(reason) > 80:
-                reason = reason[:77] + "..."
-            if not reason:
-                reason = "No failure reason"
-
-            if reason not in groups:
-                groups[reason] = []
-            groups[reason].append(r)
-
-        # Sort groups by count (most common first)
-        sorted_groups = sorted(groups.items(), key=lambda x: -len(x[1]))
-
-        lines = []
-        for reason, tests in sorted_groups:
-            lines.append(f"[{len(tests)} tests] {reason}")
-            for t in tests:
-                lines.append(f"  - {t.tms_number}: {t.test_name}")
-            lines.append("")
-
-        return "\n".join(lines).rstrip()
+        jira_keys, = result_columns(results, "tms_jira_format")
+        for jira_key in jira_keys:
+            yield f"{base_url}/browse/{jira_key}"
 
 
 class JiraMarkdownFormatter(Formatter):
     """GitHub-flavored markdown links: [title](url)"""
 
-    def format(self, results: list[TestResult]) -> str:
+    def iter_format(self, results: Results) -> Iterator[str]:
         base_url = config.JIRA_BASE_URL.rstrip("/")
-        lines = []
 
-        for r in results:
-            jira_key = r.tms_jira_format
+        for jira_key, summary in zip(*result_columns(results, "tms_jira_format", "jira_summary")):
             url = f"{base_url}/browse/{jira_key}"
 
             # Use Jira summary if available, otherwise just the key
-            if r.jira_summary:
-                title = f"{jira_key}: {r.jira_summary}"
+            if summary:
+                title = f"{jira_key}: {summary}"
             else:
                 title = jira_key
 
             # Markdown link format: [title](url)
-            lines.append(f"- [{title}]({url})")
-
-        return "\n".join(lines)
+            yield f"- [{title}]({url})"
 
 
 class JiraWikiFormatter(Formatter):
     """Confluence wiki markup with titles: [title|url]"""
 
-    def format(self, results: list[TestResult]) -> str:
+    def iter_format(self, results: Results) -> Iterator[str]:
         base_url = config.JIRA_BASE_URL.rstrip("/")
-        lines = []
 
-        for r in results:
-            jira_key = r.tms_jira_format
+        for jira_key, summary in zip(*result_columns(results, "tms_jira_format", "jira_summary")):
             url = f"{base_url}/browse/{jira_key}"
 
             # Use Jira summary if available, otherwise just the key
-            if r.jira_summary:
-                title = f"{jira_key}: {r.jira_summary}"
+            if summary:
+                title = f"{jira_key}: {summary}"
             else:
                 title = jira_key
 
             # Confluence wiki link format: [title|url]
-            lines.append(f"[{title}|{url}]")
+            yield f"[{title}|{url}]"
+
+
+_STATUS_INDEX = EXPORT_FIELDS.index("status")
 
-        return "\n".join(lines)
+
+def _export_batches(results: Results, with_logs: bool) -> Iterator[list[list]]:
+    """Columns of the export fields, EXPORT_BATCH_ROWS rows at a time.
+
+    Statuses are their string values. Logs of a table are built per batch
+    and not kept, so exporting them doesn't hold every log at once.
+    """
+    for batch in result_batches(results, EXPORT_BATCH_ROWS):
+        columns = result_columns(batch, *EXPORT_FIELDS)
+        columns[_STATUS_INDEX] = [status.value for status in columns[_STATUS_INDEX]]
+        if with_logs:
+            if isinstance(batch, ResultTable):
+                columns.append(batch.execution_logs(keep=False))
+            else:
+                columns.append([r.execution_log for r in batch])
+        yield columns
+
+
+class ExportFormatter(Formatter):
+    """Base class for machine-readable dumps of every TestResult field."""
+
+    groupable = False
+
+    def __init__(self, with_logs: bool = False):
+        self.with_logs = with_logs
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Names of the exported fields, in column order."""
+        return EXPORT_FIELDS + ("execution_log",) if self.with_logs else EXPORT_FIELDS
+
+
+class NdjsonFormatter(ExportFormatter):
+    """One JSON object per line, one per result."""
+
+    def iter_format(self, results: Results) -> Iterator[str]:
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+        names = self.fields
+        for columns in _export_batches(results, self.with_logs):
+            for row in zip(*columns):
+                yield dumps(dict(zip(names, row)))
+
+
+class CsvFormatter(ExportFormatter):
+    """CSV with a header row; missing values are empty."""
+
+    def iter_format(self, results: Results) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(self.fields)
+        for columns in _export_batches(results, self.with_logs):
+            writer.writerows(zip(*columns))
+            yield buffer.getvalue()[:-1]
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            # Only the header: no results
+            yield buffer.getvalue()[:-1]
+
+    def write_to(self, results: Results, fp: TextIO) -> None:
+        # Straight to the stream, without a text copy of each batch
+        writer = csv.writer(fp, lineterminator="\n")
+        writer.writerow(self.fields)
+        for columns in _export_batches(results, self.with_logs):
+            writer.writerows(zip(*columns))
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Writing Parquet requires the pyarrow package "
+            "(pip install 'reportminer[parquet]')"
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+class ParquetFormatter(ExportFormatter):
+    """Apache Parquet file with a string column per field.
+
+    Written one row group per batch, so memory stays bounded however many
+    results there are. Values that aren't strings (a numeric duration, say)
+    are written as text, as in csv. Binary, so only write_to works. Needs
+    pyarrow.
+    """
+
+    binary = True
+
+    def iter_format(self, results: Results) -> Iterator[str]:
+        raise ValueError("parquet is a binary format; write it to a file")
+
+    def write_to(self, results: Results, fp: IO[bytes]) -> None:
+        pa, pq = _import_pyarrow()
+        schema = pa.schema([(name, pa.string()) for name in self.fields])
+        with pq.ParquetWriter(fp, schema) as writer:
+            for columns in _export_batches(results, self.with_logs):
+                columns = [
+                    [value if value is None or type(value) is str else str(value) for value in column]
+                    for column in columns
+                ]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
 
 
 class GroupedByReasonFormatter(Formatter):
     """Group tests by failure reason with configurable inner format."""
 
-    def __init__(self, inner_format: str = "raw"):
+    def __init__(self, inner_format: str = "raw", cluster: bool = False):
         self.inner_format = inner_format
+        self.cluster = cluster
 
-    def format(self, results: list[TestResult]) -> str:
-        # Group by failure reason
-        groups: dict[str, list[TestResult]] = {}
-        for r in results:
-            reason = r.failure_reason or "No failure reason"
-            # Normalize reason - take first line, truncate if too long
-            reason = reason.split("\n")[0].strip()
-            if len(reason) > 80:
-                reason = reason[:77] + "..."
-            if not reason:
-                reason = "No failure reason"
-
-            if reason not in groups:
-                groups[reason] = []
-            groups[reason].append(r)
-
-        # Sort groups by count (most common first)
-        sorted_groups = sorted(groups.items(), key=lambda x: -len(x[1]))
+    def iter_format(self, results: Results) -> Iterator[str]:
+        sorted_groups = group_by_reason(results, cluster=self.cluster)
 
         # Get inner formatter
         inner_formatter = FORMATTERS.get(self.inner_format)
 
-        lines = []
-        for reason, tests in sorted_groups:
-            lines.append(f"### [{len(tests)} tests] {reason}")
-            lines.append("")
+        for i, (reason, tests) in enumerate(sorted_groups):
+            if i > 0:
+                yield ""
+            yield from self.heading(reason, tests)
 
             if inner_formatter and self.inner_format != "grouped":
-                # Use the inner formatter for each group
-                formatted_inner = inner_formatter.format(tests)
-                # Indent each line
-                for line in formatted_inner.split("\n"):
+                # Use the inner formatter for each group, indenting each line
+                for line in inner_formatter.iter_format(tests):
                     if line:
-                        lines.append(f"  {line}")
+                        yield f"  {line}"
             else:
                 # Default: just list TMS and test names
-                for t in tests:
-                    lines.append(f"  - {t.tms_number}: {t.test_name}")
+                for tms_number, test_name in zip(*result_columns(tests, "tms_number", "test_name")):
+                    yield f"  - {tms_number}: {test_name}"
 
-            lines.append("")
+    def heading(self, reason: str, tests: Results) -> list[str]:
+        """Lines introducing one group."""
+        return [f"### [{len(tests)} tests] {reason}", ""]
 
-        return "\n".join(lines).rstrip()
+
+class GroupedFormatter(GroupedByReasonFormatter):
+    """Group tests by failure reason."""
+
+    def __init__(self, cluster: bool = False):
+        super().__init__(inner_format="grouped", cluster=cluster)
+
+    def heading(self, reason: str, tests: Results) -> list[str]:
+        return [f"[{len(tests)} tests] {reason}"]
 
 
 FORMATTERS = {
@@ -220,15 +321,25 @@ FORMATTERS = {
     "jira": JiraFormatter(),
     "jira-md": JiraMarkdownFormatter(),
     "wiki": JiraWikiFormatter(),
+    "ndjson": NdjsonFormatter(),
+    "csv": CsvFormatter(),
+    "parquet": ParquetFormatter(),
 }
 
 
-def get_formatter(format_name: str, group: bool = False) -> Formatter:
+def get_formatter(
+    format_name: str,
+    group: bool = False,
+    cluster: bool = False,
+    with_logs: bool = False,
+) -> Formatter:
     """Get formatter by name.
 
     Args:
         format_name: The format to use (e.g., "raw", "pytest")
         group: If True, wrap the formatter with grouping by failure reason
+        cluster: Group, merging similar failure reasons (implies group)
+        with_logs: Include execution logs (export formats only)
     """
     format_key = format_name.lower()
 
@@ -237,8 +348,15 @@ def get_formatter(format_name: str, group: bool = False) -> Formatter:
         valid = ", ".join(FORMATTERS.keys())
         raise ValueError(f"Unknown format: {format_name}. Valid: {valid}")
 
+    if with_logs:
+        if not isinstance(formatter, ExportFormatter):
+            raise ValueError(f"Logs can only be included in export formats, not {format_name}")
+        formatter = type(formatter)(with_logs=True)
+
     # Wrap with grouping if requested
-    if group:
-        return GroupedByReasonFormatter(inner_format=format_key)
+    if group or cluster:
+        if not formatter.groupable:
+            raise ValueError(f"Format {format_name} can't be grouped")
+        return GroupedByReasonFormatter(inner_format=format_key, cluster=cluster)
 
     return formatter
@@ -0,0 +1,35 @@
+"""Grouping results by failure reason, shared by every grouped output."""
+
+from collections import Counter
+from typing import Any, Sequence
+
+from .signatures import cluster_signatures
+from .table import ResultTable, Results, result_columns
+
+
+def partition(results: Results, keys: Sequence) -> dict[Any, Results]:
+    """Split results by a key per result, in first-seen order."""
+    if isinstance(results, ResultTable):
+        return results.partition(keys)
+    groups: dict[Any, list] = {}
+    for key, r in zip(keys, results):
+        groups.setdefault(key, []).append(r)
+    return groups
+
+
+def group_by_reason(results: Results, cluster: bool = False) -> list[tuple[str, Results]]:
+    """Group results by reason key, most common first.
+
+    Keys come from the "reason_key" column: memoized on each TestResult and
+    computed once per distinct reason for a ResultTable, so grouping the
+    same results again (another formatter, the compare sections, the TUI)
+    doesn't normalize any reason twice.
+
+    With cluster, groups whose keys are similar enough (see
+    cluster_signatures) are merged under the most common key.
+    """
+    keys, = result_columns(results, "reason_key")
+    if cluster:
+        representatives = cluster_signatures(Counter(keys))
+        keys = list(map(representatives.__getitem__, keys))
+    return sorted(partition(results, keys).items(), key=lambda x: -len(x[1]))
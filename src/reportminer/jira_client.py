@@ -1,26 +1,236 @@
 """Jira API client for fetching issue data."""
 
+import asyncio
 import base64
-from typing import Optional, Callable
+import importlib.util
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Optional
 
 import httpx
 
 from . import config
-from .cache import FileCache
+from .cache import CacheEntry, FileCache
 from .models import JiraIssueData, TestResult
 
 
+# Issue keys per JQL search request (the most Jira returns per page)
+SEARCH_BATCH_SIZE = 100
+
+# Jira rejects a whole JQL query if one of its keys doesn't exist
+_MISSING_KEY_PATTERN = re.compile(r"issue with key '([^']+)' does not exist")
+
+
+# Statuses worth sending a request again for
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# First backoff delay in seconds, doubled on each retry, and the longest
+BACKOFF_BASE = 1.0
+MAX_BACKOFF = 60.0
+
+# Seconds a finished command waits for background refreshes to be cached
+REVALIDATION_WAIT = 5.0
+
+
 class JiraClientError(Exception):
     """Error communicating with Jira API."""
     pass
 
 
+@dataclass
+class SchedulerMetrics:
+    """What a RequestScheduler did, for reporting and tuning its limits."""
+    requests: int = 0           # requests sent, retries included
+    retries: int = 0            # requests sent again after a failure
+    rate_limited: int = 0       # 429 responses
+    failed: int = 0             # requests given up on after the last retry
+    waited: float = 0.0         # seconds spent waiting on pacing and backoff
+
+
+def _header_delay(headers: httpx.Headers, now: datetime) -> Optional[float]:
+    """Seconds Jira asks to wait, from Retry-After or X-RateLimit-Reset."""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                return max((parsedate_to_datetime(retry_after) - now).total_seconds(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    reset = headers.get("X-RateLimit-Reset")
+    if reset:
+        try:
+            # ISO 8601, e.g. 2024-01-15T10:32:00Z (Python < 3.11 can't parse the Z)
+            reset_time = datetime.fromisoformat(reset.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if reset_time.tzinfo is None:
+            reset_time = reset_time.replace(tzinfo=timezone.utc)
+        return max((reset_time - now).total_seconds(), 0.0)
+    return None
+
+
+class RequestScheduler:
+    """Paces Jira requests and retries the ones that fail transiently.
+
+    Requests are paced by a token bucket: `rate` per second on average
+    with bursts of up to `burst`. Each request reserves a token, so
+    concurrent requests queue up in order instead of racing for it.
+
+    A 429 (or a response with X-RateLimit-Remaining at 0) pauses every
+    request until the Retry-After delay or X-RateLimit-Reset time, since
+    Jira limits the user rather than one request. Other retryable
+    failures (RETRY_STATUSES, connection errors) back off exponentially
+    from BACKOFF_BASE with jitter, so retries of concurrent requests
+    spread out. After max_retries a request is given up on.
+
+    One scheduler can be shared by the event loop and background threads;
+    its state and metrics are updated under a lock.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = config.JIRA_RATE_LIMIT if rate is None else rate
+        self.burst = burst or max(int(self.rate), 1)
+        self.max_retries = config.JIRA_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = BACKOFF_BASE if backoff is None else backoff
+        self.metrics = SchedulerMetrics()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def reserve(self) -> float:
+        """Take a token for one request and count it; seconds to wait before sending it."""
+        with self._lock:
+            now = self._clock()
+            wait = max(self._paused_until - now, 0.0)
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # A negative balance is the queue of requests already waiting
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            self.metrics.requests += 1
+        return wait
+
+    def retry_delay(self, response: Optional[httpx.Response], attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None to not retry.
+
+        Args:
+            response: The response, or None if the request raised a transport error
+            attempt: Retries made so far
+        """
+        if response is not None:
+            now = datetime.now(timezone.utc)
+            delay = _header_delay(response.headers, now)
+            limited = response.status_code == 429 or response.headers.get("X-RateLimit-Remaining") == "0"
+            with self._lock:
+                if response.status_code == 429:
+                    self.metrics.rate_limited += 1
+                if limited and delay is not None:
+                    self._paused_until = max(self._paused_until, self._clock() + delay)
+            if response.status_code not in RETRY_STATUSES:
+                return None
+        else:
+            delay = None
+
+        with self._lock:
+            if attempt >= self.max_retries:
+                self.metrics.failed += 1
+                return None
+            self.metrics.retries += 1
+        if delay is not None:
+            return delay
+        # Half fixed, half random ("equal jitter")
+        backoff = min(self.backoff * 2 ** attempt, MAX_BACKOFF)
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    async def send(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request when allowed, retrying transient failures.
+
+        Returns the last response, which may still be an error once the
+        retries run out; transport errors are raised then.
+        """
+        attempt = 0
+        while True:
+            await self._sleep(self.reserve())
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                delay = self.retry_delay(None, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retry_delay(response, attempt)
+                if delay is None:
+                    return response
+            await self._sleep(delay)
+            attempt += 1
+
+    def send_sync(self, client: httpx.Client, method: str, url: str, **kwargs) -> httpx.Response:
+        """Like send, for synchronous code."""
+        attempt = 0
+        while True:
+            self._sleep_sync(self.reserve())
+            try:
+                response = client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                delay = self.retry_delay(None, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retry_delay(response, attempt)
+                if delay is None:
+                    return response
+            self._sleep_sync(delay)
+            attempt += 1
+
+    def _count_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.metrics.waited += seconds
+
+    async def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            self._count_wait(seconds)
+            await asyncio.sleep(seconds)
+
+    def _sleep_sync(self, seconds: float) -> None:
+        if seconds > 0:
+            self._count_wait(seconds)
+            time.sleep(seconds)
+
+
 class JiraClient:
     """Client for Jira REST API v3 (Cloud)."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self.cache = FileCache("jira")
+        self.scheduler = RequestScheduler()
         self._http_client: Optional[httpx.Client] = None
+        self._revalidations: list[threading.Thread] = []
+        self._revalidations_lock = threading.Lock()
+        # Custom transports for the HTTP clients (tests use a fake Jira)
+        self._transport = transport
+        self._async_transport = async_transport
 
     @property
     def base_url(self) -> str:
@@ -38,6 +248,16 @@ class JiraClient:
     def steps_field(self) -> str:
         return config.JIRA_STEPS_FIELD
 
+    @property
+    def concurrency(self) -> int:
+        """Most requests in flight at once when fetching many issues."""
+        return max(config.JIRA_CONCURRENCY, 1)
+
+    @property
+    def metrics(self) -> SchedulerMetrics:
+        """Requests, retries and waits of this client so far."""
+        return self.scheduler.metrics
+
     @property
     def is_configured(self) -> bool:
         """Check if Jira credentials are configured."""
@@ -49,82 +269,273 @@ class JiraClient:
         encoded = base64.b64encode(credentials.encode()).decode()
         return f"Basic {encoded}"
 
+    def _client_options(self) -> dict:
+        """Options shared by the sync and async HTTP clients."""
+        return {
+            "base_url": f"{self.base_url}/rest/api/3",
+            "headers": {
+                "Authorization": self._get_auth_header(),
+                "Accept": "application/json",
+            },
+            "timeout": 30.0,
+        }
+
     def _get_client(self) -> httpx.Client:
         """Get or create HTTP client."""
         if self._http_client is None:
-            self._http_client = httpx.Client(
-                base_url=f"{self.base_url}/rest/api/3",
-                headers={
-                    "Authorization": self._get_auth_header(),
-                    "Accept": "application/json",
-                },
-                timeout=30.0,
-            )
+            self._http_client = httpx.Client(transport=self._transport, **self._client_options())
         return self._http_client
 
+    def _async_client(self) -> httpx.AsyncClient:
+        """New async HTTP client, over HTTP/2 if the h2 package is installed.
+
+        HTTP/2 multiplexes the concurrent requests over one connection;
+        without it they share a pool of up to `concurrency` connections.
+        """
+        return httpx.AsyncClient(
+            transport=self._async_transport,
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=self.concurrency),
+            **self._client_options(),
+        )
+
     def close(self):
-        """Close HTTP client."""
+        """Close HTTP client and the cache's backend."""
         if self._http_client:
             self._http_client.close()
             self._http_client = None
+        self.cache.close()
+
+    def _fields(self) -> list[str]:
+        """Issue fields to request."""
+        fields = ["summary"]
+        if self.steps_field:
+            fields.append(self.steps_field)
+        return fields
+
+    def _parse_issue(self, issue_key: str, data: dict) -> JiraIssueData:
+        """Build issue data from an issue in an API response."""
+        fields_data = data.get("fields", {})
+        summary = fields_data.get("summary", "")
+
+        # Extract test steps from custom field
+        test_steps = None
+        if self.steps_field:
+            steps_data = fields_data.get(self.steps_field)
+            if steps_data:
+                test_steps = self._extract_text_from_field(steps_data)
+
+        return JiraIssueData(key=issue_key, summary=summary, test_steps=test_steps)
+
+    def _cache_issues(self, issues: dict[str, JiraIssueData]) -> None:
+        """Cache issues in one batch."""
+        self.cache.set_many({
+            key: {"key": key, "summary": issue.summary, "test_steps": issue.test_steps}
+            for key, issue in issues.items()
+        })
+
+    def _cache_missing(self, issue_keys: list[str]) -> None:
+        """Remember that issues weren't found, for MINE_CACHE_NEGATIVE_TTL hours."""
+        self.cache.set_many(
+            dict.fromkeys(issue_keys),
+            ttl=timedelta(hours=config.CACHE_NEGATIVE_TTL_HOURS),
+        )
+
+    @staticmethod
+    def _cached_issue(entry: CacheEntry) -> Optional[JiraIssueData]:
+        """Issue data of a cache entry; None for an issue known to be missing."""
+        return JiraIssueData(**entry.value) if entry.value else None
 
     def fetch_issue(self, issue_key: str) -> Optional[JiraIssueData]:
-        """Fetch issue data from Jira, using cache if available."""
+        """Fetch issue data from Jira, using cache if available.
+
+        A stale cached issue is returned at once and refreshed in the
+        background (see revalidate).
+        """
         # Check cache first
-        cached = self.cache.get(issue_key)
-        if cached:
-            return JiraIssueData(**cached)
+        entry = self.cache.lookup(issue_key)
+        if entry is not None:
+            if entry.stale and self.is_configured:
+                self.revalidate([issue_key])
+            return self._cached_issue(entry)
 
         if not self.is_configured:
             return None
 
         try:
-            # Build fields list
-            fields = ["summary"]
-            if self.steps_field:
-                fields.append(self.steps_field)
-
             client = self._get_client()
-            response = client.get(
-                f"/issue/{issue_key}",
-                params={"fields": ",".join(fields)},
+            response = self.scheduler.send_sync(
+                client, "GET", f"/issue/{issue_key}",
+                params={"fields": ",".join(self._fields())},
             )
 
             if response.status_code == 404:
+                self._cache_missing([issue_key])
                 return None
 
             response.raise_for_status()
-            data = response.json()
-
-            # Extract fields
-            fields_data = data.get("fields", {})
-            summary = fields_data.get("summary", "")
-
-            # Extract test steps from custom field
-            test_steps = None
-            if self.steps_field:
-                steps_data = fields_data.get(self.steps_field)
-                if steps_data:
-                    test_steps = self._extract_text_from_field(steps_data)
-
-            issue_data = JiraIssueData(
-                key=issue_key,
-                summary=summary,
-                test_steps=test_steps,
-            )
-
-            # Cache the result
-            self.cache.set(issue_key, {
-                "key": issue_key,
-                "summary": summary,
-                "test_steps": test_steps,
-            })
-
-            return issue_data
+            issue = self._parse_issue(issue_key, response.json())
+            self._cache_issues({issue_key: issue})
+            return issue
 
         except httpx.HTTPError as e:
             raise JiraClientError(f"Failed to fetch {issue_key}: {e}") from e
 
+    def fetch_issues(
+        self,
+        issue_keys: Iterable[str],
+        progress_callback: Optional[Callable] = None,
+    ) -> dict[str, JiraIssueData]:
+        """Fetch many issues (see fetch_issues_async). Not for use inside an event loop."""
+        return asyncio.run(self.fetch_issues_async(issue_keys, progress_callback))
+
+    async def fetch_issues_async(
+        self,
+        issue_keys: Iterable[str],
+        progress_callback: Optional[Callable] = None,
+    ) -> dict[str, JiraIssueData]:
+        """Fetch many issues, with one JQL search per SEARCH_BATCH_SIZE cache misses.
+
+        Cached issues are served from the cache; the rest are looked up
+        with `key in (...)` searches instead of one request per issue, and
+        every issue found is cached. Up to `concurrency` searches run at
+        once (MINE_JIRA_CONCURRENCY), so the wait is about
+        ceil(batches / concurrency) round trips. Progress is reported as
+        batches finish, with the count of keys done only ever growing.
+
+        Keys that don't exist are left out of the result and cached as
+        missing, so they aren't searched again until that entry expires.
+        A batch that fails is skipped like a failed fetch.
+
+        Stale cached issues are served as they are and refreshed in the
+        background, for the next run (see revalidate).
+        """
+        keys = list(dict.fromkeys(issue_keys))
+        issues = {}
+        missing = []
+        stale = []
+        entries = self.cache.lookup_many(keys)
+        for key in keys:
+            entry = entries.get(key)
+            if entry is None:
+                missing.append(key)
+                continue
+            if entry.stale:
+                stale.append(key)
+            if entry.value:
+                issues[key] = JiraIssueData(**entry.value)
+
+        if self.is_configured and missing:
+            found = await self._search_all(missing, progress_callback, len(keys) - len(missing), len(keys))
+            issues.update(found)
+
+        if self.is_configured and stale:
+            self.revalidate(stale)
+        return issues
+
+    async def _search_all(
+        self,
+        issue_keys: list[str],
+        progress_callback: Optional[Callable] = None,
+        done: int = 0,
+        total: Optional[int] = None,
+    ) -> dict[str, JiraIssueData]:
+        """Search issues in concurrent batches, caching the ones not found as missing."""
+        if total is None:
+            total = len(issue_keys)
+        batches = [issue_keys[i:i + SEARCH_BATCH_SIZE] for i in range(0, len(issue_keys), SEARCH_BATCH_SIZE)]
+        limit = asyncio.Semaphore(self.concurrency)
+        issues = {}
+
+        async def search(client: httpx.AsyncClient, batch: list[str]) -> list[str]:
+            async with limit:
+                try:
+                    found = await self._search_issues(client, batch)
+                except JiraClientError:
+                    # Skip failed batches, continue with others
+                    return batch
+            issues.update(found)
+            not_found = [key for key in batch if key not in found]
+            if not_found:
+                self._cache_missing(not_found)
+            return batch
+
+        if progress_callback:
+            progress_callback(done, total, issue_keys[0])
+        async with self._async_client() as client:
+            for finished in asyncio.as_completed([search(client, batch) for batch in batches]):
+                batch = await finished
+                done += len(batch)
+                if progress_callback:
+                    progress_callback(done, total, batch[-1])
+
+        return issues
+
+    def revalidate(self, issue_keys: Iterable[str]) -> threading.Thread:
+        """Refresh cached issues in a background thread.
+
+        Only the cache is updated: callers keep the stale copies they were
+        given, so results being shown don't change under them. The thread
+        is a daemon and doesn't hold up exiting; commands give it up to
+        REVALIDATION_WAIT seconds once they are done (wait_for_revalidation).
+        """
+        keys = list(issue_keys)
+        thread = threading.Thread(
+            target=lambda: asyncio.run(self._search_all(keys)),
+            name="jira-revalidate",
+            daemon=True,
+        )
+        with self._revalidations_lock:
+            self._revalidations.append(thread)
+        thread.start()
+        return thread
+
+    def wait_for_revalidation(self, timeout: Optional[float] = None) -> None:
+        """Wait for background refreshes started so far to finish.
+
+        With a timeout, waits at most that long for all of them together.
+        """
+        with self._revalidations_lock:
+            threads = list(self._revalidations)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0) if deadline is not None else None)
+        with self._revalidations_lock:
+            self._revalidations = [thread for thread in self._revalidations if thread.is_alive()]
+
+    async def _search_issues(self, client: httpx.AsyncClient, issue_keys: list[str]) -> dict[str, JiraIssueData]:
+        """Look up issues by key with a JQL search, following result pages."""
+        issues = {}
+        body = {
+            "jql": f"key in ({', '.join(issue_keys)})",
+            "fields": self._fields(),
+            "maxResults": SEARCH_BATCH_SIZE,
+        }
+        try:
+            while True:
+                response = await self.scheduler.send(client, "POST", "/search/jql", json=body)
+                if response.status_code == 400:
+                    # Retry without the keys Jira says don't exist
+                    messages = " ".join(response.json().get("errorMessages", []))
+                    unknown = set(_MISSING_KEY_PATTERN.findall(messages))
+                    if unknown and not issues and unknown.issubset(issue_keys):
+                        remaining = [key for key in issue_keys if key not in unknown]
+                        return await self._search_issues(client, remaining) if remaining else {}
+                response.raise_for_status()
+                data = response.json()
+
+                page = {issue["key"]: self._parse_issue(issue["key"], issue) for issue in data.get("issues", [])}
+                self._cache_issues(page)
+                issues.update(page)
+
+                token = data.get("nextPageToken")
+                if data.get("isLast", True) or not token:
+                    return issues
+                body["nextPageToken"] = token
+
+        except (httpx.HTTPError, ValueError) as e:
+            raise JiraClientError(f"Failed to search {len(issue_keys)} issues: {e}") from e
+
     def _extract_text_from_field(self, field_value) -> str:
         """Extract plain text from Jira field (handles ADF and plain text)."""
         if isinstance(field_value, str):
@@ -169,27 +580,22 @@ class JiraClient:
         results: list[TestResult],
         progress_callback: Optional[Callable] = None,
     ) -> list[TestResult]:
-        """Enrich test results with Jira data."""
+        """Enrich test results with Jira data, fetched in batches (see fetch_issues)."""
         if not self.is_configured:
             return results
 
-        total = len(results)
-        for i, result in enumerate(results):
-            if progress_callback:
-                progress_callback(i, total, result.tms_number)
-
-            issue_key = result.tms_jira_format
-            try:
-                issue_data = self.fetch_issue(issue_key)
-                if issue_data:
-                    result.jira_summary = issue_data.summary
-                    result.jira_test_steps = issue_data.test_steps
-            except JiraClientError:
-                # Skip failed fetches, continue with others
-                pass
+        issues = self.fetch_issues(
+            (result.tms_jira_format for result in results),
+            progress_callback=progress_callback,
+        )
+        for result in results:
+            issue_data = issues.get(result.tms_jira_format)
+            if issue_data:
+                result.jira_summary = issue_data.summary
+                result.jira_test_steps = issue_data.test_steps
 
         if progress_callback:
-            progress_callback(total, total, "complete")
+            progress_callback(len(results), len(results), "complete")
 
         return results
 
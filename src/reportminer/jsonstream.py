@@ -0,0 +1,142 @@
+"""Incremental decoding of the tests object in a report's JSON blob."""
+
+import json
+from json.decoder import scanstring
+from typing import Any, Iterable, Iterator
+
+
+WHITESPACE = " \t\n\r"
+
+# Drop the consumed part of the buffer once it grows past this size
+COMPACT_THRESHOLD = 1 << 20
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """Window over a stream of text chunks that grows on demand."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self) -> bool:
+        """Read more text. Returns False if the stream is exhausted.
+
+        Reads at least as much as is currently buffered, so re-decoding a
+        value that spans many chunks stays linear overall.
+        """
+        if self.eof:
+            return False
+
+        if self.pos > COMPACT_THRESHOLD:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+
+        wanted = max(len(self.text) - self.pos, 1)
+        parts = [self.text]
+        read = 0
+        for chunk in self._chunks:
+            parts.append(chunk)
+            read += len(chunk)
+            if read >= wanted:
+                break
+        else:
+            self.eof = True
+
+        self.text = "".join(parts)
+        return read > 0
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at the end of the stream."""
+        while True:
+            text = self.text
+            pos = self.pos
+            while pos < len(text) and text[pos] in WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume char, skipping whitespace before it."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} in JSON blob, got {found!r}")
+        self.pos += 1
+
+    def read_string(self) -> str:
+        """Decode the JSON string starting at the next non-whitespace character."""
+        self.expect('"')
+        while True:
+            try:
+                value, end = scanstring(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.more():
+                    continue
+                raise
+            self.pos = end
+            return value
+
+    def read_value(self) -> Any:
+        """Decode the JSON value starting at the next non-whitespace character."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.more():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.text) and self.more():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_object(buffer: _Buffer) -> Iterator[tuple[str, _Buffer]]:
+    """Yield each key of the object at the buffer position.
+
+    The caller must consume the value after each key before resuming.
+    """
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        buffer.pos += 1
+        return
+
+    while True:
+        key = buffer.read_string()
+        buffer.expect(":")
+        yield key, buffer
+
+        separator = buffer.peek()
+        buffer.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' at offset {buffer.pos - 1} in JSON blob")
+
+
+def iter_object_items(chunks: Iterable[str], key: str = "tests") -> Iterator[tuple[str, Any]]:
+    """Yield (name, value) pairs of one top-level object in a JSON document.
+
+    The document arrives as text chunks and only one member value is decoded
+    at a time, so memory stays bounded by the largest single test entry
+    rather than the whole blob. Yields nothing if the key is missing.
+    """
+    buffer = _Buffer(chunks)
+
+    for name, _ in _iter_object(buffer):
+        if name != key:
+            buffer.read_value()
+            continue
+
+        if buffer.peek() != "{":
+            raise ValueError(f"Expected a JSON object for {key!r}")
+        for item_name, _ in _iter_object(buffer):
+            yield item_name, buffer.read_value()
@@ -0,0 +1,53 @@
+"""Normalization of captured log text for display and export."""
+
+import html
+import re
+
+
+# ANSI escape sequences (colors, cursor movement, etc.)
+ANSI_PATTERN = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+# Control characters other than tab, newline and carriage return
+CONTROL_CHARS = "".join(map(chr, [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F]))
+CONTROL_PATTERN = re.compile(f"[{re.escape(CONTROL_CHARS)}]")
+
+# str.translate table deleting the control characters. Much faster than the
+# regex on ASCII text, much slower on anything else.
+CONTROL_DELETIONS = str.maketrans("", "", CONTROL_CHARS)
+
+# More than one blank line (spelled out so the regex engine gets a literal
+# prefix to search for instead of stopping at every newline)
+BLANK_LINES_PATTERN = re.compile(r"\n\n\n+")
+
+
+def clean_log_content(content: str) -> str:
+    """Clean up log content by removing unnecessary characters.
+
+    Decodes HTML entities, drops ANSI escape sequences and control
+    characters (except tab and newline), turns CR and CRLF line endings
+    into LF, collapses runs of blank lines into one and strips the ends.
+
+    Each step runs only when a substring check finds something for it to
+    do, so a plain log costs one translate pass plus a few memchr-speed
+    scans. The steps keep their order: decoded entities can produce
+    escapes and line breaks, and a CR pairs with an LF across a removed
+    escape sequence but not across a removed control character.
+    """
+    if "&" in content:
+        content = html.unescape(content)
+
+    if "\x1b" in content:
+        content = ANSI_PATTERN.sub("", content)
+
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+    if content.isascii():
+        content = content.translate(CONTROL_DELETIONS)
+    else:
+        content = CONTROL_PATTERN.sub("", content)
+
+    if "\n\n\n" in content:
+        content = BLANK_LINES_PATTERN.sub("\n\n", content)
+
+    return content.strip()
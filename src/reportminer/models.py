@@ -1,8 +1,11 @@
 """Data models for test results."""
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, fields
 from enum import Enum
-from typing import Optional
+from typing import Callable, Optional
+
+from .signatures import reason_key
 
 
 class TestStatus(Enum):
@@ -18,16 +21,117 @@ class TestStatus(Enum):
     @classmethod
     def from_string(cls, value: str) -> "TestStatus":
         """Create status from string, case-insensitive."""
-        normalized = value.lower().strip()
-        for status in cls:
-            if status.value == normalized:
-                return status
-        raise ValueError(f"Unknown test status: {value}")
+        status = _STATUS_LOOKUP.get(value)
+        if status is None:
+            status = _STATUS_LOOKUP.get(value.lower().strip())
+            if status is None:
+                raise ValueError(f"Unknown test status: {value}")
+        return status
 
 
-@dataclass
+# Statuses by spelling: the values, plus the capitalized ("Passed",
+# "XFailed", "Rerun") and upper-case forms reports use, so the usual
+# lookup is a single dict hit without normalizing the string first
+_STATUS_LOOKUP: dict[str, TestStatus] = {}
+for _status in TestStatus:
+    for _spelling in (_status.value, _status.value.capitalize(), _status.value.upper()):
+        _STATUS_LOOKUP[_spelling] = _status
+_STATUS_LOOKUP.update({"XFailed": TestStatus.XFAILED, "XPassed": TestStatus.XPASSED})
+del _status, _spelling
+
+
+# Most distinct failure reasons a ReasonTable shares
+MAX_SHARED_REASONS = 10_000
+
+
+def _intern(value):
+    """Share one copy of an identifier-like string between results.
+
+    Test ids, names, TMS numbers and durations repeat across every run of
+    the same suite, so a week of reports holds only a few copies of each.
+    Anything other than a string (reports may give a numeric duration) is
+    kept as it is.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+class ReasonTable:
+    """Shares one copy of each failure reason between the results of a parse.
+
+    Reasons can be long and unique (they often embed ids or timings), so
+    unlike identifiers they aren't sys.intern'd: the first
+    MAX_SHARED_REASONS distinct reasons are shared and any later ones are
+    kept as they are. The table lives as long as the parse that owns it.
+    """
+
+    __slots__ = ("_reasons",)
+
+    def __init__(self):
+        self._reasons: dict[str, str] = {}
+
+    def share(self, reason: Optional[str]) -> Optional[str]:
+        """Get the shared copy of reason."""
+        if reason is None:
+            return None
+        shared = self._reasons.get(reason)
+        if shared is not None:
+            return shared
+        if len(self._reasons) < MAX_SHARED_REASONS:
+            self._reasons[reason] = reason
+        return reason
+
+
+class _DeferredLog:
+    """Descriptor for TestResult.execution_log.
+
+    The parser attaches a loader instead of the cleaned log text, so runs
+    that never display logs never pay for extracting and cleaning them. The
+    loader runs on first read; assigning a value drops it.
+    """
+
+    def __get__(self, obj, owner=None) -> Optional[str]:
+        if obj is None:
+            # Read by @dataclass as the field's default
+            return None
+        loader = obj._log_loader
+        if loader is not None:
+            obj._log_loader = None
+            obj._execution_log = loader()
+        return obj._execution_log
+
+    def __set__(self, obj, value: Optional[str]) -> None:
+        obj._log_loader = None
+        obj._execution_log = value
+
+
+def _add_slots(cls: type, extra_slots: tuple[str, ...]) -> type:
+    """Rebuild a dataclass with __slots__, as dataclass(slots=True) does.
+
+    That option needs Python 3.10. Fields backed by a descriptor get no
+    slot of their own; extra_slots holds their storage.
+    """
+    cls_dict = dict(cls.__dict__)
+    slots = []
+    for field in fields(cls):
+        if hasattr(cls_dict.get(field.name), "__set__"):
+            continue
+        slots.append(field.name)
+        # Defaults stay in __init__, but would clash with the slot
+        cls_dict.pop(field.name, None)
+    cls_dict["__slots__"] = tuple(slots) + extra_slots
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@dataclass(init=False)
 class TestResult:
-    """Single test result with all its data."""
+    """Single test result with all its data.
+
+    A dataclass with slots: hundreds of thousands of results can be loaded
+    at once, and slots plus shared strings keep each one to a fraction of
+    a dict-backed instance.
+    """
     tms_number: str
     test_name: str
     test_id: str
@@ -38,8 +142,65 @@ class TestResult:
     # Jira integration fields
     jira_summary: Optional[str] = None
     jira_test_steps: Optional[str] = None
-    # Execution log from pytest output
-    execution_log: Optional[str] = None
+    # Execution log from pytest output, or a loader that builds it
+    execution_log: Optional[str] = _DeferredLog()
+
+    def __init__(
+        self,
+        tms_number: str,
+        test_name: str,
+        test_id: str,
+        status: TestStatus,
+        failure_reason: Optional[str] = None,
+        duration: Optional[str] = None,
+        timestamp: Optional[str] = None,
+        jira_summary: Optional[str] = None,
+        jira_test_steps: Optional[str] = None,
+        execution_log: Optional[str] = None,
+    ):
+        self.tms_number = _intern(tms_number)
+        self.test_name = _intern(test_name)
+        self.test_id = _intern(test_id)
+        self.status = status
+        self.failure_reason = failure_reason
+        self.duration = _intern(duration)
+        self.timestamp = _intern(timestamp)
+        self.jira_summary = jira_summary
+        self.jira_test_steps = jira_test_steps
+        self._execution_log = execution_log
+        self._log_loader = None
+        self._reason_key = None
+
+    def __reduce__(self) -> tuple:
+        # Rebuilt through __init__ so results unpickled from worker
+        # processes share strings too
+        args = tuple(getattr(self, name) for name in self.FIELDS[:-1]) + (self._execution_log,)
+        return self.__class__, args, self._log_loader
+
+    def __setstate__(self, log_loader: Callable[[], Optional[str]]) -> None:
+        self._log_loader = log_loader
+
+    def defer_execution_log(self, loader: Callable[[], Optional[str]]) -> None:
+        """Build execution_log by calling loader the first time it's read."""
+        self._log_loader = loader
+
+    @property
+    def log_loader(self) -> Optional[Callable[[], Optional[str]]]:
+        """Pending execution_log loader, None once the log is built."""
+        return self._log_loader
+
+    @property
+    def reason_key(self) -> str:
+        """Group key of failure_reason (see signatures.reason_key).
+
+        Computed on first access and kept with the reason it came from, so
+        grouping the same results again skips it and a changed
+        failure_reason gets a fresh key.
+        """
+        cached = self._reason_key
+        if cached is None or cached[0] is not self.failure_reason:
+            cached = self._reason_key = (self.failure_reason, reason_key(self.failure_reason))
+        return cached[1]
 
     @property
     def tms_jira_format(self) -> str:
@@ -62,6 +223,12 @@ class TestResult:
         return name.capitalize()
 
 
+TestResult = _add_slots(TestResult, ("_execution_log", "_log_loader", "_reason_key"))
+
+# Field names, in constructor order
+TestResult.FIELDS = tuple(field.name for field in fields(TestResult))
+
+
 @dataclass
 class JiraIssueData:
     """Data fetched from Jira API."""
@@ -1,21 +1,154 @@
 """HTML report parsing logic."""
 
+import html
 import json
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Any, Callable, Collection, Iterator, Optional
 
 from bs4 import BeautifulSoup
 
-from .models import TestResult, TestStatus
+from .cache import ParseCache
+from .jsonstream import iter_object_items
+from .logclean import clean_log_content
+from .models import ReasonTable, TestResult, TestStatus
+from .sources import (
+    REPORT_SUFFIXES,
+    ArchiveMember,
+    ReportSource,
+    is_archive,
+    is_plain_file,
+    list_archive_reports,
+    open_report_text,
+    read_report_text,
+    report_suffix,
+)
 
 
 # Pattern to find TMS numbers like TMS_12345
 TMS_PATTERN = re.compile(r"TMS_\d+")
 
+# Read size for streaming the JSON blob out of a report
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Longest HTML entity name plus "&" and ";"
+MAX_ENTITY_LENGTH = 34
+
+# pytest-html's "Report generated on 15-Jan-2024 at 10:30:00" line
+REPORT_TIME_PATTERN = re.compile(r"Report generated on (\d{1,2}-[A-Za-z]{3}-\d{4}) at (\d{1,2}:\d{2}:\d{2})")
+
+# Longest text REPORT_TIME_PATTERN can match
+MAX_REPORT_TIME_LENGTH = 64
+
+
+# Markers that locate the data container tag, in the same priority order
+# as the BeautifulSoup lookup (by id first, then by attribute)
+CONTAINER_MARKERS = ('id="data-container"', "id='data-container'", "data-jsonblob=")
+
+# Tag name and attribute tokens, following html.parser's tokenizing rules
+TAG_START_PATTERN = re.compile(r"<[a-zA-Z][^\s/>]*")
+TAG_ATTR_PATTERN = re.compile(
+    r"""\s*([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?"""
+)
+TAG_SPACE_PATTERN = re.compile(r"[\s/]*")
+
+# The same tokens for scanning raw (memory-mapped) report bytes
+TAG_BYTES_PATTERNS = tuple(
+    re.compile(pattern.pattern.encode())
+    for pattern in (TAG_START_PATTERN, TAG_ATTR_PATTERN, TAG_SPACE_PATTERN)
+)
+
+
+def _read_tag_attrs(html_content, tag_start: int) -> Optional[dict[str, str]]:
+    """Read the attributes of the start tag beginning at tag_start.
+
+    html_content may be text or a bytes-like object such as an mmap, in
+    which case attribute values are decoded as UTF-8. Returns None if the
+    content at that position is not a well-formed start tag.
+    """
+    as_bytes = not isinstance(html_content, str)
+    if as_bytes:
+        start_pattern, attr_pattern, space_pattern = TAG_BYTES_PATTERNS
+    else:
+        start_pattern, attr_pattern, space_pattern = (
+            TAG_START_PATTERN, TAG_ATTR_PATTERN, TAG_SPACE_PATTERN,
+        )
+
+    match = start_pattern.match(html_content, tag_start)
+    if not match:
+        return None
+
+    attrs = {}
+    pos = match.end()
+    while True:
+        pos = space_pattern.match(html_content, pos).end()
+        next_char = html_content[pos:pos + 1]
+        if not next_char:
+            return None
+        if next_char in (">", b">"):
+            return attrs
+
+        match = attr_pattern.match(html_content, pos)
+        if not match or match.end() == pos:
+            return None
+        name, double_quoted, single_quoted, unquoted = match.groups()
+        value = next(
+            (v for v in (double_quoted, single_quoted, unquoted) if v is not None),
+            None,
+        )
+        if as_bytes:
+            name = name.decode("latin-1")
+            value = value.decode("utf-8") if value is not None else None
+        # Later duplicates win, same as BeautifulSoup
+        attrs[name.lower()] = value
+        pos = match.end()
+
+
+def scan_json_blob(html_content) -> Optional[str]:
+    """Find the data-jsonblob attribute value by scanning the raw HTML.
+
+    Only the container's start tag is tokenized and only the attribute value
+    is decoded and unescaped, so html_content can also be the undecoded bytes
+    of the report. Returns None when the container can't be located this way.
+    """
+    as_bytes = not isinstance(html_content, str)
+
+    for marker in CONTAINER_MARKERS:
+        if as_bytes:
+            marker_pos = html_content.find(marker.encode())
+            tag_start = html_content.rfind(b"<", 0, marker_pos) if marker_pos != -1 else -1
+        else:
+            marker_pos = html_content.find(marker)
+            tag_start = html_content.rfind("<", 0, marker_pos) if marker_pos != -1 else -1
+        if tag_start == -1:
+            continue
+
+        attrs = _read_tag_attrs(html_content, tag_start)
+        if attrs is None:
+            continue
+
+        json_blob = attrs.get("data-jsonblob")
+        if json_blob:
+            return html.unescape(json_blob)
+        if attrs.get("id") == "data-container":
+            # Container without a blob - let the full parse report it
+            return None
+
+    return None
+
 
 def extract_json_data(html_content: str) -> dict:
     """Pull JSON data blob from pytest-html report."""
+    json_blob = scan_json_blob(html_content)
+    if json_blob is not None:
+        return json.loads(json_blob)
+
+    # Fall back to a full parse for unusual markup
     soup = BeautifulSoup(html_content, "html.parser")
 
     # Try finding by id first, then by attribute
@@ -34,6 +167,63 @@ def extract_json_data(html_content: str) -> dict:
     return json.loads(json_blob)
 
 
+def read_json_data(file_path: ReportSource) -> dict:
+    """Pull JSON data blob from a report file on disk.
+
+    Plain files are memory-mapped and scanned as bytes, so only the blob
+    itself is copied and decoded - not the HTML, CSS and JS around it.
+    Compressed files and archive members are decompressed as a stream and
+    only the blob is kept. Both fall back to reading the whole report as text.
+    """
+    if not is_plain_file(file_path):
+        with open_report_text(file_path) as stream:
+            blob_start = _find_blob_start(stream)
+            if blob_start:
+                return json.loads("".join(_iter_blob_chunks(stream, *blob_start)))
+        return extract_json_data(read_report_text(file_path))
+
+    with file_path.open("rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty and special files can't be mapped
+            mapped = None
+
+        if mapped is not None:
+            with mapped:
+                json_blob = scan_json_blob(mapped)
+            if json_blob is not None:
+                return json.loads(json_blob)
+
+    return extract_json_data(read_report_text(file_path))
+
+
+def read_report_time(file_path: ReportSource) -> Optional[datetime]:
+    """When pytest-html generated a report, from its "Report generated on" line.
+
+    The report is read as a stream up to that line. Returns None if there
+    is no such line or its date can't be read.
+    """
+    with open_report_text(file_path) as stream:
+        buffer = ""
+        while True:
+            chunk = stream.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return None
+            buffer += chunk
+
+            match = REPORT_TIME_PATTERN.search(buffer)
+            if match:
+                break
+            # Keep enough to match a line split across chunks
+            buffer = buffer[-MAX_REPORT_TIME_LENGTH:]
+
+    try:
+        return datetime.strptime(" ".join(match.groups()), "%d-%b-%Y %H:%M:%S")
+    except ValueError:
+        return None
+
+
 def parse_tms_from_row(row_html: str) -> Optional[str]:
     """Find TMS number in a table row HTML string."""
     match = TMS_PATTERN.search(row_html)
@@ -53,16 +243,63 @@ def parse_test_name_from_id(test_id: str) -> str:
     return test_id
 
 
+# Markup that carries no text: script/style blocks, comments, declarations,
+# processing instructions and tags (quoted attribute values may contain ">")
+MARKUP_PATTERN = re.compile(
+    r"<(script|style)\b.*?(?:</\1\s*>|\Z)"
+    r"|<!--.*?(?:-->|\Z)"
+    r"|<![^>]*>"
+    r"|<\?[^>]*>"
+    r"""|</?[a-zA-Z](?:[^>"']|"[^"]*"|'[^']*')*>""",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Contents of <pre> blocks, up to the closing tag or end of the cell
+PRE_BLOCK_PATTERN = re.compile(
+    r"""<pre(?:\s(?:[^>"']|"[^"]*"|'[^']*')*)?>(.*?)(?:</pre\s*>|\Z)""",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def html_fragment_text(fragment: str, strip: bool = False) -> str:
+    """Get the text of an HTML fragment without building a parse tree.
+
+    Matches BeautifulSoup's get_text(): entities are decoded, and with
+    strip=True each text piece is stripped and empty pieces are dropped.
+    """
+    pieces = []
+    # Odd items are the captured script/style tag names, not text
+    for piece in MARKUP_PATTERN.split(fragment)[::2]:
+        if not piece:
+            continue
+        if "&" in piece:
+            piece = html.unescape(piece)
+        if strip:
+            piece = piece.strip()
+            if not piece:
+                continue
+        pieces.append(piece)
+    return "".join(pieces)
+
+
+def iter_pre_texts(fragment: str) -> Iterator[str]:
+    """Yield the text of each <pre> block in an HTML fragment."""
+    for match in PRE_BLOCK_PATTERN.finditer(fragment):
+        yield html_fragment_text(match.group(1))
+
+
 def parse_failure_reason(row_cells: list[str]) -> Optional[str]:
     """Get failure reason text from table row cells."""
     if len(row_cells) > 3:
-        reason_cell = row_cells[3]
-        soup = BeautifulSoup(reason_cell, "html.parser")
-        text = soup.get_text(strip=True)
+        text = html_fragment_text(row_cells[3], strip=True)
         return text if text else None
     return None
 
 
+# Names of pytest-html extras that hold log output
+LOG_EXTRA_NAMES = ("stdout", "stderr", "log")
+
+
 def extract_execution_log(test_data: dict, row_cells: list[str]) -> Optional[str]:
     """Extract stdout/stderr/log output from test data."""
     log_parts = []
@@ -73,64 +310,87 @@ def extract_execution_log(test_data: dict, row_cells: list[str]) -> Optional[str
         if isinstance(extra, dict):
             name = extra.get("name", "")
             content = extra.get("content", "")
-            if name.lower() in ("stdout", "stderr", "log") and content:
+            if name.lower() in LOG_EXTRA_NAMES and content:
                 log_parts.append(f"=== {name.upper()} ===")
                 # Clean up the content - decode HTML entities and clean whitespace
-                cleaned = _clean_log_content(content)
+                cleaned = clean_log_content(content)
                 log_parts.append(cleaned)
 
     # Check direct log field
     log_content = test_data.get("log", "")
     if log_content:
         log_parts.append("=== LOG ===")
-        cleaned = _clean_log_content(log_content)
+        cleaned = clean_log_content(log_content)
         log_parts.append(cleaned)
 
     # Extract logs from the results table row (often stored in expandable sections)
     for cell in row_cells:
-        if "log" in cell.lower() or "pre" in cell.lower():
-            soup = BeautifulSoup(cell, "html.parser")
-            # Find all <pre> tags which usually contain log output
-            for pre in soup.find_all("pre"):
-                text = pre.get_text()  # Don't strip - preserve formatting
+        cell_lower = cell.lower()
+        if ("log" in cell_lower or "pre" in cell_lower) and "<pre" in cell_lower:
+            # <pre> blocks usually contain log output
+            for text in iter_pre_texts(cell):  # Don't strip - preserve formatting
                 if text and len(text.strip()) > 10:  # Skip tiny snippets
-                    cleaned = _clean_log_content(text)
+                    cleaned = clean_log_content(text)
                     log_parts.append(cleaned)
 
     return "\n\n".join(log_parts) if log_parts else None
 
 
-def _clean_log_content(content: str) -> str:
-    """Clean up log content by removing unnecessary characters."""
-    import html
-
-    # Decode HTML entities (e.g., &lt; -> <, &amp; -> &)
-    content = html.unescape(content)
-
-    # Remove ANSI escape sequences (color codes, etc.)
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    content = ansi_escape.sub('', content)
-
-    # Remove carriage returns (but keep newlines)
-    content = content.replace('\r\n', '\n').replace('\r', '\n')
-
-    # Remove null bytes and other control characters (except newline and tab)
-    content = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', content)
-
-    # Normalize multiple blank lines to single blank line
-    content = re.sub(r'\n{3,}', '\n\n', content)
-
-    return content.strip()
-
-
-def parse_test_result(test_id: str, test_data: dict) -> Optional[TestResult]:
-    """Parse one test result from the JSON data."""
+def _log_sources(test_data: dict, row_cells: list[str]) -> Optional[tuple[dict, list[str]]]:
+    """Keep only the parts of a test entry that extract_execution_log reads.
+
+    Returns (test data, row cells) holding just the log extras, the log
+    field and the cells with <pre> blocks, or None if the test has no log.
+    """
+    extras = [
+        {"name": extra.get("name", ""), "content": extra.get("content", "")}
+        for extra in test_data.get("extras", [])
+        if isinstance(extra, dict) and extra.get("name", "").lower() in LOG_EXTRA_NAMES
+        and extra.get("content")
+    ]
+    log_data = {"extras": extras} if extras else {}
+    if test_data.get("log"):
+        log_data["log"] = test_data["log"]
+    log_cells = [cell for cell in row_cells if "<pre" in cell.lower()]
+
+    if not log_data and not log_cells:
+        return None
+    return log_data, log_cells
+
+
+def parse_test_result(
+    test_id: str,
+    test_data: dict,
+    statuses: Optional[Collection[TestStatus]] = None,
+    tms_filter: Optional[Callable[[str], bool]] = None,
+    name_filter: Optional[Callable[[str], bool]] = None,
+    reasons: Optional[ReasonTable] = None,
+    detail_statuses: Optional[Collection[TestStatus]] = None,
+) -> Optional[TestResult]:
+    """Parse one test result from the JSON data.
+
+    Filters are checked as early as possible, so rejected tests skip TMS
+    scanning and reason extraction:
+        statuses: Keep only tests with one of these statuses
+        tms_filter: Keep only tests whose TMS number passes this check
+        name_filter: Keep only tests whose function name passes this check
+    Tests whose status isn't in detail_statuses (if given) are kept without
+    their failure reason and log, for callers that only need their TMS
+    number and status. The failure reason is shared through reasons, if given.
+    """
     result_str = test_data.get("result", "")
     try:
         status = TestStatus.from_string(result_str)
     except ValueError:
         return None
 
+    if statuses is not None and status not in statuses:
+        return None
+
+    test_name = parse_test_name_from_id(test_id)
+    if name_filter and not name_filter(test_name):
+        return None
+
     results_row = test_data.get("resultsTableRow", [])
 
     # Find TMS number in any cell
@@ -143,11 +403,17 @@ def parse_test_result(test_id: str, test_data: dict) -> Optional[TestResult]:
     if not tms_number:
         return None
 
-    test_name = parse_test_name_from_id(test_id)
-    failure_reason = parse_failure_reason(results_row)
-    execution_log = extract_execution_log(test_data, results_row)
+    if tms_filter and not tms_filter(tms_number):
+        return None
+
+    detailed = detail_statuses is None or status in detail_statuses
+    failure_reason = None
+    if detailed:
+        failure_reason = parse_failure_reason(results_row)
+        if reasons is not None:
+            failure_reason = reasons.share(failure_reason)
 
-    return TestResult(
+    result = TestResult(
         tms_number=tms_number,
         test_name=test_name,
         test_id=test_id,
@@ -155,42 +421,216 @@ def parse_test_result(test_id: str, test_data: dict) -> Optional[TestResult]:
         failure_reason=failure_reason,
         duration=test_data.get("duration"),
         timestamp=test_data.get("time"),
-        execution_log=execution_log,
     )
-
-
-def parse_report(file_path: Path) -> Iterator[TestResult]:
-    """Parse a single pytest-html report file."""
-    html_content = file_path.read_text(encoding="utf-8")
-    data = extract_json_data(html_content)
-
-    tests = data.get("tests", {})
-
-    for test_id, test_runs in tests.items():
+    # Logs are the largest part of a result - only clean them if they're
+    # shown. The loader holds just the log fragments, not the whole entry.
+    log_sources = _log_sources(test_data, results_row) if detailed else None
+    if log_sources:
+        result.defer_execution_log(partial(extract_execution_log, *log_sources))
+    return result
+
+
+def _find_blob_start(stream) -> Optional[tuple[str, str]]:
+    """Read a text stream up to the start of the data-jsonblob value.
+
+    Returns (quote, text read past the opening quote), or None if the stream
+    has no quoted data-jsonblob attribute.
+    """
+    marker = "data-jsonblob="
+    buffer = ""
+    while True:
+        chunk = stream.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            return None
+        buffer += chunk
+
+        idx = buffer.find(marker)
+        if idx == -1:
+            # Keep enough to match a marker split across chunks
+            buffer = buffer[-len(marker):]
+            continue
+
+        value_start = idx + len(marker)
+        if value_start == len(buffer):
+            continue
+        quote = buffer[value_start]
+        if quote not in "\"'":
+            return None
+        return quote, buffer[value_start + 1:]
+
+
+def _iter_blob_chunks(stream, quote: str, buffer: str) -> Iterator[str]:
+    """Yield the unescaped data-jsonblob value in chunks, up to the closing quote."""
+    while True:
+        end = buffer.find(quote)
+        if end != -1:
+            yield html.unescape(buffer[:end])
+            return
+
+        # Hold back an entity that may continue in the next chunk
+        split = buffer.rfind("&", max(len(buffer) - MAX_ENTITY_LENGTH, 0))
+        if split == -1:
+            split = len(buffer)
+        yield html.unescape(buffer[:split])
+
+        chunk = stream.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            raise ValueError("Unterminated JSON data blob in report")
+        buffer = buffer[split:] + chunk
+
+
+def _iter_streamed_tests(file_path: ReportSource) -> Iterator[tuple[str, Any]]:
+    """Yield (test_id, test_runs) while streaming the report from disk.
+
+    Falls back to a full in-memory parse if the blob can't be located
+    while streaming.
+    """
+    with open_report_text(file_path) as stream:
+        blob_start = _find_blob_start(stream)
+        if blob_start:
+            yield from iter_object_items(_iter_blob_chunks(stream, *blob_start), "tests")
+            return
+
+    data = read_json_data(file_path)
+    yield from data.get("tests", {}).items()
+
+
+def parse_report(
+    file_path: ReportSource,
+    statuses: Optional[Collection[TestStatus]] = None,
+    tms_filter: Optional[Callable[[str], bool]] = None,
+    name_filter: Optional[Callable[[str], bool]] = None,
+    low_memory: bool = False,
+    detail_statuses: Optional[Collection[TestStatus]] = None,
+) -> Iterator[TestResult]:
+    """Parse a single pytest-html report file.
+
+    Filters and detail_statuses are passed on to parse_test_result.
+    Repeated failure reasons are shared between the report's results. With
+    low_memory, the JSON blob is streamed from disk and decoded one test at
+    a time instead of being loaded whole.
+    """
+    if low_memory:
+        tests = _iter_streamed_tests(file_path)
+    else:
+        data = read_json_data(file_path)
+        tests = data.get("tests", {}).items()
+
+    reasons = ReasonTable()
+    for test_id, test_runs in tests:
         # Handle both single result and list of results
         if not isinstance(test_runs, list):
             test_runs = [test_runs]
 
         for test_data in test_runs:
-            result = parse_test_result(test_id, test_data)
+            result = parse_test_result(
+                test_id, test_data, statuses, tms_filter, name_filter, reasons, detail_statuses,
+            )
             if result:
                 yield result
 
 
-def parse_reports(file_paths: list[Path], progress_callback=None) -> list[TestResult]:
-    """Parse multiple report files."""
-    results = []
-    total = len(file_paths)
+def _parse_report_list(file_path: ReportSource, options: dict) -> list[TestResult]:
+    """Parse a whole report into a list (runs in pool workers)."""
+    return list(parse_report(file_path, **options))
 
-    for i, file_path in enumerate(file_paths):
-        if progress_callback:
-            progress_callback(i, total, file_path.name)
 
-        try:
-            for result in parse_report(file_path):
-                results.append(result)
-        except Exception as e:
-            raise RuntimeError(f"Failed to parse {file_path}: {e}") from e
+def iter_parsed_reports(
+    file_paths: list[ReportSource],
+    jobs: Optional[int] = None,
+    progress_callback=None,
+    cache: Optional[ParseCache] = None,
+    options: Optional[dict] = None,
+) -> Iterator[tuple[ReportSource, list[TestResult]]]:
+    """Yield (file_path, results) per file, in file order.
+
+    Cached reports are loaded directly. With more than one report left to
+    parse, they go to a process pool while progress is still reported from
+    this process. options are keyword arguments for parse_report.
+    """
+    total = len(file_paths)
+    options = options or {}
+    statuses = options.get("statuses")
+    detail_statuses = options.get("detail_statuses")
+    cached = [cache.get(path, statuses, detail_statuses) if cache else None for path in file_paths]
+    to_parse = [i for i, hit in enumerate(cached) if hit is None]
+    workers = min(jobs or os.cpu_count() or 1, len(to_parse))
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    futures = {}
+    if executor:
+        futures = {i: executor.submit(_parse_report_list, file_paths[i], options) for i in to_parse}
+
+    try:
+        for i, file_path in enumerate(file_paths):
+            if progress_callback:
+                progress_callback(i, total, file_path.name)
+
+            file_results = cached[i]
+            if file_results is None:
+                try:
+                    if i in futures:
+                        file_results = futures[i].result()
+                    else:
+                        file_results = _parse_report_list(file_path, options)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to parse {file_path}: {e}") from e
+                if cache:
+                    cache.set(file_path, file_results, statuses, detail_statuses)
+
+            yield file_path, file_results
+    finally:
+        if executor:
+            # Don't wait for the rest of the files if one has failed
+            executor.shutdown(cancel_futures=True)
+
+
+def parse_reports(
+    file_paths: list[ReportSource],
+    progress_callback=None,
+    jobs: Optional[int] = None,
+    use_cache: bool = False,
+    statuses: Optional[Collection[TestStatus]] = None,
+    tms_filter: Optional[Callable[[str], bool]] = None,
+    name_filter: Optional[Callable[[str], bool]] = None,
+    low_memory: bool = False,
+    detail_statuses: Optional[Collection[TestStatus]] = None,
+) -> list[TestResult]:
+    """Parse multiple report files.
+
+    Args:
+        file_paths: Report files, results are returned in this order
+        progress_callback: Called with (current, total, item) before each file
+        jobs: Number of worker processes (default: CPU count)
+        use_cache: Load unchanged reports from, and store new ones in, the parse cache
+        statuses: Keep only tests with one of these statuses
+        tms_filter: Keep only TMS numbers passing this check (must be picklable
+            when parsing in parallel; disables the parse cache)
+        name_filter: Same as tms_filter, for test function names
+        low_memory: Stream each report's JSON blob instead of loading it whole
+        detail_statuses: Skip the failure reason and log of tests with other
+            statuses, keeping just enough of them to deduplicate by TMS number
+    """
+    results = []
+    total = len(file_paths)
+    options = {
+        "statuses": statuses,
+        "tms_filter": tms_filter,
+        "name_filter": name_filter,
+        "low_memory": low_memory,
+        "detail_statuses": detail_statuses,
+    }
+    # Arbitrary predicates can't be part of a cache key
+    cacheable = tms_filter is None and name_filter is None
+    cache = ParseCache() if use_cache and cacheable else None
+
+    # Reports of one suite repeat the same failures
+    reasons = ReasonTable()
+    parsed = iter_parsed_reports(file_paths, jobs, progress_callback, cache, options)
+    for _, file_results in parsed:
+        for result in file_results:
+            result.failure_reason = reasons.share(result.failure_reason)
+        results.extend(file_results)
 
     if progress_callback:
         progress_callback(total, total, "complete")
@@ -198,17 +638,32 @@ def parse_reports(file_paths: list[Path], progress_callback=None) -> list[TestRe
     return results
 
 
-def collect_html_files(paths: list[str]) -> list[Path]:
-    """Gather all HTML files from given paths (files or directories)."""
+def _source_sort_key(source: ReportSource) -> tuple[Path, str]:
+    """Sort archive members right after a file of the archive's name."""
+    if isinstance(source, ArchiveMember):
+        return source.archive, source.member
+    return source, ""
+
+
+def collect_html_files(paths: list[str]) -> list[ReportSource]:
+    """Gather all HTML files from given paths (files, directories or archives).
+
+    Compressed reports (.html.gz, .html.xz, .html.zst) are included too.
+    Zip and tar archives given directly are listed without extracting them,
+    and their reports are returned as ArchiveMember entries.
+    """
     html_files = []
 
     for path_str in paths:
         path = Path(path_str)
 
-        if path.is_file() and path.suffix.lower() == ".html":
+        if path.is_file() and report_suffix(path.name):
             html_files.append(path)
+        elif path.is_file() and is_archive(path.name):
+            html_files.extend(list_archive_reports(path))
         elif path.is_dir():
-            html_files.extend(path.glob("**/*.html"))
+            for suffix in REPORT_SUFFIXES:
+                html_files.extend(path.glob(f"**/*{suffix}"))
         elif path.is_file():
             raise ValueError(f"Not an HTML file: {path}")
         else:
@@ -217,4 +672,4 @@ def collect_html_files(paths: list[str]) -> list[Path]:
     if not html_files:
         raise ValueError("No HTML files found in provided paths")
 
-    return sorted(html_files)
+    return sorted(html_files, key=_source_sort_key)
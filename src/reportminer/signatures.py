@@ -0,0 +1,141 @@
+"""Failure signatures: failure reasons with run-specific details masked."""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Optional
+
+from . import config
+
+
+# Longest signature kept; the start of a reason identifies it well enough
+MAX_SIGNATURE_LENGTH = 200
+
+# Details that change between runs of the same failure, masked in order
+# (timestamps before plain numbers, paths before the numbers inside them,
+# etc.). Each mask only runs if its trigger substring is present, which
+# skips most of the work for typical short reasons.
+SIGNATURE_MASKS = [
+    (":", re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"), "<time>"),
+    ("-", re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<uuid>"),
+    (".", re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<ip>"),
+    # Absolute, home- or dot-relative paths, or relative ones with 2+ separators
+    ("/", re.compile(r"(?<![\w.-])(?:[A-Za-z]:|~|\.{1,2})?/(?:[\w.-]+/)*[\w.-]+|\b[\w.-]+(?:/[\w.-]+){2,}"), "<path>"),
+    ("\\", re.compile(r"(?<![\w.-])(?:[A-Za-z]:|~|\.{1,2})?\\(?:[\w.-]+\\)*[\w.-]+|\b[\w.-]+(?:\\[\w.-]+){2,}"), "<path>"),
+    ("0x", re.compile(r"\b0x[0-9a-fA-F]+\b"), "<hex>"),
+    ("", re.compile(r"\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{12,}\b"), "<hex>"),
+    ("", re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    ("", re.compile(r"\s+"), " "),
+]
+
+TOKEN_PATTERN = re.compile(r"<\w+>|\w+")
+
+# Longest reason key; longer ones are cut and end in "..."
+MAX_KEY_LENGTH = 80
+
+# Key of results without a failure reason
+NO_REASON = "No failure reason"
+
+# Most distinct reasons whose keys are remembered
+MAX_REASON_KEYS = 10_000
+
+
+def failure_signature(reason: Optional[str]) -> Optional[str]:
+    """Normalize a failure reason so repeats of one failure compare equal.
+
+    Keeps the first line, masks timestamps, UUIDs, IP addresses, paths, hex
+    ids and numbers, and collapses whitespace. Returns None for a missing
+    or blank reason.
+    """
+    if not reason:
+        return None
+
+    signature = reason.strip().split("\n", 1)[0]
+    for trigger, pattern, replacement in SIGNATURE_MASKS:
+        if trigger in signature:
+            signature = pattern.sub(replacement, signature)
+    signature = signature.strip()[:MAX_SIGNATURE_LENGTH]
+    return signature or None
+
+
+@lru_cache(maxsize=MAX_REASON_KEYS)
+def reason_key(reason: Optional[str]) -> str:
+    """Group key of a failure reason: its signature, cut to fit on a line.
+
+    Reasons differing only in ids, numbers, paths or timestamps share a
+    key. Keys are cached per distinct reason, since the same reasons repeat
+    across results and runs.
+    """
+    key = failure_signature(reason) or NO_REASON
+    if len(key) > MAX_KEY_LENGTH:
+        key = key[:MAX_KEY_LENGTH - 3] + "..."
+    return key
+
+
+def cluster_signatures(counts: dict[str, int], threshold: Optional[float] = None) -> dict[str, str]:
+    """Map each signature to the representative of its similarity cluster.
+
+    Signatures are compared as sets of word tokens (Jaccard similarity) and
+    only within the same leading token, usually the exception type. Going
+    from the most to the least common, each signature joins the most
+    similar existing cluster at or above threshold (default
+    config.CLUSTER_THRESHOLD), or starts its own and represents it.
+
+    Candidates come from an inverted index rather than comparing every
+    pair. Two token sets with Jaccard similarity >= t must share one of
+    their len - ceil(t * len) + 1 rarest tokens, so only those prefix
+    tokens are indexed and probed. Common tokens never enter the index,
+    posting lists stay short, and clustering stays near-linear in the
+    number of signatures.
+
+    Args:
+        counts: Number of failures per signature
+        threshold: Similarity from 0 (merge anything) to 1 (exact matches only)
+    """
+    if threshold is None:
+        threshold = config.CLUSTER_THRESHOLD
+
+    tokens = {signature: TOKEN_PATTERN.findall(signature) for signature in counts}
+    frequency = Counter(token for found in tokens.values() for token in set(found))
+
+    representatives: dict[str, str] = {}
+    # Token set of each cluster's representative, in creation order
+    cluster_tokens: dict[str, frozenset] = {}
+    cluster_order: dict[str, int] = {}
+    index: dict[tuple[str, str], list[str]] = {}
+
+    for signature in sorted(counts, key=lambda s: (-counts[s], s)):
+        found = tokens[signature]
+        if not found:
+            representatives[signature] = signature
+            continue
+
+        head = found[0]
+        token_set = frozenset(found)
+        ordered = sorted(token_set, key=lambda token: (frequency[token], token))
+        # Small epsilon so e.g. 0.7 * 10 doesn't round up to 8
+        prefix = ordered[:len(ordered) - math.ceil(threshold * len(ordered) - 1e-9) + 1]
+
+        # Most similar cluster; the oldest one on ties
+        best, best_rank = None, (-threshold, math.inf)
+        checked = set()
+        for token in prefix:
+            for candidate in index.get((head, token), ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                other = cluster_tokens[candidate]
+                rank = (-len(token_set & other) / len(token_set | other), cluster_order[candidate])
+                if rank <= best_rank:
+                    best, best_rank = candidate, rank
+
+        if best is None:
+            best = signature
+            cluster_tokens[signature] = token_set
+            cluster_order[signature] = len(cluster_order)
+            for token in prefix:
+                index.setdefault((head, token), []).append(signature)
+        representatives[signature] = best
+
+    return representatives
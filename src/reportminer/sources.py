@@ -0,0 +1,195 @@
+"""Opening report files, including compressed and archived ones."""
+
+import gzip
+import io
+import lzma
+import os
+import tarfile
+import zipfile
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO, Iterator, Optional, TextIO, Union
+
+
+def _open_zstd(fileobj: IO[bytes]) -> IO[bytes]:
+    """Decompress a zstd stream (stdlib on Python 3.14+, else zstandard)."""
+    try:
+        from compression import zstd
+        return zstd.ZstdFile(fileobj)
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Reading .zst reports requires the zstandard package "
+            "(pip install 'reportminer[zstd]')"
+        ) from e
+    return zstandard.ZstdDecompressor().stream_reader(fileobj)
+
+
+# Streaming decompressors by compression suffix, each wrapping a binary stream
+DECOMPRESSORS = {
+    ".gz": lambda fileobj: gzip.GzipFile(fileobj=fileobj),
+    ".xz": lambda fileobj: lzma.LZMAFile(fileobj),
+    ".zst": _open_zstd,
+}
+
+REPORT_SUFFIXES = (".html",) + tuple(f".html{suffix}" for suffix in DECOMPRESSORS)
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+@dataclass(frozen=True, order=True)
+class ArchiveMember:
+    """A report stored inside a zip or tar archive.
+
+    Quacks like the Path of a report where the parser and caches need it:
+    name, str(), resolve() and stat() (of the archive itself).
+    """
+    archive: Path
+    member: str
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    def __str__(self) -> str:
+        return f"{self.archive}!/{self.member}"
+
+    def resolve(self) -> "ArchiveMember":
+        return ArchiveMember(self.archive.resolve(), self.member)
+
+    def stat(self) -> os.stat_result:
+        return self.archive.stat()
+
+
+# A report on disk or inside an archive
+ReportSource = Union[Path, ArchiveMember]
+
+
+def report_suffix(name: str) -> Optional[str]:
+    """Get the report suffix of a file name (e.g. ".html.gz"), if it has one."""
+    lower = name.lower()
+    for suffix in REPORT_SUFFIXES:
+        if lower.endswith(suffix):
+            return suffix
+    return None
+
+
+def is_compressed(name: str) -> bool:
+    """Check if a report file name has a compression suffix."""
+    suffix = report_suffix(name)
+    return suffix is not None and suffix != ".html"
+
+
+def is_archive(name: str) -> bool:
+    """Check if a file name looks like a zip or tar archive."""
+    return name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def is_plain_file(source: ReportSource) -> bool:
+    """Check if a report is an uncompressed file on disk (and can be mapped)."""
+    return isinstance(source, Path) and not is_compressed(source.name)
+
+
+# The tar archive read last: ((pid, path, size, mtime), open archive, members by name)
+_open_tar_cache: Optional[tuple[tuple, tarfile.TarFile, dict[str, tarfile.TarInfo]]] = None
+
+
+def _open_tar(archive: Path) -> tuple[tarfile.TarFile, dict[str, tarfile.TarInfo]]:
+    """Open a tar archive and index its members, reusing the last one opened.
+
+    Tar has no index, so finding a member in a freshly opened archive reads
+    (and decompresses) every header in it. Keeping the last archive open
+    means its headers are read once however many members are read.
+
+    The open archive is per process: a forked pool worker shares the file
+    offset of the archive its parent opened, so it opens its own.
+    """
+    global _open_tar_cache
+    stat = archive.stat()
+    key = (os.getpid(), archive, stat.st_size, stat.st_mtime_ns)
+    if _open_tar_cache is None or _open_tar_cache[0] != key:
+        if _open_tar_cache is not None:
+            # Leave an archive inherited from the parent to the parent
+            if _open_tar_cache[0][0] == key[0]:
+                _open_tar_cache[1].close()
+            _open_tar_cache = None
+        tf = tarfile.open(archive)
+        try:
+            # Later duplicates win, same as TarFile.getmember
+            members = {info.name: info for info in tf.getmembers()}
+        except BaseException:
+            tf.close()
+            raise
+        _open_tar_cache = (key, tf, members)
+    return _open_tar_cache[1], _open_tar_cache[2]
+
+
+def list_archive_reports(archive: Path) -> list[ArchiveMember]:
+    """List the reports in an archive.
+
+    Zip members come from the central directory without reading any data;
+    tar headers are read without extracting anything.
+    """
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf:
+            names = [info.filename for info in zf.infolist() if not info.is_dir()]
+    else:
+        try:
+            tf, _ = _open_tar(archive)
+        except tarfile.TarError as e:
+            raise ValueError(f"Not a zip or tar archive: {archive}") from e
+        names = [info.name for info in tf.getmembers() if info.isfile()]
+
+    return [ArchiveMember(archive, name) for name in names if report_suffix(name)]
+
+
+def _open_member(stack: ExitStack, source: ArchiveMember) -> IO[bytes]:
+    """Open an archive member as a binary stream.
+
+    Members of compressed tarballs are reached by decompressing the archive
+    up to the member; the archive stays open for the next member.
+    """
+    if zipfile.is_zipfile(source.archive):
+        zf = stack.enter_context(zipfile.ZipFile(source.archive))
+        return stack.enter_context(zf.open(source.member))
+
+    tf, members = _open_tar(source.archive)
+    info = members.get(source.member)
+    if info is None:
+        raise KeyError(f"{source.member!r} not found in {source.archive}")
+    fileobj = tf.extractfile(info)
+    if fileobj is None:
+        raise ValueError(f"Not a regular file in archive: {source}")
+    return stack.enter_context(fileobj)
+
+
+@contextmanager
+def open_report_bytes(source: ReportSource) -> Iterator[IO[bytes]]:
+    """Open a report's stored bytes (still compressed, if it is)."""
+    with ExitStack() as stack:
+        if isinstance(source, ArchiveMember):
+            yield _open_member(stack, source)
+        else:
+            yield stack.enter_context(source.open("rb"))
+
+
+@contextmanager
+def open_report_text(source: ReportSource) -> Iterator[TextIO]:
+    """Open a report as a text stream, decompressing on the fly."""
+    with ExitStack() as stack:
+        stream = stack.enter_context(open_report_bytes(source))
+        if is_compressed(source.name):
+            suffix = Path(source.name.lower()).suffix
+            stream = stack.enter_context(DECOMPRESSORS[suffix](stream))
+        yield stack.enter_context(io.TextIOWrapper(stream, encoding="utf-8"))
+
+
+def read_report_text(source: ReportSource) -> str:
+    """Read a whole report as text, decompressing if needed."""
+    with open_report_text(source) as stream:
+        return stream.read()
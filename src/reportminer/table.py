@@ -0,0 +1,282 @@
+"""Columnar storage for large sets of test results."""
+
+from array import array
+from collections import Counter
+from itertools import compress, count
+from operator import attrgetter
+from typing import Any, Callable, Collection, Iterable, Iterator, Optional, Sequence, Union
+
+from .models import TestResult, TestStatus
+from .signatures import reason_key
+
+
+# Status codes are positions in this tuple
+STATUSES = tuple(TestStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Columns stored as codes into a table of distinct strings
+STRING_COLUMNS = (
+    "tms_number",
+    "test_name",
+    "test_id",
+    "failure_reason",
+    "duration",
+    "timestamp",
+    "jira_summary",
+    "jira_test_steps",
+)
+
+
+class StringColumn:
+    """Strings stored once each, with a code per row (0 is None)."""
+
+    __slots__ = ("codes", "values", "reason_keys")
+
+    def __init__(self, codes: array, values: list):
+        self.codes = codes
+        self.values = values
+        # reason_key of each value, filled in by the first grouping
+        self.reason_keys: Optional[list] = None
+
+    @classmethod
+    def from_values(cls, values: list) -> "StringColumn":
+        distinct = dict.fromkeys(values)
+        distinct.pop(None, None)
+        lookup = dict(zip(distinct, range(1, len(distinct) + 1)))
+        lookup[None] = 0
+        return cls(array("I", map(lookup.__getitem__, values)), [None, *distinct])
+
+
+class ResultTable:
+    """Test results stored column by column.
+
+    Statuses are one byte per row and strings, TMS numbers included, are
+    stored once per distinct value. Filtering, sorting,
+    deduplication and grouping work on these columns with C-level builtins,
+    and whole columns are handed to formatters, so none of them build a
+    TestResult per row. Rows are only materialized on request (iteration,
+    row(), to_results()) for code that still needs objects.
+
+    Operations never copy columns: they return a table over the same
+    columns with a new selection, an array of row numbers into them.
+    """
+
+    def __init__(
+        self,
+        status: bytearray,
+        strings: dict[str, StringColumn],
+        logs: list,
+        rows: Optional[array] = None,
+    ):
+        self._status = status
+        self._strings = strings
+        # TMS numbers are compared as written, so TMS_007 and TMS_7 differ
+        self._tms = strings["tms_number"]
+        # Built execution log text, or the loader that builds it, per row
+        self._logs = logs
+        # Selected rows in order, None for all of them
+        self._rows = rows
+
+    @classmethod
+    def from_results(cls, results: Iterable[TestResult]) -> "ResultTable":
+        """Build a table from result objects (pending logs stay pending)."""
+        results = list(results)
+        return cls(
+            status=bytearray(map(STATUS_CODES.__getitem__, map(attrgetter("status"), results))),
+            strings={
+                name: StringColumn.from_values(list(map(attrgetter(name), results)))
+                for name in STRING_COLUMNS
+            },
+            logs=[r.log_loader or r.execution_log for r in results],
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows if self._rows is not None else self._status)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[TestResult]:
+        return map(self.row, range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"<ResultTable: {len(self)} results>"
+
+    def _selected(self, column: Sequence) -> Iterable:
+        """Values of a whole-storage column for the selected rows."""
+        if self._rows is None:
+            return column
+        return map(column.__getitem__, self._rows)
+
+    def _select(self, positions: Iterable[int]) -> "ResultTable":
+        """Table over the same columns with rows at the given positions."""
+        if self._rows is not None:
+            positions = map(self._rows.__getitem__, positions)
+        return ResultTable(self._status, self._strings, self._logs, array("I", positions))
+
+    # Columns
+
+    def column(self, name: str) -> list:
+        """All values of one TestResult field, in row order."""
+        if name == "status":
+            return list(map(STATUSES.__getitem__, self._selected(self._status)))
+        if name == "tms_jira_format":
+            return [text.replace("_", "-") for text in self.column("tms_number")]
+        if name == "reason_key":
+            # One key per distinct reason, kept for every table over the column
+            column = self._strings["failure_reason"]
+            if column.reason_keys is None:
+                column.reason_keys = list(map(reason_key, column.values))
+            return list(map(column.reason_keys.__getitem__, self._selected(column.codes)))
+        if name == "execution_log":
+            return self.execution_logs()
+        if name in self._strings:
+            column = self._strings[name]
+            return list(map(column.values.__getitem__, self._selected(column.codes)))
+        raise KeyError(f"Unknown column: {name}")
+
+    def tms_numbers(self) -> list[int]:
+        """TMS numbers as integers."""
+        prefix = len("TMS_")
+        # Code 0 (no TMS number) never occurs
+        numbers = [None] + [int(value[prefix:]) for value in self._tms.values[1:]]
+        return list(map(numbers.__getitem__, self._selected(self._tms.codes)))
+
+    def status_counts(self) -> dict[TestStatus, int]:
+        """Number of rows per status."""
+        status = self._status if self._rows is None else bytes(self._selected(self._status))
+        return {status_: status.count(code) for status_, code in STATUS_CODES.items()}
+
+    def execution_logs(self, keep: bool = True) -> list:
+        """Execution log per selected row, building pending ones.
+
+        With keep=False built logs aren't stored back in the table, so
+        streaming every log out (an export) doesn't accumulate them.
+        """
+        rows = self._selected(range(len(self._logs)))
+        if keep:
+            return list(map(self._log, rows))
+        logs = self._logs
+        return [log() if callable(log) else log for log in map(logs.__getitem__, rows)]
+
+    def _log(self, row: int) -> Optional[str]:
+        log = self._logs[row]
+        if callable(log):
+            log = self._logs[row] = log()
+        return log
+
+    # Rows
+
+    def row(self, i: int) -> TestResult:
+        """Materialize one row as a TestResult."""
+        row = self._rows[i] if self._rows is not None else range(len(self._status))[i]
+        strings = {name: column.values[column.codes[row]] for name, column in self._strings.items()}
+        result = TestResult(status=STATUSES[self._status[row]], **strings)
+        log = self._logs[row]
+        if callable(log):
+            result.defer_execution_log(log)
+        else:
+            result.execution_log = log
+        return result
+
+    def to_results(self) -> list[TestResult]:
+        """Materialize every row as a TestResult."""
+        return list(self)
+
+    # Operations
+
+    def take(self, positions: Iterable[int]) -> "ResultTable":
+        """New table with the rows at the given positions, in that order."""
+        return self._select(positions)
+
+    def filter_status(self, statuses: Collection[TestStatus]) -> "ResultTable":
+        """Rows with one of the given statuses."""
+        status = self._status if self._rows is None else bytes(self._selected(self._status))
+        # Map each status code to 1 (keep) or 0 in one translate pass
+        keep = bytes(1 if status_ in statuses else 0 for status_ in STATUSES)
+        mask = status.translate(keep.ljust(256, b"\0"))
+        return self._select(compress(range(len(self)), mask))
+
+    def filter_tms(self, tms_numbers: Collection[str]) -> "ResultTable":
+        """Rows whose TMS number is one of the given ones."""
+        tms_numbers = set(tms_numbers)
+        values = self._tms.values
+        wanted = {code for code in range(1, len(values)) if values[code] in tms_numbers}
+        mask = map(wanted.__contains__, self._selected(self._tms.codes))
+        return self._select(compress(range(len(self)), mask))
+
+    def dedupe(self) -> "ResultTable":
+        """First row per TMS number, in the original order."""
+        tms = list(self._selected(self._tms.codes))
+        # Reversed, earlier positions overwrite later ones
+        first = dict(zip(reversed(tms), reversed(range(len(tms)))))
+        return self._select(sorted(first.values()))
+
+    def sort_by_tms(self) -> "ResultTable":
+        """Rows ordered by TMS number text (stable, like sort_results)."""
+        values = self._tms.values
+        # Rank the distinct numbers by their text once, then sort rows by rank
+        ranked = sorted(range(1, len(values)), key=values.__getitem__)
+        rank = [0] * len(values)
+        for position, code in enumerate(ranked):
+            rank[code] = position
+        keys = list(map(rank.__getitem__, self._selected(self._tms.codes)))
+        return self._select(sorted(range(len(keys)), key=keys.__getitem__))
+
+    def group_by(
+        self,
+        name: str,
+        key: Optional[Callable[[Any], Any]] = None,
+    ) -> dict[Any, "ResultTable"]:
+        """Split into tables by the value of a column, in first-seen order.
+
+        key maps a column value to the group key. For string columns it is
+        called once per distinct value (including None for missing values)
+        rather than once per row.
+        """
+        if name in self._strings:
+            column = self._strings[name]
+            keys_by_code = [key(value) if key else value for value in column.values]
+            row_keys: Iterable = map(keys_by_code.__getitem__, self._selected(column.codes))
+        else:
+            values = self.column(name)
+            row_keys = map(key, values) if key else values
+        return self.partition(list(row_keys))
+
+    def partition(self, row_keys: Sequence) -> dict[Any, "ResultTable"]:
+        """Split into tables by a key per row, in first-seen order."""
+        # Number the groups in first-seen order, then stable-sort positions
+        # by group number so each group is one contiguous slice
+        group_numbers = dict(zip(dict.fromkeys(row_keys), count()))
+        row_groups = list(map(group_numbers.__getitem__, row_keys))
+        order = sorted(range(len(row_groups)), key=row_groups.__getitem__)
+        sizes = Counter(row_groups)
+
+        groups = {}
+        start = 0
+        for group_key, number in group_numbers.items():
+            end = start + sizes[number]
+            groups[group_key] = self._select(order[start:end])
+            start = end
+        return groups
+
+
+# Anything the formatters and CLI helpers accept
+Results = Union[list[TestResult], ResultTable]
+
+
+def result_columns(results: Results, *names: str) -> list[list]:
+    """Columns of TestResult fields for a table or a list of results."""
+    if isinstance(results, ResultTable):
+        return [results.column(name) for name in names]
+    return [[getattr(r, name) for r in results] for name in names]
+
+
+def result_batches(results: Results, size: int) -> Iterator[Results]:
+    """Consecutive runs of at most size results (sub-tables for a table)."""
+    for start in range(0, len(results), size):
+        end = min(start + size, len(results))
+        if isinstance(results, ResultTable):
+            yield results.take(range(start, end))
+        else:
+            yield results[start:end]
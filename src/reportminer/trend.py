@@ -0,0 +1,307 @@
+"""Pass/fail history of each test across many runs."""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import compress, repeat
+from operator import is_
+from typing import Callable, Iterable, Optional
+
+from .cache import ParseCache
+from .models import TestStatus
+from .parser import iter_parsed_reports, read_report_time
+from .sources import ReportSource
+from .table import Results, result_columns
+
+
+# Outcome of a test in one run
+ABSENT, PASS, FAIL = 0, 1, 2
+
+# Skipped and rerun attempts don't count as an outcome either way
+OUTCOMES = {
+    TestStatus.PASSED: PASS,
+    TestStatus.XFAILED: PASS,
+    TestStatus.XPASSED: PASS,
+    TestStatus.FAILED: FAIL,
+    TestStatus.ERROR: FAIL,
+}
+
+# Enum members hash in Python; their ids hash in C
+_OUTCOME_BY_ID = {id(status): outcome for status, outcome in OUTCOMES.items()}
+
+# Runs buffered as byte rows before they are folded into the bitsets
+BLOCK_RUNS = 256
+
+# Runs shown in the history column of format_trends
+HISTORY_WIDTH = 30
+
+# Outcome bytes to "0"/"1" digits: ran at all, failed, and pass(0)/fail(1)
+_RAN_DIGITS = bytes.maketrans(b"\0\1\2", b"011")
+_FAIL_DIGITS = bytes.maketrans(b"\0\1\2", b"001")
+_OUTCOME_DIGITS = bytes.maketrans(b"\1\2", b"01")
+# Per-run masks of the rows that passed and failed
+_PASS_MASK = bytes(1 if code == PASS else 0 for code in range(3)).ljust(256, b"\0")
+_FAIL_MASK = bytes(1 if code == FAIL else 0 for code in range(3)).ljust(256, b"\0")
+
+
+def _bit_count(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def _lowest_bit(bits: int) -> int:
+    """Position of the lowest set bit (bits must be non-zero)."""
+    return (bits & -bits).bit_length() - 1
+
+
+@dataclass
+class TestTrend:
+    """History of one TMS number across the runs."""
+    tms_number: str
+    runs: int                        # runs with a pass or fail outcome
+    failures: int                    # runs it failed (or errored) in
+    flips: int                       # pass/fail changes between its runs
+    first_failure: Optional[str]     # run it first failed in
+    failing_since: Optional[str]     # start of its current failure streak
+
+    @property
+    def flakiness(self) -> float:
+        """Flips per chance to flip: 0 for stable, 1 for alternating every run."""
+        return self.flips / (self.runs - 1) if self.runs > 1 else 0.0
+
+
+class RunHistory:
+    """Pass/fail outcomes of every TMS number in every run, as bitsets.
+
+    Each TMS number has two Python ints: bit i of one is set if it had an
+    outcome in run i, bit i of the other if it failed in run i. A thousand
+    runs take about 250 bytes per TMS number, so 50k tests fit in tens of
+    megabytes however many results the reports hold.
+
+    Runs are added in order. Each is reduced to one byte per TMS number
+    with C-level builtins (a plain copy when a run lists the same tests in
+    the same order as the last one), and blocks of BLOCK_RUNS runs are transposed
+    into the bitsets with strided slices, so no per-result Python loop
+    runs. Several results for one TMS number in a run (parametrized tests)
+    count as a failure if any of them failed.
+    """
+
+    def __init__(self):
+        self.runs: list[str] = []
+        self._index: dict[str, int] = {}
+        self._ran: list[int] = []
+        self._failed: list[int] = []
+        self._flips: list[int] = []
+        # Last outcome digit seen per TMS number, carried across blocks
+        self._last: list[Optional[int]] = []
+        self._block: list[bytes] = []
+        self._block_start = 0
+        # TMS column of the latest run and where its rows go
+        self._run_tms: Optional[list[str]] = None
+        self._run_positions: list[int] = []
+        self._run_in_order = False
+
+    def __len__(self) -> int:
+        """Number of distinct TMS numbers seen."""
+        return len(self._index)
+
+    def add_run(self, name: str, tms_numbers: list[str], statuses: list[TestStatus]) -> None:
+        """Add the next run from its TMS number and status columns."""
+        # Runs of one suite usually list the same tests in the same order
+        if tms_numbers != self._run_tms:
+            self._run_tms = tms_numbers
+            self._run_positions = self._locate(tms_numbers)
+            self._run_in_order = self._run_positions == list(range(len(self._index)))
+        positions = self._run_positions
+
+        codes = bytes(map(_OUTCOME_BY_ID.get, map(id, statuses), repeat(ABSENT)))
+        if self._run_in_order:
+            # Every TMS number once, in index order: the codes are the row
+            row = codes
+        else:
+            # Failures are added last so they win over passes of the same test
+            outcome = dict(zip(compress(positions, codes.translate(_PASS_MASK)), repeat(PASS)))
+            outcome.update(zip(compress(positions, codes.translate(_FAIL_MASK)), repeat(FAIL)))
+            row = bytes(map(outcome.get, range(len(self._index)), repeat(ABSENT)))
+
+        self.runs.append(name)
+        self._block.append(row)
+        if len(self._block) == BLOCK_RUNS:
+            self._flush()
+
+    def _locate(self, tms_numbers: list[str]) -> list[int]:
+        """Index of each TMS number, numbering new ones in first-seen order."""
+        index = self._index
+        positions = list(map(index.get, tms_numbers))
+        if None in positions:
+            for tms in dict.fromkeys(compress(tms_numbers, map(is_, positions, repeat(None)))):
+                index[tms] = len(index)
+            positions = list(map(index.__getitem__, tms_numbers))
+        return positions
+
+    def add_results(self, name: str, results: Results) -> None:
+        """Add the next run from its results."""
+        self.add_run(name, *result_columns(results, "tms_number", "status"))
+
+    def _flush(self) -> None:
+        """Fold the buffered runs into the per-test bitsets."""
+        if not self._block:
+            return
+        count = len(self._index)
+        added = count - len(self._ran)
+        self._ran.extend(repeat(0, added))
+        self._failed.extend(repeat(0, added))
+        self._flips.extend(repeat(0, added))
+        self._last.extend(repeat(None, added))
+
+        # Run-major matrix; a strided slice is then one test's column
+        matrix = b"".join(row.ljust(count, b"\0") for row in self._block)
+        absent = bytes(len(self._block))
+        offset = self._block_start
+        ran, failed, flips, last = self._ran, self._failed, self._flips, self._last
+        for t in range(count):
+            column = matrix[t::count]
+            if column == absent:
+                continue
+            # Digits are reversed so run i lands on bit i
+            ran[t] |= int(column.translate(_RAN_DIGITS)[::-1], 2) << offset
+            failed_bits = int(column.translate(_FAIL_DIGITS)[::-1], 2)
+            if failed_bits:
+                failed[t] |= failed_bits << offset
+            sequence = column.translate(_OUTCOME_DIGITS, b"\0")
+            changes = sequence.count(b"01") + sequence.count(b"10")
+            if last[t] is not None and last[t] != sequence[0]:
+                changes += 1
+            flips[t] += changes
+            last[t] = sequence[-1]
+
+        self._block_start += len(self._block)
+        self._block = []
+
+    def trend(self, tms_number: str) -> TestTrend:
+        """History of one TMS number."""
+        self._flush()
+        t = self._index[tms_number]
+        ran, failed = self._ran[t], self._failed[t]
+
+        first_failure = failing_since = None
+        if failed:
+            first_failure = self.runs[_lowest_bit(failed)]
+            latest = ran.bit_length() - 1
+            if failed >> latest & 1:
+                # The streak starts right after the latest passing run
+                start = (ran & ~failed).bit_length()
+                failing_since = self.runs[start + _lowest_bit(failed >> start)]
+
+        return TestTrend(
+            tms_number=tms_number,
+            runs=_bit_count(ran),
+            failures=_bit_count(failed),
+            flips=self._flips[t],
+            first_failure=first_failure,
+            failing_since=failing_since,
+        )
+
+    def outcomes(self, tms_number: str, last: Optional[int] = None) -> str:
+        """Outcome per run: "." pass, "F" fail, " " none (the last N runs only)."""
+        self._flush()
+        t = self._index[tms_number]
+        ran, failed = self._ran[t], self._failed[t]
+        start = max(len(self.runs) - last, 0) if last is not None else 0
+        return "".join(
+            "F" if failed >> i & 1 else "." if ran >> i & 1 else " "
+            for i in range(start, len(self.runs))
+        )
+
+    def trends(self, failing_only: bool = False) -> list[TestTrend]:
+        """History of every TMS number, or of those that failed at least once."""
+        self._flush()
+        return [
+            self.trend(tms)
+            for tms, t in self._index.items()
+            if self._failed[t] or not failing_only
+        ]
+
+
+def _run_time(source: ReportSource) -> datetime:
+    """When a report was generated, or its modification time if it doesn't say."""
+    return read_report_time(source) or datetime.fromtimestamp(source.stat().st_mtime)
+
+
+def order_runs(sources: Iterable[ReportSource]) -> list[ReportSource]:
+    """Reports oldest first by when they were generated (ties keep their order).
+
+    Copied or extracted artifacts get new modification times, and archive
+    members all share their archive's, so the mtime is only a fallback.
+    """
+    return sorted(sources, key=_run_time)
+
+
+def run_labels(sources: list[ReportSource]) -> list[str]:
+    """Name each run by its report's path below the reports' common directory.
+
+    Shards are often all called report.html, so the file name alone
+    doesn't tell runs apart.
+    """
+    paths = [str(source.resolve()) for source in sources]
+    if len(paths) < 2:
+        return [source.name for source in sources]
+    common = os.path.commonpath([os.path.dirname(path) for path in paths])
+    return [os.path.relpath(path, common) for path in paths]
+
+
+def build_history(
+    sources: Iterable[ReportSource],
+    jobs: Optional[int] = None,
+    progress_callback: Optional[Callable] = None,
+    use_cache: bool = False,
+    low_memory: bool = False,
+) -> RunHistory:
+    """Parse reports in run order into a RunHistory.
+
+    Each report's results are dropped as soon as they are added, so memory
+    is bounded by the bitsets and the reports being parsed.
+    """
+    history = RunHistory()
+    cache = ParseCache() if use_cache else None
+    sources = order_runs(sources)
+    parsed = iter_parsed_reports(sources, jobs, progress_callback, cache, {"low_memory": low_memory})
+    for label, (_, results) in zip(run_labels(sources), parsed):
+        history.add_results(label, results)
+    if progress_callback:
+        progress_callback(len(sources), len(sources), "complete")
+    return history
+
+
+def sort_trends(trends: list[TestTrend], by_tms: bool = False) -> list[TestTrend]:
+    """Flakiest first (then most failures), or by TMS number."""
+    if by_tms:
+        return sorted(trends, key=lambda trend: trend.tms_number)
+    return sorted(trends, key=lambda trend: (-trend.flakiness, -trend.failures, trend.tms_number))
+
+
+def format_trends(history: RunHistory, trends: list[TestTrend]) -> str:
+    """Format trends as a readable table."""
+    runs = history.runs
+    lines = [f"TREND ({len(runs)} runs, {runs[0]} .. {runs[-1]}):" if runs else "TREND (0 runs):"]
+
+    width = max([len(trend.tms_number) for trend in trends] + [3])
+    shown = min(len(runs), HISTORY_WIDTH)
+    lines.append(
+        f"  {'TMS':<{width}}  {'Runs':>5}  {'Fails':>5}  {'Flips':>5}  {'Flaky':>5}  "
+        f"{'History (last ' + str(shown) + ')':<{max(shown, 17)}}  Failing since"
+    )
+    for trend in trends:
+        lines.append(
+            f"  {trend.tms_number:<{width}}  {trend.runs:>5}  {trend.failures:>5}  {trend.flips:>5}  "
+            f"{trend.flakiness:>5.2f}  {history.outcomes(trend.tms_number, shown):<{max(shown, 17)}}  {trend.failing_since or '-'}"
+        )
+
+    flaky = sum(1 for trend in trends if trend.flips)
+    failing = sum(1 for trend in trends if trend.failing_since)
+    lines.append("")
+    lines.append("SUMMARY:")
+    lines.append(f"  Tests: {len(trends)}")
+    lines.append(f"  Flaky (flipped at least once): {flaky}")
+    lines.append(f"  Failing in their latest run: {failing}")
+
+    return "\n".join(lines)
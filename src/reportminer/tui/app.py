@@ -13,6 +13,7 @@ from rich.text import Text
 
 from ..clipboard import copy_to_clipboard
 from ..models import TestResult, TestStatus
+from ..table import ResultTable, Results
 
 
 # Pre-compiled regex for log level detection
@@ -302,6 +303,9 @@ class TestDetailPanel(VerticalScroll):
             text.append("Failure Reason:\n", style="yellow bold")
             text.append(r.failure_reason)
             text.append("\n")
+            text.append("Group: ", style="yellow")
+            text.append(r.reason_key)
+            text.append("\n")
 
         if r.jira_test_steps:
             text.append("\n")
@@ -495,6 +499,7 @@ class ReportViewerApp(App):
         Binding("e", "show_error", "Errors"),
         Binding("space", "toggle_mark", "Mark", show=False),
         Binding("m", "show_marked", "Marked"),
+        Binding("g", "show_same_reason", "Same Reason"),
         Binding("y", "copy_marked", "Copy"),
         Binding("c", "copy_current", "Copy TMS", show=False),
         Binding("C", "copy_log", "Copy Log", show=False),
@@ -506,11 +511,16 @@ class ReportViewerApp(App):
         Binding("3", "jump_teardown", "Teardown", show=False),
     ]
 
-    def __init__(self, results: list[TestResult], *args, **kwargs):
+    def __init__(self, results: Results, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if isinstance(results, ResultTable):
+            # Every row gets its own list item, so the viewer works on objects
+            results = results.to_results()
         self.all_results = results
         self.filtered_results = results.copy()
         self.current_filter = "all"
+        # Reason key shown by the "reason" filter
+        self.reason_filter: str | None = None
         self.search_query = ""
         self.marked_tms: set[str] = set()
         self._search_timer: Timer | None = None
@@ -594,7 +604,8 @@ class ReportViewerApp(App):
 
         return " " + " | ".join(parts)
 
-    def _apply_filters(self):
+    def _filtered(self) -> list[TestResult]:
+        """Results passing the current filter and search."""
         results = self.all_results
 
         if self.current_filter == "failed":
@@ -607,6 +618,8 @@ class ReportViewerApp(App):
             results = [r for r in results if r.status == TestStatus.ERROR]
         elif self.current_filter == "marked":
             results = [r for r in results if r.tms_number in self.marked_tms]
+        elif self.current_filter == "reason":
+            results = [r for r in results if r.reason_key == self.reason_filter]
 
         if self.search_query:
             query = normalize_tms(self.search_query)
@@ -614,8 +627,10 @@ class ReportViewerApp(App):
                       if query in normalize_tms(r.tms_number)
                       or query in r.test_name.lower()
                       or (r.jira_summary and query in r.jira_summary.lower())]
+        return results
 
-        self.filtered_results = results
+    def _apply_filters(self):
+        self.filtered_results = self._filtered()
         self._populate_list()
         self.query_one("#status-line", Static).update(self._get_status_line())
 
@@ -849,6 +864,17 @@ class ReportViewerApp(App):
         self.current_filter = "marked"
         self._apply_filters()
 
+    def action_show_same_reason(self):
+        """Show the tests grouped under the current test's failure reason."""
+        detail_panel = self.query_one("#detail-panel", TestDetailPanel)
+        if not (detail_panel.current_test and detail_panel.current_test.failure_reason):
+            self.notify("No failure reason", timeout=1)
+            return
+        self.reason_filter = detail_panel.current_test.reason_key
+        self.current_filter = "reason"
+        self._apply_filters()
+        self.notify(f"{len(self.filtered_results)} with this reason", timeout=1)
+
     def action_toggle_mark(self):
         list_view = self.query_one("#test-list", ListView)
         if list_view.highlighted_child and isinstance(list_view.highlighted_child, TestListItem):
@@ -0,0 +1,241 @@
+"""SQLite warehouse of parsed results across many runs."""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Collection, Iterable, Optional
+
+from .config import WAREHOUSE_PATH
+from .models import TestResult, TestStatus
+from .parser import iter_parsed_reports, read_report_time
+from .signatures import failure_signature
+from .sources import ReportSource, open_report_bytes
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    digest TEXT NOT NULL UNIQUE,
+    run_time TEXT NOT NULL,
+    ingested_at TEXT NOT NULL,
+    result_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    tms_number TEXT NOT NULL,
+    test_name TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    failure_reason TEXT,
+    signature TEXT,
+    duration TEXT,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_time ON runs(run_time);
+CREATE INDEX IF NOT EXISTS results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS results_tms ON results(tms_number, run_id);
+CREATE INDEX IF NOT EXISTS results_status ON results(status, run_id);
+CREATE INDEX IF NOT EXISTS results_signature ON results(signature);
+"""
+
+# Bump when SCHEMA changes incompatibly
+SCHEMA_VERSION = 1
+
+# Read size for hashing reports
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def report_digest(source: ReportSource) -> str:
+    """SHA-256 of a report's stored bytes."""
+    digest = hashlib.sha256()
+    with open_report_bytes(source) as stream:
+        for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _run_time(source: ReportSource) -> str:
+    """When a run happened: when its report was generated, if it says.
+
+    Falls back to the report's modification time, which copying or
+    extracting artifacts can change.
+    """
+    run_time = read_report_time(source) or datetime.fromtimestamp(source.stat().st_mtime)
+    return run_time.isoformat(timespec="seconds")
+
+
+class Warehouse:
+    """Parsed results of every ingested report, one run per report file.
+
+    Execution logs aren't stored: they are most of a report's size and
+    queries are about statuses, TMS numbers and failure reasons.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or WAREHOUSE_PATH)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open (and if needed create) the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA foreign_keys = ON")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                conn.close()
+                raise ValueError(
+                    f"Warehouse {self.path} has schema version {version}, expected {SCHEMA_VERSION}"
+                )
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "Warehouse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def has_run(self, digest: str) -> bool:
+        """Check if a report with this digest was already ingested."""
+        row = self.conn.execute("SELECT 1 FROM runs WHERE digest = ?", (digest,)).fetchone()
+        return row is not None
+
+    def add_run(self, source: str, digest: str, run_time: str, results: list[TestResult]) -> int:
+        """Store one parsed report as a run. Returns the run id."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (source, digest, run_time, ingested_at, result_count) VALUES (?, ?, ?, ?, ?)",
+                (source, digest, run_time, datetime.now().isoformat(timespec="seconds"), len(results)),
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id, r.tms_number, r.test_name, r.test_id, r.status.value,
+                        r.failure_reason, failure_signature(r.failure_reason),
+                        r.duration, r.timestamp,
+                    )
+                    for r in results
+                ),
+            )
+        return run_id
+
+    def ingest(
+        self,
+        file_paths: Iterable[ReportSource],
+        jobs: Optional[int] = None,
+        progress_callback: Optional[Callable] = None,
+        low_memory: bool = False,
+    ) -> tuple[int, int]:
+        """Parse and store reports not ingested yet.
+
+        Reports are recognized by the hash of their contents, so renamed or
+        re-downloaded copies are skipped too. New reports are parsed in
+        parallel and each is stored in its own transaction, so an
+        interrupted ingest keeps what it finished.
+
+        Returns (reports ingested, reports skipped).
+        """
+        new_paths = []
+        digests = {}
+        seen = set()
+        skipped = 0
+        for path in file_paths:
+            digest = report_digest(path)
+            # Copies within this batch are skipped like ingested ones
+            if digest in seen or self.has_run(digest):
+                skipped += 1
+                continue
+            seen.add(digest)
+            digests[path] = digest
+            new_paths.append(path)
+
+        parsed = iter_parsed_reports(new_paths, jobs, progress_callback, options={"low_memory": low_memory})
+        for path, results in parsed:
+            self.add_run(str(path), digests[path], _run_time(path), results)
+
+        return len(new_paths), skipped
+
+    def query(
+        self,
+        statuses: Optional[Collection[TestStatus]] = None,
+        last_runs: Optional[int] = None,
+        tms_numbers: Optional[Collection[str]] = None,
+        latest: bool = False,
+    ) -> list[TestResult]:
+        """Stored results, most recent run first.
+
+        Args:
+            statuses: Keep only results with one of these statuses
+            last_runs: Keep only the most recent N runs
+            tms_numbers: Keep only these TMS numbers
+            latest: Keep only the most recent result per TMS number. It is
+                picked before filtering by status, so a TMS whose latest run
+                passed isn't listed as failed from an older run.
+        """
+        where = []
+        params: list = []
+        if tms_numbers is not None:
+            where.append(f"results.tms_number IN ({', '.join('?' * len(tms_numbers))})")
+            params.extend(tms_numbers)
+        if last_runs is not None:
+            where.append("results.run_id IN (SELECT id FROM runs ORDER BY run_time DESC, id DESC LIMIT ?)")
+            params.append(last_runs)
+        status_filter = None
+        if statuses is not None:
+            status_filter = f"status IN ({', '.join('?' * len(statuses))})"
+
+        columns = "tms_number, test_name, test_id, status, failure_reason, duration, timestamp"
+        order = "runs.run_time DESC, runs.id DESC, results.rowid"
+        if latest:
+            # Rank each TMS number's results in the subquery, filter statuses outside it
+            sql = (
+                f"SELECT {columns}, "
+                f"ROW_NUMBER() OVER (PARTITION BY results.tms_number ORDER BY {order}) AS recency, "
+                f"ROW_NUMBER() OVER (ORDER BY {order}) AS position "
+                "FROM results JOIN runs ON runs.id = results.run_id"
+            )
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql = f"SELECT {columns} FROM ({sql}) WHERE recency = 1"
+            if status_filter:
+                sql += f" AND {status_filter}"
+            sql += " ORDER BY position"
+        else:
+            if status_filter:
+                where.append(f"results.{status_filter}")
+            sql = f"SELECT {columns} FROM results JOIN runs ON runs.id = results.run_id"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += f" ORDER BY {order}"
+        if statuses is not None:
+            params.extend(status.value for status in statuses)
+
+        return [
+            TestResult(
+                tms_number=tms_number,
+                test_name=test_name,
+                test_id=test_id,
+                status=TestStatus(status),
+                failure_reason=failure_reason,
+                duration=duration,
+                timestamp=timestamp,
+            )
+            for tms_number, test_name, test_id, status, failure_reason, duration, timestamp
+            in self.conn.execute(sql, params)
+        ]
+
+    def run_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
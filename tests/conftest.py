@@ -8,6 +8,22 @@ from tempfile import NamedTemporaryFile
 from reportminer.models import TestResult, TestStatus
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep parse and Jira caches out of the user's real cache directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("reportminer.cache.CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_warehouse(tmp_path, monkeypatch):
+    """Keep the results warehouse out of the user's real data directory."""
+    warehouse_path = tmp_path / "warehouse.db"
+    monkeypatch.setattr("reportminer.warehouse.WAREHOUSE_PATH", warehouse_path)
+    return warehouse_path
+
+
 @pytest.fixture
 def sample_test_result():
     """Create a sample TestResult for testing."""
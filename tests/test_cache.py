@@ -1,19 +1,49 @@
 """Tests for file-based cache."""
 
+import json
+import os
+import sqlite3
+import threading
+
 import pytest
 import time
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 
-from reportminer.cache import FileCache
+from reportminer.cache import (
+    SQLITE_BATCH_KEYS,
+    CacheBackend,
+    FileCache,
+    JsonFileBackend,
+    ParseCache,
+    SqliteBackend,
+)
+from reportminer.models import TestResult, TestStatus
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def cache(request, tmp_path, monkeypatch):
+    """Create a cache instance with temporary directory, for each backend."""
+    monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+    monkeypatch.setattr("reportminer.cache.CACHE_TTL_HOURS", 1)
+    monkeypatch.setattr("reportminer.cache.CACHE_STALE_HOURS", 24)
+    return FileCache("test", backend=request.param)
 
 
 @pytest.fixture
-def cache(tmp_path, monkeypatch):
-    """Create a cache instance with temporary directory."""
+def sqlite_cache(tmp_path, monkeypatch):
+    """Create a SQLite-backed cache with temporary directory."""
     monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
     monkeypatch.setattr("reportminer.cache.CACHE_TTL_HOURS", 1)
-    return FileCache("test")
+    monkeypatch.setattr("reportminer.cache.CACHE_STALE_HOURS", 24)
+    return FileCache("test", backend="sqlite")
+
+
+def age_entry(cache, key, hours):
+    """Backdate a cache entry by some hours."""
+    (cached_at, ttl, value), = cache.backend.get_many([key]).values()
+    cache.backend.set_many({key: (cached_at - hours * 3600, ttl, value)})
 
 
 class TestFileCache:
@@ -74,7 +104,9 @@ class TestFileCache:
         cache.set("key", "value")
         assert (cache_dir / "test").exists()
 
-    def test_handles_corrupted_cache_file(self, cache, tmp_path):
+    def test_handles_corrupted_cache_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+        cache = FileCache("test", backend="json")
         # Write corrupted data
         cache.set("key", "value")
         cache_file = list((tmp_path / "test").glob("*.json"))[0]
@@ -83,3 +115,254 @@ class TestFileCache:
         # Should return None for corrupted entry
         result = cache.get("key")
         assert result is None
+
+
+class TestFileCacheStaleness:
+    """Tests for stale entries and per-entry TTLs."""
+
+    def test_lookup_fresh_entry(self, cache):
+        cache.set("key", "value")
+        entry = cache.lookup("key")
+        assert entry.value == "value"
+        assert entry.stale is False
+
+    def test_expired_entry_is_stale(self, cache):
+        """Past its TTL, get ignores an entry but lookup still returns it."""
+        cache.set("key", "value")
+        age_entry(cache, "key", 2)
+        assert cache.get("key") is None
+        entry = cache.lookup("key")
+        assert entry.value == "value"
+        assert entry.stale is True
+
+    def test_deletes_entries_stale_too_long(self, cache):
+        cache.set("key", "value")
+        age_entry(cache, "key", 1 + 24 + 1)
+        assert cache.lookup("key") is None
+        assert cache.backend.get_many(["key"]) == {}
+
+    def test_cached_none_differs_from_no_entry(self, cache):
+        cache.set("missing", None)
+        assert cache.lookup("missing").value is None
+        assert cache.lookup("never-set") is None
+
+    def test_entry_ttl_overrides_cache_ttl(self, cache):
+        cache.set("short", "value", ttl=timedelta(minutes=10))
+        cache.set("default", "value")
+        age_entry(cache, "short", 0.5)
+        age_entry(cache, "default", 0.5)
+        assert cache.lookup("short").stale is True
+        assert cache.lookup("default").stale is False
+
+    def test_leaves_no_temporary_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+        cache = FileCache("test", backend="json")
+        cache.set("key", "value")
+        cache.set("key", "other")
+        assert [path.suffix for path in (tmp_path / "test").iterdir()] == [".json"]
+
+    def test_clear_removes_interrupted_writes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+        cache = FileCache("test", backend="json")
+        cache.set("key", "value")
+        (tmp_path / "test" / "0123456789abcdef.123.456.tmp").write_text("{")
+        assert cache.clear() == 1
+        assert list((tmp_path / "test").iterdir()) == []
+
+    def test_batch_lookup(self, cache):
+        cache.set_many({"a": 1, "b": None})
+        entries = cache.lookup_many(["a", "b", "c"])
+        assert {key: entry.value for key, entry in entries.items()} == {"a": 1, "b": None}
+
+
+class TestCacheBackends:
+    """Tests for choosing and using the cache backends."""
+
+    def test_json_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+        assert isinstance(FileCache("test").backend, JsonFileBackend)
+
+    def test_selected_by_config(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+        monkeypatch.setattr("reportminer.cache.CACHE_BACKEND", "sqlite")
+        assert isinstance(FileCache("test").backend, SqliteBackend)
+
+    def test_unknown_backend(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+        with pytest.raises(ValueError, match="Unknown cache backend"):
+            FileCache("test", backend="redis")
+
+    def test_backend_must_implement_storage(self):
+        class Incomplete(CacheBackend):
+            def get_many(self, keys):
+                return {}
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_close_reopens_on_next_use(self, cache):
+        cache.set("key", "value")
+        cache.close()
+        assert cache.get("key") == "value"
+
+    def test_sqlite_close_releases_connection(self, sqlite_cache):
+        sqlite_cache.set("key", "value")
+        conn = sqlite_cache.backend.conn
+        sqlite_cache.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_sqlite_uses_one_database_in_wal_mode(self, sqlite_cache, tmp_path):
+        sqlite_cache.set("key", "value")
+        assert [path.name for path in tmp_path.glob("*.db")] == ["cache.db"]
+        assert not (tmp_path / "test").exists()
+        with sqlite3.connect(tmp_path / "cache.db") as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_sqlite_batches_cross_statement_limit(self, sqlite_cache):
+        values = {f"key{i}": i for i in range(SQLITE_BATCH_KEYS * 2 + 1)}
+        sqlite_cache.set_many(values)
+        entries = sqlite_cache.lookup_many(values)
+        assert {key: entry.value for key, entry in entries.items()} == values
+
+    def test_sqlite_namespaces_are_separate(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+        jira = FileCache("jira", backend="sqlite")
+        other = FileCache("other", backend="sqlite")
+        jira.set("key", "jira")
+        other.set("key", "other")
+        assert jira.clear() == 1
+        assert other.get("key") == "other"
+
+    def test_sqlite_sweeps_long_stale_entries(self, sqlite_cache, tmp_path):
+        """The first lookup of a cache deletes every entry stale for too long."""
+        sqlite_cache.set_many({"old": 1, "stale": 2, "fresh": 3})
+        age_entry(sqlite_cache, "old", 1 + 24 + 1)
+        age_entry(sqlite_cache, "stale", 2)
+        FileCache("test", backend="sqlite").lookup("fresh")
+        assert set(sqlite_cache.backend.get_many(["old", "stale", "fresh"])) == {"stale", "fresh"}
+
+    def test_sqlite_usable_from_other_threads(self, sqlite_cache):
+        """Background refreshes write through the same cache."""
+        thread = threading.Thread(target=sqlite_cache.set, args=("key", "value"))
+        thread.start()
+        thread.join()
+        assert sqlite_cache.get("key") == "value"
+
+
+@pytest.fixture
+def parse_cache(tmp_path, monkeypatch):
+    """Create a parse cache with temporary directory."""
+    monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+    return ParseCache()
+
+
+@pytest.fixture
+def report_file(tmp_path):
+    """A stand-in report file whose size/mtime key the cache."""
+    path = tmp_path / "report.html"
+    path.write_text("<html></html>")
+    return path
+
+
+@pytest.fixture
+def parsed_results():
+    return [
+        TestResult(
+            tms_number="TMS_1",
+            test_name="test_one",
+            test_id="tests/test_a.py::test_one",
+            status=TestStatus.FAILED,
+            failure_reason="AssertionError: boom",
+            duration="1.00s",
+            timestamp="2024-01-15",
+            execution_log="=== LOG ===\nline",
+        ),
+        TestResult(
+            tms_number="TMS_2",
+            test_name="test_two",
+            test_id="tests/test_a.py::test_two",
+            status=TestStatus.PASSED,
+        ),
+    ]
+
+
+def _stored_loader():
+    """Module-level log loader, picklable into the parse cache."""
+    return "stored log"
+
+
+class TestParseCache:
+    """Tests for ParseCache class."""
+
+    def test_set_and_get(self, parse_cache, report_file, parsed_results):
+        parse_cache.set(report_file, parsed_results)
+        assert parse_cache.get(report_file) == parsed_results
+
+    def test_keeps_deferred_logs_deferred(self, parse_cache, report_file, parsed_results):
+        parsed_results[1].defer_execution_log(partial(str, "deferred log"))
+        parse_cache.set(report_file, parsed_results)
+
+        cached = parse_cache.get(report_file)
+        assert cached[1].log_loader is not None
+        assert cached[1].execution_log == "deferred log"
+        assert cached[0].execution_log == "=== LOG ===\nline"
+
+    def test_ignores_entry_with_unresolvable_loader(self, parse_cache, report_file, parsed_results, monkeypatch):
+        """Entries whose pickled loader no longer exists are treated as misses."""
+        parsed_results[1].defer_execution_log(_stored_loader)
+        parse_cache.set(report_file, parsed_results)
+        monkeypatch.delattr(f"{__name__}._stored_loader")
+        assert parse_cache.get(report_file) is None
+
+    def test_get_uncached_report(self, parse_cache, report_file):
+        assert parse_cache.get(report_file) is None
+
+    def test_invalidated_when_report_changes(self, parse_cache, report_file, parsed_results):
+        parse_cache.set(report_file, parsed_results)
+        report_file.write_text("<html><body>changed</body></html>")
+        assert parse_cache.get(report_file) is None
+
+    def test_changed_report_replaces_entry(self, parse_cache, report_file, parsed_results, tmp_path):
+        parse_cache.set(report_file, parsed_results)
+        report_file.write_text("<html><body>changed</body></html>")
+        parse_cache.set(report_file, parsed_results[:1])
+        assert len(list((tmp_path / "parsed").glob("*.pickle"))) == 1
+        assert parse_cache.get(report_file) == parsed_results[:1]
+
+    def test_handles_corrupted_cache_file(self, parse_cache, report_file, parsed_results, tmp_path):
+        parse_cache.set(report_file, parsed_results)
+        cache_file = list((tmp_path / "parsed").glob("*.pickle"))[0]
+        cache_file.write_bytes(b"not a pickle")
+        assert parse_cache.get(report_file) is None
+
+    def test_store_sweeps_unused_entries(self, parse_cache, report_file, parsed_results, tmp_path):
+        parse_cache.set(report_file, parsed_results)
+        [old_entry] = (tmp_path / "parsed").glob("*.pickle")
+        leftover = tmp_path / "parsed" / "0123.456.tmp"
+        leftover.write_bytes(b"")
+        long_ago = time.time() - 15 * 86400
+        for path in (old_entry, leftover):
+            os.utime(path, (long_ago, long_ago))
+
+        other = tmp_path / "other.html"
+        other.write_text("<html></html>")
+        ParseCache().set(other, parsed_results)
+        assert not old_entry.exists()
+        assert not leftover.exists()
+        assert ParseCache().get(other) == parsed_results
+
+    def test_use_keeps_entry(self, parse_cache, report_file, parsed_results, tmp_path):
+        parse_cache.set(report_file, parsed_results)
+        [entry] = (tmp_path / "parsed").glob("*.pickle")
+        long_ago = time.time() - 15 * 86400
+        os.utime(entry, (long_ago, long_ago))
+
+        assert parse_cache.get(report_file) == parsed_results
+        assert ParseCache().sweep() == 0
+        assert parse_cache.get(report_file) == parsed_results
+
+    def test_clear_removes_all(self, parse_cache, report_file, parsed_results):
+        parse_cache.set(report_file, parsed_results)
+        assert parse_cache.clear() == 1
+        assert parse_cache.get(report_file) is None
@@ -1,9 +1,15 @@
 """Tests for CLI interface."""
 
+import json
+import os
+from unittest.mock import MagicMock
+
 import pytest
 from click.testing import CliRunner
 
 from reportminer.cli import main, filter_by_status, deduplicate, sort_results
+from reportminer.table import ResultTable
+from reportminer.jira_client import REVALIDATION_WAIT
 from reportminer.models import TestResult, TestStatus
 
 
@@ -100,6 +106,18 @@ class TestSortResults:
         assert sort_results([]) == []
 
 
+class TestTableHelpers:
+    """Tests for the list helpers applied to a ResultTable."""
+
+    def test_same_as_lists(self, test_results):
+        table = ResultTable.from_results(test_results + test_results)
+        results = test_results + test_results
+        assert filter_by_status(table, "failed").to_results() == filter_by_status(results, "failed")
+        assert filter_by_status(table, "all") is table
+        assert deduplicate(table).to_results() == deduplicate(results)
+        assert sort_results(table).to_results() == sort_results(results)
+
+
 class TestCLI:
     """Tests for CLI commands."""
 
@@ -154,6 +172,11 @@ class TestCLI:
         assert result.exit_code == 0
         assert "tests]" in result.output
 
+    def test_cluster_flag(self, runner, sample_html_report):
+        result = runner.invoke(main, ["--cluster", str(sample_html_report)])
+        assert result.exit_code == 0
+        assert "[1 tests] AssertionError: Expected [<n>] but got [<n>]" in result.output
+
     def test_status_all(self, runner, sample_html_report):
         result = runner.invoke(main, ["-s", "all", str(sample_html_report)])
         assert result.exit_code == 0
@@ -190,6 +213,11 @@ class TestCLI:
         assert result.exit_code == 0
         assert "SUMMARY" in result.output or "FIXED" in result.output or "NEW FAILURES" in result.output
 
+    def test_diff_group(self, runner, sample_html_report, second_html_report):
+        result = runner.invoke(main, ["--diff", "-g", str(sample_html_report), str(second_html_report)])
+        assert result.exit_code == 0
+        assert "NEW FAILURES (1):\n  [1 tests]" in result.output
+
     def test_invalid_path(self, runner):
         result = runner.invoke(main, ["/nonexistent/path.html"])
         assert result.exit_code != 0
@@ -302,6 +330,42 @@ class TestMultipleFiles:
         count = output.count("TMS_12345")
         assert count == 1
 
+    def test_unique_applies_before_status_filter(self, runner, sample_html_report, second_html_report):
+        # TMS_67890 fails in the first report and passes in the second
+        result = runner.invoke(main, [
+            "-s", "passed", "--unique",
+            str(sample_html_report),
+            str(second_html_report)
+        ])
+        assert result.exit_code == 0
+        assert "TMS_67890" not in result.output
+
+    def test_default_run_skips_details_of_other_statuses(self, runner, sample_html_report, monkeypatch):
+        from reportminer import parser
+
+        extracted = []
+        original = parser.parse_failure_reason
+
+        def counting_parse_reason(row):
+            extracted.append(row)
+            return original(row)
+
+        monkeypatch.setattr("reportminer.parser.parse_failure_reason", counting_parse_reason)
+        result = runner.invoke(main, ["-s", "passed", "-j", "1", str(sample_html_report)])
+        assert result.exit_code == 0
+        assert result.output.strip() == "TMS_12345"
+        # Only the passed test's reason is extracted
+        assert len(extracted) == 1
+
+    def test_no_unique_status_filter_keeps_later_matches(self, runner, sample_html_report, second_html_report):
+        result = runner.invoke(main, [
+            "-s", "passed", "--no-unique",
+            str(sample_html_report),
+            str(second_html_report)
+        ])
+        assert result.exit_code == 0
+        assert "TMS_67890" in result.output
+
     def test_no_unique_keeps_duplicates(self, runner, sample_html_report, second_html_report):
         result = runner.invoke(main, [
             "-s", "all", "--no-unique",
@@ -310,6 +374,30 @@ class TestMultipleFiles:
         ])
         assert result.exit_code == 0
 
+    def test_jobs_option(self, runner, sample_html_report, second_html_report):
+        result = runner.invoke(main, [
+            "-s", "all", "--no-unique", "-j", "2",
+            str(sample_html_report),
+            str(second_html_report)
+        ])
+        assert result.exit_code == 0
+        assert result.output.count("TMS_12345") == 2
+
+    def test_low_memory_option(self, runner, sample_html_report):
+        result = runner.invoke(main, ["--low-memory", "-s", "all", str(sample_html_report)])
+        assert result.exit_code == 0
+        assert "TMS_12345" in result.output
+
+    def test_archive_parsing(self, runner, tmp_path, sample_html_report):
+        import zipfile
+        archive = tmp_path / "artifacts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.write(sample_html_report, "shard1/report.html")
+
+        result = runner.invoke(main, ["-s", "all", str(archive)])
+        assert result.exit_code == 0
+        assert "TMS_12345" in result.output
+
     def test_directory_parsing(self, runner, tmp_path, sample_html_report):
         # Copy sample report to directory
         import shutil
@@ -342,6 +430,78 @@ class TestOutputFile:
         content = output_file.read_text()
         assert content.endswith("\n")
 
+    @pytest.mark.parametrize("args", [["-f", "detailed"], ["-g"]])
+    def test_output_file_matches_stdout(self, runner, sample_html_report, tmp_path, args):
+        output_file = tmp_path / "results.txt"
+        printed = runner.invoke(main, [*args, str(sample_html_report)])
+        runner.invoke(main, [*args, "-o", str(output_file), str(sample_html_report)])
+        assert output_file.read_text() == printed.output
+
+
+class TestExportFormats:
+    """Tests for ndjson, csv and parquet output."""
+
+    def test_ndjson(self, runner, sample_html_report):
+        result = runner.invoke(main, ["-f", "ndjson", "-s", "all", str(sample_html_report)])
+        assert result.exit_code == 0
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        assert {row["tms_number"] for row in rows} == {"TMS_12345", "TMS_67890", "TMS_11111"}
+        assert "execution_log" not in rows[0]
+
+    def test_csv_with_logs(self, runner, sample_html_report_with_logs):
+        result = runner.invoke(main, ["-f", "csv", "-s", "all", "--with-logs", str(sample_html_report_with_logs)])
+        assert result.exit_code == 0
+        assert result.output.splitlines()[0].endswith(",execution_log")
+        assert "kafka-consumer-bin" in result.output
+
+    def test_with_logs_needs_export_format(self, runner, sample_html_report):
+        result = runner.invoke(main, ["--with-logs", str(sample_html_report)])
+        assert result.exit_code == 1
+        assert "export formats" in result.output
+
+    def test_parquet_needs_output_file(self, runner, sample_html_report):
+        result = runner.invoke(main, ["-f", "parquet", str(sample_html_report)])
+        assert result.exit_code == 1
+        assert "binary" in result.output
+
+    def test_parquet(self, runner, sample_html_report, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        output_file = tmp_path / "results.parquet"
+        result = runner.invoke(main, ["-f", "parquet", "-o", str(output_file), str(sample_html_report)])
+        assert result.exit_code == 0
+        assert sorted(pq.read_table(output_file).column("tms_number").to_pylist()) == ["TMS_11111", "TMS_67890"]
+
+
+    def test_parquet_numeric_duration(self, runner, sample_html_report, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        report = tmp_path / "numeric.html"
+        report.write_text(sample_html_report.read_text().replace('"duration": "2.45s"', '"duration": 2.45'))
+        output_file = tmp_path / "results.parquet"
+        result = runner.invoke(main, ["-f", "parquet", "-s", "all", "-o", str(output_file), str(report)])
+        assert result.exit_code == 0
+        assert "2.45" in pq.read_table(output_file).column("duration").to_pylist()
+
+    def test_failed_export_leaves_no_file(self, runner, sample_html_report, tmp_path, monkeypatch):
+        def fail(self, results):
+            yield "{}"
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr("reportminer.formatters.NdjsonFormatter.iter_format", fail)
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        result = runner.invoke(main, ["-f", "ndjson", "-o", str(output_dir / "results.ndjson"), str(sample_html_report)])
+        assert result.exit_code == 1
+        assert list(output_dir.iterdir()) == []
+
+    def test_writes_through_symlinked_output(self, runner, sample_html_report, tmp_path):
+        target = tmp_path / "target.ndjson"
+        target.write_text("")
+        link = tmp_path / "link.ndjson"
+        link.symlink_to(target)
+        result = runner.invoke(main, ["-f", "ndjson", "-o", str(link), str(sample_html_report)])
+        assert result.exit_code == 0
+        assert link.is_symlink()
+        assert "TMS_67890" in target.read_text()
 
 class TestFormatWiki:
     """Tests for wiki output format."""
@@ -355,6 +515,37 @@ class TestFormatWiki:
         assert "[TMS-" in result.output
         assert "|https://" in result.output or "|http://" in result.output
 
+    def test_warns_about_failed_jira_requests(self, runner, sample_html_report, monkeypatch):
+        """Requests still failing after their retries are reported, not swallowed."""
+        import httpx
+        from reportminer.jira_client import JiraClient
+
+        monkeypatch.setattr("reportminer.config.JIRA_BASE_URL", "https://jira.example.com")
+        monkeypatch.setattr("reportminer.config.JIRA_EMAIL", "test@example.com")
+        monkeypatch.setattr("reportminer.config.JIRA_TOKEN", "token")
+        monkeypatch.setattr("reportminer.config.JIRA_MAX_RETRIES", 1)
+        monkeypatch.setattr("reportminer.jira_client.BACKOFF_BASE", 0)
+        client = JiraClient(async_transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+        monkeypatch.setattr("reportminer.cli.get_jira_client", lambda: client)
+
+        result = runner.invoke(main, ["-f", "wiki", str(sample_html_report)])
+        assert result.exit_code == 0
+        assert "Jira requests still failed after retrying" in result.output
+        assert "[TMS-" in result.output
+
+
+    def test_waits_briefly_for_jira_refreshes(self, runner, sample_html_report, monkeypatch):
+        """Background refreshes get a bounded wait once the output is written."""
+        client = MagicMock(is_configured=True)
+        client.metrics.failed = 0
+        monkeypatch.setattr("reportminer.config.JIRA_BASE_URL", "https://jira.example.com")
+        monkeypatch.setattr("reportminer.cli.get_jira_client", lambda: client)
+
+        result = runner.invoke(main, ["-f", "wiki", str(sample_html_report)])
+        assert result.exit_code == 0
+        client.wait_for_revalidation.assert_called_once_with(REVALIDATION_WAIT)
+        client.close.assert_called_once_with()
+
 
 class TestClearCache:
     """Tests for --clear-cache command."""
@@ -413,3 +604,118 @@ class TestCLIErrorHandling:
             str(tmp_path / "nonexistent.html")
         ])
         assert result.exit_code != 0
+
+
+class TestWarehouseCommands:
+    """Tests for mine ingest and mine query."""
+
+    @pytest.fixture
+    def ingested(self, runner, sample_html_report, second_html_report):
+        os.utime(sample_html_report, (1_700_000_000, 1_700_000_000))
+        os.utime(second_html_report, (1_700_086_400, 1_700_086_400))
+        result = runner.invoke(main, ["ingest", "-j", "1", str(sample_html_report), str(second_html_report)])
+        assert result.exit_code == 0
+        return result
+
+    def test_ingest_reports_counts(self, runner, ingested, sample_html_report):
+        assert "Ingested 2 reports (0 already in" in ingested.output
+        result = runner.invoke(main, ["ingest", str(sample_html_report)])
+        assert "Ingested 0 reports (1 already in" in result.output
+
+    def test_ingest_requires_paths(self, runner):
+        result = runner.invoke(main, ["ingest"])
+        assert result.exit_code != 0
+
+    def test_query_defaults_to_failed(self, runner, ingested):
+        result = runner.invoke(main, ["query"])
+        assert result.exit_code == 0
+        assert result.output.strip() == "TMS_99999, TMS_11111"
+
+    def test_query_ndjson(self, runner, ingested):
+        result = runner.invoke(main, ["query", "-f", "ndjson"])
+        assert result.exit_code == 0
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        assert [row["tms_number"] for row in rows] == ["TMS_99999", "TMS_11111"]
+        assert rows[0]["status"] == "failed"
+
+    def test_query_count(self, runner, ingested):
+        result = runner.invoke(main, ["query", "-s", "all", "-U", "-c"])
+        assert result.output.strip() == "6"
+
+    def test_query_unique_keeps_latest(self, runner, ingested):
+        result = runner.invoke(main, ["query", "-s", "all", "-f", "detailed", "--tms", "TMS-67890"])
+        assert result.exit_code == 0
+        assert "Status:   passed" in result.output
+        assert "failed" not in result.output
+
+    def test_query_matches_mine_for_fixed_failures(
+        self, runner, ingested, sample_html_report, second_html_report, tmp_path,
+    ):
+        # TMS_67890 failed in the older run and passed in the newer one
+        reports = tmp_path / "reports"
+        reports.mkdir()
+        (reports / "new.html").write_bytes(second_html_report.read_bytes())
+        (reports / "old.html").write_bytes(sample_html_report.read_bytes())
+        query = runner.invoke(main, ["query"])
+        mine = runner.invoke(main, [str(reports / "new.html"), str(reports / "old.html")])
+        assert query.output == mine.output
+        assert "TMS_67890" not in query.output
+
+    def test_query_no_unique_lists_every_failure(self, runner, ingested):
+        result = runner.invoke(main, ["query", "-U"])
+        assert result.output.strip() == "TMS_99999, TMS_67890, TMS_11111"
+
+    def test_query_last_runs(self, runner, ingested):
+        result = runner.invoke(main, ["query", "--last", "1", "-S"])
+        assert result.output.strip() == "TMS_99999"
+
+    def test_query_output_file(self, runner, ingested, tmp_path):
+        output = tmp_path / "out.txt"
+        result = runner.invoke(main, ["query", "-S", "-o", str(output)])
+        assert result.exit_code == 0
+        assert output.read_text().strip() == "TMS_11111, TMS_99999"
+
+    def test_query_empty_warehouse(self, runner):
+        result = runner.invoke(main, ["query"])
+        assert result.exit_code == 0
+        assert "No tests found" in result.output
+
+    def test_directory_named_like_subcommand_is_parsed(self, runner, tmp_path, sample_html_report, monkeypatch):
+        reports = tmp_path / "query"
+        reports.mkdir()
+        (reports / "report.html").write_bytes(sample_html_report.read_bytes())
+        monkeypatch.chdir(tmp_path)
+        result = runner.invoke(main, ["query", "-S"])
+        assert result.exit_code == 0
+        assert result.output.strip() == "TMS_11111, TMS_67890"
+
+
+class TestTrendMode:
+    """Tests for --trend."""
+
+    @pytest.fixture
+    def reports(self, sample_html_report, second_html_report):
+        os.utime(sample_html_report, (1_700_000_000, 1_700_000_000))
+        os.utime(second_html_report, (1_700_086_400, 1_700_086_400))
+        return [str(sample_html_report), str(second_html_report)]
+
+    def test_shows_tests_that_failed(self, runner, reports):
+        result = runner.invoke(main, ["--trend", *reports])
+        assert result.exit_code == 0
+        assert "TREND (2 runs" in result.output
+        assert "TMS_67890" in result.output
+        assert "TMS_12345" not in result.output
+
+    def test_status_all_shows_every_test(self, runner, reports):
+        result = runner.invoke(main, ["--trend", "-s", "all", "-c", *reports])
+        assert result.output.strip() == "4"
+
+    def test_count(self, runner, reports):
+        result = runner.invoke(main, ["--trend", "-c", *reports])
+        assert result.output.strip() == "3"
+
+    def test_output_file(self, runner, reports, tmp_path):
+        output = tmp_path / "trend.txt"
+        result = runner.invoke(main, ["--trend", "-o", str(output), *reports])
+        assert result.exit_code == 0
+        assert "Failing in their latest run: 2" in output.read_text()
@@ -3,6 +3,7 @@
 import pytest
 from reportminer.compare import compare_reports, format_compare_result, CompareResult
 from reportminer.models import TestResult, TestStatus
+from reportminer.table import ResultTable
 
 
 @pytest.fixture
@@ -83,6 +84,11 @@ class TestCompareReports:
         still_failing_tms = [r.tms_number for r in result.still_failing]
         assert "TMS_003" in still_failing_tms
 
+    def test_accepts_tables(self, old_results, new_results):
+        expected = compare_reports(old_results, new_results)
+        result = compare_reports(ResultTable.from_results(old_results), ResultTable.from_results(new_results))
+        assert result == expected
+
     def test_empty_results(self):
         result = compare_reports([], [])
         assert len(result.new_failures) == 0
@@ -125,3 +131,22 @@ class TestFormatCompareResult:
         )
         output = format_compare_result(result)
         assert "No changes" in output or "SUMMARY" in output
+
+    def test_groups_failing_sections_by_reason(self):
+        failures = [
+            TestResult(tms_number=f"TMS_{i}", test_name=f"test_{i}", test_id=f"t::{i}",
+                       status=TestStatus.FAILED, failure_reason=f"Expected 200 but got {code}")
+            for i, code in enumerate([500, 502])
+        ]
+        result = CompareResult(
+            new_failures=failures,
+            fixed=[],
+            still_failing=[],
+            new_errors=[],
+            fixed_errors=[],
+            still_erroring=[],
+            new_passes=[],
+        )
+        output = format_compare_result(result, group=True)
+        assert "NEW FAILURES (2):\n  [2 tests] Expected <n> but got <n>\n    - TMS_0: test_0\n    - TMS_1: test_1" in output
+        assert "got 500" not in output
@@ -35,6 +35,26 @@ class TestEnvironmentVariables:
 
         assert config_module.JIRA_TOKEN == "secret-token"
 
+    def test_jira_concurrency_from_env(self, monkeypatch):
+        monkeypatch.setenv("MINE_JIRA_CONCURRENCY", "16")
+
+        import importlib
+        import reportminer.config as config_module
+        importlib.reload(config_module)
+
+        assert config_module.JIRA_CONCURRENCY == 16
+
+    def test_jira_rate_limit_from_env(self, monkeypatch):
+        monkeypatch.setenv("MINE_JIRA_RATE", "2.5")
+        monkeypatch.setenv("MINE_JIRA_RETRIES", "0")
+
+        import importlib
+        import reportminer.config as config_module
+        importlib.reload(config_module)
+
+        assert config_module.JIRA_RATE_LIMIT == 2.5
+        assert config_module.JIRA_MAX_RETRIES == 0
+
     def test_default_values_when_no_env(self, monkeypatch):
         monkeypatch.delenv("MINE_JIRA_URL", raising=False)
         monkeypatch.delenv("MINE_JIRA_EMAIL", raising=False)
@@ -72,6 +92,45 @@ class TestCacheConfiguration:
 
         assert config_module.CACHE_TTL_HOURS == 72
 
+    def test_stale_and_negative_ttls_from_env(self, monkeypatch):
+        monkeypatch.setenv("MINE_CACHE_STALE", "48")
+        monkeypatch.setenv("MINE_CACHE_NEGATIVE_TTL", "3")
+
+        import importlib
+        import reportminer.config as config_module
+        importlib.reload(config_module)
+
+        assert config_module.CACHE_STALE_HOURS == 48
+        assert config_module.CACHE_NEGATIVE_TTL_HOURS == 3
+
+    def test_cache_backend_from_env(self, monkeypatch):
+        monkeypatch.setenv("MINE_CACHE_BACKEND", "sqlite")
+
+        import importlib
+        import reportminer.config as config_module
+        importlib.reload(config_module)
+
+        assert config_module.CACHE_BACKEND == "sqlite"
+
+    def test_warehouse_path_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("MINE_WAREHOUSE", str(tmp_path / "results.db"))
+
+        import importlib
+        import reportminer.config as config_module
+        importlib.reload(config_module)
+
+        assert config_module.WAREHOUSE_PATH == tmp_path / "results.db"
+
+    def test_warehouse_path_follows_xdg_data_home(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("MINE_WAREHOUSE", raising=False)
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+
+        import importlib
+        import reportminer.config as config_module
+        importlib.reload(config_module)
+
+        assert config_module.WAREHOUSE_PATH == tmp_path / "reportminer" / "warehouse.db"
+
 
 class TestSpinnerConfiguration:
     """Tests for spinner style configuration."""
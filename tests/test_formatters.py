@@ -1,7 +1,13 @@
 """Tests for output formatters."""
 
+import csv
+import io
+import json
+import sys
+
 import pytest
 from reportminer.formatters import (
+    EXPORT_FIELDS,
     get_formatter,
     RawFormatter,
     PytestFormatter,
@@ -11,9 +17,20 @@ from reportminer.formatters import (
     JiraFormatter,
     JiraWikiFormatter,
     GroupedByReasonFormatter,
+    GroupedFormatter,
     FORMATTERS,
+    write_lines,
 )
 from reportminer.models import TestResult, TestStatus
+from reportminer.table import ResultTable
+
+# (format, group) combinations with text output
+TEXT_OUTPUTS = [
+    (name, group)
+    for name, formatter in FORMATTERS.items()
+    if not formatter.binary
+    for group in ([False, True] if formatter.groupable else [False])
+]
 
 
 @pytest.fixture
@@ -59,10 +76,25 @@ class TestGetFormatter:
             get_formatter("nonexistent")
 
     def test_all_formats_registered(self):
-        expected = ["raw", "pytest", "names", "full", "detailed", "jira", "jira-md", "wiki"]
+        expected = ["raw", "pytest", "names", "full", "detailed", "jira", "jira-md", "wiki", "ndjson", "csv", "parquet"]
         for fmt in expected:
             assert fmt in FORMATTERS
 
+    def test_cluster_implies_group(self):
+        formatter = get_formatter("raw", cluster=True)
+        assert isinstance(formatter, GroupedByReasonFormatter)
+        assert formatter.cluster
+
+    def test_export_formats_cannot_be_grouped(self):
+        with pytest.raises(ValueError, match="can't be grouped"):
+            get_formatter("csv", group=True)
+
+    def test_with_logs_only_for_exports(self):
+        assert get_formatter("ndjson", with_logs=True).with_logs
+        assert not get_formatter("ndjson").with_logs
+        with pytest.raises(ValueError, match="export formats"):
+            get_formatter("raw", with_logs=True)
+
     def test_group_flag_wraps_formatter(self):
         formatter = get_formatter("pytest", group=True)
         # Should return GroupedByReasonFormatter
@@ -223,8 +255,171 @@ class TestGroupedByReasonFormatter:
         output = formatter.format(results)
         assert "No failure reason" in output
 
+    def test_groups_reasons_differing_in_details(self):
+        results = [
+            TestResult(
+                tms_number=f"TMS_{i}",
+                test_name="test",
+                test_id="test",
+                status=TestStatus.FAILED,
+                failure_reason=f"AssertionError: Expected [200] but got [{code}] at 0x7f{i}a",
+            )
+            for i, code in enumerate([500, 502, 503])
+        ]
+        output = GroupedByReasonFormatter().format(results)
+        assert output.startswith("### [3 tests] AssertionError: Expected [<n>] but got [<n>] at <hex>")
+
+    def test_cluster_merges_similar_reasons(self):
+        reasons = [
+            "TimeoutError: element login_button not visible on page home",
+            "TimeoutError: element logout_button not visible on page home",
+            "TimeoutError: element logout_button not visible on page home",
+            "KeyError: missing field",
+        ]
+        results = [
+            TestResult(tms_number=f"TMS_{i}", test_name="test", test_id="test",
+                       status=TestStatus.FAILED, failure_reason=reason)
+            for i, reason in enumerate(reasons)
+        ]
+        plain = GroupedByReasonFormatter().format(results)
+        clustered = GroupedByReasonFormatter(cluster=True).format(results)
+        assert plain.count("###") == 3
+        assert clustered.count("###") == 2
+        assert "### [3 tests] TimeoutError: element logout_button not visible on page home" in clustered
+
     def test_with_inner_format(self, test_results):
         formatter = GroupedByReasonFormatter(inner_format="pytest")
         output = formatter.format(test_results)
         # Should use pytest format (or-separated) inside groups
         assert " or " in output or "TMS_" in output
+
+
+class TestGroupedFormatter:
+    """Tests for the plain grouped listing."""
+
+    def test_lists_groups(self, test_results):
+        output = GroupedFormatter().format(test_results)
+        assert output == (
+            "[2 tests] AssertionError: login failed\n"
+            "  - TMS_12345: test_login\n"
+            "  - TMS_67890: test_checkout\n"
+            "\n"
+            "[1 tests] No failure reason\n"
+            "  - TMS_11111: test_search"
+        )
+
+
+class TestTableInput:
+    """Tests for formatting a ResultTable instead of a list."""
+
+    @pytest.mark.parametrize("format_name, group", TEXT_OUTPUTS)
+    def test_matches_list_output(self, test_results, format_name, group):
+        formatter = get_formatter(format_name, group=group)
+        table = ResultTable.from_results(test_results)
+        assert formatter.format(table) == formatter.format(test_results)
+
+    def test_cluster_matches_list_output(self, test_results):
+        formatter = get_formatter("raw", cluster=True)
+        table = ResultTable.from_results(test_results)
+        assert formatter.format(table) == formatter.format(test_results)
+
+
+class TestStreaming:
+    """Tests for line-by-line output."""
+
+    @pytest.mark.parametrize("format_name, group", TEXT_OUTPUTS)
+    def test_write_to_matches_format(self, test_results, format_name, group):
+        formatter = get_formatter(format_name, group=group)
+        stream = io.StringIO()
+        formatter.write_to(test_results, stream)
+        assert stream.getvalue() == formatter.format(test_results) + "\n"
+
+    def test_iter_format_yields_lines(self, test_results):
+        lines = DetailedFormatter().iter_format(test_results)
+        assert next(lines) == "-" * 80
+        assert next(lines) == "TMS:      TMS_12345"
+
+    def test_write_lines(self):
+        stream = io.StringIO()
+        write_lines(iter(["a", "", "b"]), stream)
+        assert stream.getvalue() == "a\n\nb\n"
+
+
+@pytest.fixture
+def export_results():
+    return [
+        TestResult(
+            tms_number="TMS_1",
+            test_name="test_a",
+            test_id="tests/test_a.py::test_a",
+            status=TestStatus.FAILED,
+            failure_reason='AssertionError: "x", y\nline 2',
+            duration="1s",
+            execution_log="INFO start\nERROR boom",
+        ),
+        TestResult(
+            tms_number="TMS_2",
+            test_name="test_b",
+            test_id="tests/test_b.py::test_b",
+            status=TestStatus.PASSED,
+        ),
+    ]
+
+
+class TestExportFormats:
+    """Tests for the machine-readable ndjson, csv and parquet formats."""
+
+    def test_ndjson(self, export_results):
+        rows = [json.loads(line) for line in get_formatter("ndjson").format(export_results).split("\n")]
+        assert list(rows[0]) == list(EXPORT_FIELDS)
+        assert rows[0]["status"] == "failed"
+        assert rows[0]["failure_reason"] == 'AssertionError: "x", y\nline 2'
+        assert rows[1]["failure_reason"] is None
+
+    def test_csv_round_trips(self, export_results):
+        rows = list(csv.DictReader(io.StringIO(get_formatter("csv").format(export_results))))
+        assert len(rows) == 2
+        assert rows[0]["failure_reason"] == 'AssertionError: "x", y\nline 2'
+        assert rows[1]["status"] == "passed"
+        assert rows[1]["failure_reason"] == ""
+
+    def test_csv_header_only_for_no_results(self):
+        assert get_formatter("csv").format([]) == ",".join(EXPORT_FIELDS)
+
+    @pytest.mark.parametrize("format_name", ["ndjson", "csv"])
+    def test_logs_are_opt_in(self, export_results, format_name):
+        assert "ERROR boom" not in get_formatter(format_name).format(export_results)
+        assert "ERROR boom" in get_formatter(format_name, with_logs=True).format(export_results)
+
+    def test_batches(self, export_results, monkeypatch):
+        monkeypatch.setattr("reportminer.formatters.EXPORT_BATCH_ROWS", 1)
+        table = ResultTable.from_results(export_results)
+        # Header and first row, then the second row
+        assert len(list(get_formatter("csv").iter_format(table))) == 2
+        assert get_formatter("csv").format(table) == get_formatter("csv").format(export_results)
+        assert get_formatter("ndjson").format(table) == get_formatter("ndjson").format(export_results)
+
+    def test_table_logs_are_not_kept(self, export_results):
+        table = ResultTable.from_results(export_results)
+        table._logs[0] = lambda: "built log"
+        assert "built log" in get_formatter("ndjson", with_logs=True).format(table)
+        assert callable(table._logs[0])
+
+    def test_parquet(self, export_results, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "results.parquet"
+        with open(path, "wb") as fp:
+            get_formatter("parquet", with_logs=True).write_to(ResultTable.from_results(export_results), fp)
+        rows = pq.read_table(path).to_pylist()
+        assert rows[0]["tms_number"] == "TMS_1"
+        assert rows[0]["execution_log"] == "INFO start\nERROR boom"
+        assert rows[1]["duration"] is None
+
+    def test_parquet_has_no_text_form(self, export_results):
+        with pytest.raises(ValueError, match="binary"):
+            get_formatter("parquet").format(export_results)
+
+    def test_parquet_needs_pyarrow(self, export_results, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with pytest.raises(ImportError, match="reportminer\\[parquet\\]"):
+            get_formatter("parquet").write_to(export_results, io.BytesIO())
@@ -0,0 +1,69 @@
+"""Tests for grouping results by failure reason."""
+
+from reportminer.grouping import group_by_reason, partition
+from reportminer.models import TestResult, TestStatus
+from reportminer.table import ResultTable
+
+
+def make_result(i, reason):
+    return TestResult(
+        tms_number=f"TMS_{i}",
+        test_name=f"test_{i}",
+        test_id=f"tests/test_mod.py::test_{i}",
+        status=TestStatus.FAILED,
+        failure_reason=reason,
+    )
+
+
+def results():
+    return [
+        make_result(1, "KeyError: missing"),
+        make_result(2, "Expected 200 but got 500"),
+        make_result(3, None),
+        make_result(4, "Expected 200 but got 502"),
+    ]
+
+
+class TestPartition:
+    """Tests for splitting results by a key per result."""
+
+    def test_list(self):
+        groups = partition(results(), ["a", "b", "a", "b"])
+        assert [[r.tms_number for r in group] for group in groups.values()] == [["TMS_1", "TMS_3"], ["TMS_2", "TMS_4"]]
+
+    def test_table_matches_list(self):
+        keys = ["a", "b", "a", "b"]
+        groups = partition(ResultTable.from_results(results()), keys)
+        assert {key: group.to_results() for key, group in groups.items()} == partition(results(), keys)
+
+
+class TestGroupByReason:
+    """Tests for the shared group-by-reason stage."""
+
+    def test_most_common_first(self):
+        groups = group_by_reason(results())
+        assert [key for key, _ in groups] == ["Expected <n> but got <n>", "KeyError: missing", "No failure reason"]
+        assert [r.tms_number for r in groups[0][1]] == ["TMS_2", "TMS_4"]
+
+    def test_table_matches_list(self):
+        expected = group_by_reason(results())
+        groups = group_by_reason(ResultTable.from_results(results()))
+        assert [(key, group.to_results()) for key, group in groups] == expected
+
+    def test_keys_are_memoized_on_results(self, monkeypatch):
+        items = results()
+        group_by_reason(items)
+        monkeypatch.setattr("reportminer.models.reason_key", None)
+        # A second grouping (another formatter, compare, the TUI) reuses them
+        assert len(group_by_reason(items)) == 3
+
+    def test_cluster(self):
+        items = [
+            make_result(1, "TimeoutError: element login_button not visible on page home"),
+            make_result(2, "TimeoutError: element logout_button not visible on page home"),
+            make_result(3, "TimeoutError: element logout_button not visible on page home"),
+        ]
+        groups = group_by_reason(items, cluster=True)
+        assert [(key, len(group)) for key, group in groups] == [
+            ("TimeoutError: element logout_button not visible on page home", 3),
+        ]
@@ -1,9 +1,23 @@
 """Tests for Jira API client."""
 
+import asyncio
+import json
+import re
+import sys
+import threading
+
+import httpx
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
-from reportminer.jira_client import JiraClient, get_jira_client, JiraClientError
+from reportminer.jira_client import (
+    MAX_BACKOFF,
+    SEARCH_BATCH_SIZE,
+    JiraClient,
+    JiraClientError,
+    RequestScheduler,
+    get_jira_client,
+)
 from reportminer.models import TestResult, TestStatus
 
 
@@ -14,6 +28,9 @@ def mock_config(monkeypatch):
     monkeypatch.setattr("reportminer.config.JIRA_EMAIL", "test@example.com")
     monkeypatch.setattr("reportminer.config.JIRA_TOKEN", "test-token")
     monkeypatch.setattr("reportminer.config.JIRA_STEPS_FIELD", "customfield_10100")
+    # No pacing or backoff delays in tests
+    monkeypatch.setattr("reportminer.config.JIRA_RATE_LIMIT", 0)
+    monkeypatch.setattr("reportminer.jira_client.BACKOFF_BASE", 0)
 
 
 @pytest.fixture
@@ -34,6 +51,74 @@ def configured_client(mock_config, monkeypatch, tmp_path):
     return JiraClient()
 
 
+class FakeJira:
+    """In-process Jira API answering issue GETs and JQL key searches."""
+
+    def __init__(self, issues, page_size=SEARCH_BATCH_SIZE):
+        self.issues = issues
+        self.page_size = page_size
+        self.requests = []
+
+    def handle(self, request):
+        self.requests.append(request)
+        if request.method == "GET" and request.url.path.startswith("/rest/api/3/issue/"):
+            key = request.url.path.rsplit("/", 1)[1]
+            if key not in self.issues:
+                return httpx.Response(404)
+            return httpx.Response(200, json=self._issue(key, request.url.params["fields"].split(",")))
+        if request.method == "POST" and request.url.path == "/rest/api/3/search/jql":
+            return self._search(request)
+        return httpx.Response(404)
+
+    def _search(self, request):
+        body = json.loads(request.content)
+        keys = re.fullmatch(r"key in \((.*)\)", body["jql"]).group(1).split(", ")
+        unknown = [key for key in keys if key not in self.issues]
+        if unknown:
+            messages = [f"An issue with key '{key}' does not exist for field 'key'." for key in unknown]
+            return httpx.Response(400, json={"errorMessages": messages})
+        start = int(body.get("nextPageToken", 0))
+        page = keys[start:start + min(body["maxResults"], self.page_size)]
+        data = {"issues": [self._issue(key, body["fields"]) for key in page]}
+        if start + len(page) < len(keys):
+            data["nextPageToken"] = str(start + len(page))
+            data["isLast"] = False
+        else:
+            data["isLast"] = True
+        return httpx.Response(200, json=data)
+
+    def _issue(self, key, fields):
+        return {"key": key, "fields": {name: self.issues[key].get(name) for name in fields}}
+
+    @property
+    def searches(self):
+        return [r for r in self.requests if r.method == "POST"]
+
+
+def make_issues(count):
+    return {
+        f"TMS-{i}": {"summary": f"Summary {i}", "customfield_10100": f"Step {i}"}
+        for i in range(count)
+    }
+
+
+def make_results(count):
+    return [
+        TestResult(tms_number=f"TMS_{i}", test_name="test", test_id="test", status=TestStatus.FAILED)
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def fake_jira(mock_config, monkeypatch, tmp_path):
+    """Fake Jira with 300 issues, and a configured client talking to it."""
+    monkeypatch.setattr("reportminer.cache.CACHE_DIR", tmp_path)
+    jira = FakeJira(make_issues(300))
+    transport = httpx.MockTransport(jira.handle)
+    client = JiraClient(transport=transport, async_transport=transport)
+    return jira, client
+
+
 class TestJiraClientConfiguration:
     """Tests for Jira client configuration."""
 
@@ -143,6 +228,406 @@ class TestJiraClientEnrich:
         assert len(callback_calls) >= 1
 
 
+class TestJiraClientBatchFetch:
+    """Tests for batched fetching through JQL searches."""
+
+    def test_one_search_per_batch(self, fake_jira):
+        """Uncached issues are searched SEARCH_BATCH_SIZE keys at a time."""
+        jira, client = fake_jira
+        results = make_results(250)
+        client.enrich_results(results)
+        assert len(jira.searches) == 3
+        assert len(jira.requests) == 3
+        assert results[249].jira_summary == "Summary 249"
+        assert results[249].jira_test_steps == "Step 249"
+
+    def test_requests_configured_fields(self, fake_jira):
+        """Searches ask for the summary and the steps field."""
+        jira, client = fake_jira
+        client.fetch_issues(["TMS-1"])
+        body = json.loads(jira.searches[0].content)
+        assert body["fields"] == ["summary", "customfield_10100"]
+        assert body["jql"] == "key in (TMS-1)"
+
+    def test_only_searches_cache_misses(self, fake_jira):
+        """Cached issues are left out of the searches."""
+        jira, client = fake_jira
+        client.cache.set("TMS-1", {"key": "TMS-1", "summary": "Cached", "test_steps": None})
+        issues = client.fetch_issues(["TMS-1", "TMS-2"])
+        assert issues["TMS-1"].summary == "Cached"
+        assert issues["TMS-2"].summary == "Summary 2"
+        assert json.loads(jira.searches[0].content)["jql"] == "key in (TMS-2)"
+
+    def test_caches_every_returned_issue(self, fake_jira):
+        """A second enrichment of the same results makes no requests."""
+        jira, client = fake_jira
+        client.enrich_results(make_results(150))
+        assert client.cache.get("TMS-149")["summary"] == "Summary 149"
+        requests = len(jira.requests)
+        results = make_results(150)
+        client.enrich_results(results)
+        assert len(jira.requests) == requests
+        assert results[0].jira_summary == "Summary 0"
+
+    def test_deduplicates_keys(self, fake_jira):
+        """Results sharing a TMS number are looked up once."""
+        jira, client = fake_jira
+        results = make_results(3) + make_results(3)
+        client.enrich_results(results)
+        assert json.loads(jira.searches[0].content)["jql"] == "key in (TMS-0, TMS-1, TMS-2)"
+        assert results[4].jira_summary == "Summary 1"
+
+    def test_follows_result_pages(self, fake_jira):
+        """Searches returning fewer issues than asked continue on the next page."""
+        jira, client = fake_jira
+        jira.page_size = 40
+        issues = client.fetch_issues([f"TMS-{i}" for i in range(100)])
+        assert len(issues) == 100
+        assert len(jira.searches) == 3
+
+    def test_skips_unknown_keys(self, fake_jira):
+        """A key Jira rejects is dropped and the rest of the batch searched again."""
+        jira, client = fake_jira
+        issues = client.fetch_issues(["TMS-1", "TMS-999", "TMS-2"])
+        assert set(issues) == {"TMS-1", "TMS-2"}
+        assert len(jira.searches) == 2
+
+    def test_skips_failed_batches(self, fake_jira):
+        """A batch that errors is skipped without failing the others."""
+        jira, client = fake_jira
+
+        def failing_first(request):
+            if b"TMS-0," in request.content:
+                return httpx.Response(500)
+            return jira.handle(request)
+
+        client = JiraClient(async_transport=httpx.MockTransport(failing_first))
+        results = make_results(150)
+        client.enrich_results(results)
+        assert results[0].jira_summary is None
+        assert results[149].jira_summary == "Summary 149"
+
+    def test_concurrent_searches_are_limited(self, fake_jira, monkeypatch):
+        """At most MINE_JIRA_CONCURRENCY searches are in flight at once."""
+        monkeypatch.setattr("reportminer.config.JIRA_CONCURRENCY", 3)
+        jira, _ = fake_jira
+        jira.issues = make_issues(1000)
+        in_flight = []
+        peak = []
+
+        async def slow(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            return jira.handle(request)
+
+        client = JiraClient(async_transport=httpx.MockTransport(slow))
+        issues = client.fetch_issues([f"TMS-{i}" for i in range(1000)])
+        assert len(issues) == 1000
+        assert len(jira.searches) == 10
+        assert max(peak) == 3
+
+    def test_progress_only_grows(self, fake_jira):
+        """Progress counts keys done, in increasing order, up to the total."""
+        jira, client = fake_jira
+        client.cache.set("TMS-0", {"key": "TMS-0", "summary": "Cached", "test_steps": None})
+        calls = []
+        client.fetch_issues(
+            [f"TMS-{i}" for i in range(250)],
+            progress_callback=lambda current, total, name: calls.append((current, total)),
+        )
+        counts = [current for current, _ in calls]
+        assert counts == sorted(counts)
+        assert counts[0] == 1
+        assert calls[-1] == (250, 250)
+
+    async def test_fetch_issues_async(self, fake_jira):
+        """The async API can be awaited from a running event loop."""
+        jira, client = fake_jira
+        issues = await client.fetch_issues_async(["TMS-1", "TMS-2"])
+        assert issues["TMS-2"].summary == "Summary 2"
+        assert len(jira.searches) == 1
+
+    def test_fetch_issue_uses_transport(self, fake_jira):
+        """Single fetches go through the same client."""
+        jira, client = fake_jira
+        assert client.fetch_issue("TMS-5").test_steps == "Step 5"
+        assert client.fetch_issue("TMS-999") is None
+        assert jira.requests[0].url.params["fields"] == "summary,customfield_10100"
+
+
+def age_entry(cache, key, hours):
+    """Backdate a cache entry by some hours."""
+    (cached_at, ttl, value), = cache.backend.get_many([key]).values()
+    cache.backend.set_many({key: (cached_at - hours * 3600, ttl, value)})
+
+
+class TestJiraClientCaching:
+    """Tests for caching missing issues and refreshing stale ones."""
+
+    def test_caches_missing_issue(self, fake_jira):
+        """A 404 is remembered, so the issue isn't requested again."""
+        jira, client = fake_jira
+        assert client.fetch_issue("TMS-999") is None
+        assert client.fetch_issue("TMS-999") is None
+        assert len(jira.requests) == 1
+
+    def test_caches_keys_missing_from_search(self, fake_jira):
+        jira, client = fake_jira
+        client.fetch_issues(["TMS-1", "TMS-999"])
+        searches = len(jira.searches)
+        issues = client.fetch_issues(["TMS-1", "TMS-999"])
+        assert set(issues) == {"TMS-1"}
+        assert len(jira.searches) == searches
+
+    def test_missing_issues_use_negative_ttl(self, fake_jira, monkeypatch):
+        monkeypatch.setattr("reportminer.config.CACHE_NEGATIVE_TTL_HOURS", 2)
+        jira, client = fake_jira
+        client.fetch_issues(["TMS-999"])
+        age_entry(client.cache, "TMS-999", 3)
+        assert client.cache.lookup("TMS-999").stale is True
+
+    def test_failed_batches_are_not_cached_as_missing(self, fake_jira):
+        jira, _ = fake_jira
+        client = JiraClient(async_transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+        client.fetch_issues(["TMS-1"])
+        assert client.cache.lookup("TMS-1") is None
+
+    def test_serves_stale_issue_and_refreshes_it(self, fake_jira):
+        """A stale issue is used at once and updated once the refresh is in."""
+        jira, _ = fake_jira
+        release = threading.Event()
+
+        def held(request):
+            release.wait(5)
+            return jira.handle(request)
+
+        client = JiraClient(async_transport=httpx.MockTransport(held))
+        client.cache.set("TMS-1", {"key": "TMS-1", "summary": "Old summary", "test_steps": None})
+        age_entry(client.cache, "TMS-1", 48)
+
+        results = make_results(2)[1:]
+        client.enrich_results(results)
+        assert results[0].jira_summary == "Old summary"
+
+        release.set()
+        client.wait_for_revalidation()
+        # The refresh is for the next run; results already handed out stay as they are
+        assert results[0].jira_summary == "Old summary"
+        assert client.cache.lookup("TMS-1").stale is False
+        assert client.fetch_issues(["TMS-1"])["TMS-1"].summary == "Summary 1"
+
+    def test_refresh_does_not_hold_up_exit(self, fake_jira):
+        """Refreshes run in daemon threads, and waiting for them can be cut short."""
+        jira, _ = fake_jira
+        release = threading.Event()
+
+        def held(request):
+            release.wait(5)
+            return jira.handle(request)
+
+        client = JiraClient(async_transport=httpx.MockTransport(held))
+        client.cache.set("TMS-1", {"key": "TMS-1", "summary": "Old summary", "test_steps": None})
+        age_entry(client.cache, "TMS-1", 48)
+        client.fetch_issues(["TMS-1"])
+
+        thread = client._revalidations[0]
+        assert thread.daemon
+        client.wait_for_revalidation(timeout=0.05)
+        assert thread.is_alive()
+        release.set()
+        client.wait_for_revalidation()
+        assert client._revalidations == []
+
+    def test_sqlite_backend(self, fake_jira, monkeypatch):
+        """Batches and background refreshes work with the SQLite cache."""
+        monkeypatch.setattr("reportminer.cache.CACHE_BACKEND", "sqlite")
+        jira, _ = fake_jira
+        client = JiraClient(async_transport=httpx.MockTransport(jira.handle))
+        client.fetch_issues([f"TMS-{i}" for i in range(150)] + ["TMS-999"])
+        age_entry(client.cache, "TMS-1", 48)
+        searches = len(jira.searches)
+        results = make_results(150)
+        client.enrich_results(results)
+        client.wait_for_revalidation()
+        # Only the stale issue is searched again
+        assert len(jira.searches) == searches + 1
+        assert client.cache.lookup("TMS-1").value["summary"] == "Summary 1"
+        assert client.cache.lookup("TMS-1").stale is False
+        assert client.cache.lookup("TMS-999").value is None
+        client.close()
+        assert client.cache.backend._conn is None
+
+    def test_fresh_issues_are_not_refreshed(self, fake_jira):
+        jira, client = fake_jira
+        client.fetch_issues(["TMS-1"])
+        client.fetch_issues(["TMS-1"])
+        client.wait_for_revalidation()
+        assert len(jira.searches) == 1
+
+    def test_fetch_issue_refreshes_stale_issue(self, fake_jira):
+        jira, client = fake_jira
+        client.cache.set("TMS-1", {"key": "TMS-1", "summary": "Old summary", "test_steps": None})
+        age_entry(client.cache, "TMS-1", 48)
+        assert client.fetch_issue("TMS-1").summary == "Old summary"
+        client.wait_for_revalidation()
+        assert client.fetch_issue("TMS-1").summary == "Summary 1"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRequestScheduler:
+    """Tests for request pacing and retry decisions."""
+
+    def test_bursts_then_paces(self):
+        """Requests beyond the burst wait their turn at the rate."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(rate=2, burst=2, clock=clock)
+        assert [scheduler.reserve() for _ in range(4)] == [0, 0, 0.5, 1.0]
+
+    def test_tokens_refill_over_time(self):
+        clock = FakeClock()
+        scheduler = RequestScheduler(rate=2, burst=2, clock=clock)
+        scheduler.reserve()
+        scheduler.reserve()
+        clock.now += 1
+        assert scheduler.reserve() == 0
+
+    def test_reserve_from_many_threads(self):
+        """Concurrent reservations each get their own place in the queue."""
+        interval = sys.getswitchinterval()
+        # Switch threads as often as possible to expose races
+        sys.setswitchinterval(1e-6)
+        try:
+            scheduler = RequestScheduler(rate=100, burst=1, clock=FakeClock())
+            waits = []
+            threads = [
+                threading.Thread(target=lambda: waits.extend(scheduler.reserve() for _ in range(200)))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert sorted(waits) == pytest.approx([n / 100 for n in range(1600)])
+        assert scheduler.metrics.requests == 1600
+
+    def test_no_rate_limit(self):
+        scheduler = RequestScheduler(rate=0, clock=FakeClock())
+        assert all(scheduler.reserve() == 0 for _ in range(100))
+
+    def test_honors_retry_after_seconds(self):
+        scheduler = RequestScheduler(rate=0, max_retries=3, clock=FakeClock())
+        response = httpx.Response(429, headers={"Retry-After": "7"})
+        assert scheduler.retry_delay(response, 0) == 7
+        assert scheduler.metrics.rate_limited == 1
+
+    def test_honors_retry_after_date(self):
+        scheduler = RequestScheduler(rate=0, max_retries=3, clock=FakeClock())
+        response = httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert scheduler.retry_delay(response, 0) == 0
+
+    def test_honors_rate_limit_reset(self):
+        scheduler = RequestScheduler(rate=0, max_retries=3, clock=FakeClock())
+        response = httpx.Response(429, headers={"X-RateLimit-Reset": "2099-01-01T00:00Z"})
+        assert scheduler.retry_delay(response, 0) > 1_000_000
+
+    def test_rate_limit_pauses_every_request(self):
+        """A 429 holds back the other requests until Retry-After passes."""
+        clock = FakeClock()
+        scheduler = RequestScheduler(rate=0, max_retries=3, clock=clock)
+        scheduler.retry_delay(httpx.Response(429, headers={"Retry-After": "5"}), 0)
+        assert scheduler.reserve() == 5
+        clock.now += 5
+        assert scheduler.reserve() == 0
+
+    def test_exhausted_quota_pauses_without_retry(self):
+        """A successful response with no requests remaining pauses until the reset."""
+        scheduler = RequestScheduler(rate=0, max_retries=3, clock=FakeClock())
+        response = httpx.Response(200, headers={"X-RateLimit-Remaining": "0", "Retry-After": "3"})
+        assert scheduler.retry_delay(response, 0) is None
+        assert scheduler.reserve() == 3
+
+    def test_backoff_grows_with_jitter(self):
+        scheduler = RequestScheduler(rate=0, max_retries=20, backoff=1, clock=FakeClock())
+        for attempt in range(4):
+            delay = scheduler.retry_delay(httpx.Response(502), attempt)
+            assert 2 ** attempt / 2 <= delay <= 2 ** attempt
+        assert scheduler.retry_delay(httpx.Response(502), 15) <= MAX_BACKOFF
+
+    def test_backs_off_after_transport_errors(self):
+        scheduler = RequestScheduler(rate=0, max_retries=1, backoff=1, clock=FakeClock())
+        assert 0.5 <= scheduler.retry_delay(None, 0) <= 1
+
+    def test_does_not_retry_client_errors(self):
+        scheduler = RequestScheduler(rate=0, max_retries=3, clock=FakeClock())
+        assert scheduler.retry_delay(httpx.Response(404), 0) is None
+        assert scheduler.retry_delay(httpx.Response(400), 0) is None
+        assert scheduler.metrics.retries == 0
+
+    def test_gives_up_after_max_retries(self):
+        scheduler = RequestScheduler(rate=0, max_retries=2, backoff=0, clock=FakeClock())
+        assert scheduler.retry_delay(httpx.Response(500), 1) is not None
+        assert scheduler.retry_delay(httpx.Response(500), 2) is None
+        assert scheduler.metrics.retries == 1
+        assert scheduler.metrics.failed == 1
+
+
+class TestJiraClientRetries:
+    """Tests for retrying requests through the client."""
+
+    def test_retries_rate_limited_search(self, fake_jira):
+        """A 429 is retried and the batch still enriches its results."""
+        jira, _ = fake_jira
+        responses = []
+
+        def limited_once(request):
+            responses.append(request)
+            if len(responses) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return jira.handle(request)
+
+        client = JiraClient(async_transport=httpx.MockTransport(limited_once))
+        results = make_results(5)
+        client.enrich_results(results)
+        assert results[4].jira_summary == "Summary 4"
+        assert client.metrics.rate_limited == 1
+        assert client.metrics.retries == 1
+        assert client.metrics.requests == 2
+
+    def test_retries_connection_errors(self, fake_jira):
+        jira, _ = fake_jira
+        calls = []
+
+        def flaky(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("connection reset", request=request)
+            return jira.handle(request)
+
+        client = JiraClient(transport=httpx.MockTransport(flaky))
+        assert client.fetch_issue("TMS-3").summary == "Summary 3"
+        assert client.metrics.retries == 1
+
+    def test_counts_requests_given_up_on(self, fake_jira, monkeypatch):
+        monkeypatch.setattr("reportminer.config.JIRA_MAX_RETRIES", 2)
+        client = JiraClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+        with pytest.raises(JiraClientError):
+            client.fetch_issue("TMS-3")
+        assert client.metrics.requests == 3
+        assert client.metrics.failed == 1
+
+
 class TestADFConversion:
     """Tests for Atlassian Document Format conversion."""
 
@@ -0,0 +1,69 @@
+"""Tests for incremental JSON blob decoding."""
+
+import json
+
+import pytest
+
+from reportminer.jsonstream import iter_object_items
+
+
+def chunked(text, size):
+    """Split text into fixed-size chunks."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+DOCUMENT = {
+    "environment": {"Python": "3.11", "brace}in": "string{"},
+    "tests": {
+        "tests/test_a.py::test_one": [{"result": "Passed", "duration": 12, "log": "a \"quoted\" ]} line"}],
+        "tests/test_a.py::test_two": [{"result": "Failed", "extras": [], "ratio": 0.125}],
+        "tests/test_b.py::test_three": {"result": "Skipped", "nested": {"deep": [1, [2, [3]]]}},
+    },
+    "count": 123456,
+}
+
+
+class TestIterObjectItems:
+    """Tests for iter_object_items."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+    def test_matches_json_loads(self, chunk_size):
+        text = json.dumps(DOCUMENT)
+        items = list(iter_object_items(chunked(text, chunk_size)))
+        assert items == list(DOCUMENT["tests"].items())
+
+    def test_handles_whitespace(self):
+        text = json.dumps(DOCUMENT, indent=4)
+        assert dict(iter_object_items(chunked(text, 5))) == DOCUMENT["tests"]
+
+    def test_tests_key_first(self):
+        text = json.dumps({"tests": {"t": [1]}, "after": 5})
+        assert list(iter_object_items(chunked(text, 4))) == [("t", [1])]
+
+    def test_empty_tests_object(self):
+        assert list(iter_object_items([json.dumps({"tests": {}})])) == []
+
+    def test_missing_tests_key(self):
+        assert list(iter_object_items([json.dumps({"other": 1})])) == []
+
+    def test_is_lazy(self):
+        text = json.dumps(DOCUMENT)
+        consumed = []
+
+        def source():
+            for chunk in chunked(text, 8):
+                consumed.append(chunk)
+                yield chunk
+
+        items = iter_object_items(source())
+        next(items)
+        assert len("".join(consumed)) < len(text)
+
+    def test_raises_for_non_object_tests(self):
+        with pytest.raises(ValueError, match="Expected a JSON object"):
+            list(iter_object_items([json.dumps({"tests": [1, 2]})]))
+
+    def test_raises_for_truncated_document(self):
+        text = json.dumps(DOCUMENT)
+        with pytest.raises(ValueError):
+            list(iter_object_items(chunked(text[:-40], 16)))
@@ -0,0 +1,59 @@
+"""Tests for log cleaning."""
+
+import html
+import random
+import re
+
+import pytest
+
+from reportminer.logclean import clean_log_content
+
+
+def five_pass_clean(content):
+    """The original step-by-step cleaner the fast path must match."""
+    content = html.unescape(content)
+    content = re.sub(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])", "", content)
+    content = content.replace("\r\n", "\n").replace("\r", "\n")
+    content = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", content)
+    content = re.sub(r"\n{3,}", "\n\n", content)
+    return content.strip()
+
+
+class TestCleanLogContent:
+    """Tests for clean_log_content."""
+
+    @pytest.mark.parametrize("content, expected", [
+        ("plain line", "plain line"),
+        ("&lt;tag&gt; &amp; more", "<tag> & more"),
+        ("\x1b[31mred\x1b[0m text", "red text"),
+        ("a\r\nb\rc", "a\nb\nc"),
+        ("a\x00b\x07c\td", "abc\td"),
+        ("a\n\n\n\n\nb", "a\n\nb"),
+        ("  \n padded \n  ", "padded"),
+        ("résumé ✓\x00", "résumé ✓"),
+    ])
+    def test_cleans(self, content, expected):
+        assert clean_log_content(content) == expected
+
+    def test_escape_sequence_between_cr_and_lf(self):
+        assert clean_log_content("a\r\x1b[0m\nb") == "a\nb"
+
+    def test_control_char_between_cr_and_lf(self):
+        assert clean_log_content("a\r\x00\nb") == "a\n\nb"
+
+    def test_decoded_entities_are_cleaned(self):
+        assert clean_log_content("a&#13;&#10;&#13;b &lt;c&gt;") == "a\n\nb <c>"
+
+    def test_removed_sequence_does_not_expose_another(self):
+        assert clean_log_content("\x1b\x1bM[0m") == "[0m"
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_five_pass_clean(self, seed):
+        atoms = [
+            "a", "é", " ", "\t", "\n", "\r", "\r\n", "\x00", "\x7f", "\x0c",
+            "\x1b", "\x1b[31m", "\x1bM", "\x1b[", "[0m", "&", "&amp;", "&#27;", "&#13;",
+        ]
+        rng = random.Random(seed)
+        for _ in range(2000):
+            content = "".join(rng.choice(atoms) for _ in range(rng.randint(0, 15)))
+            assert clean_log_content(content) == five_pass_clean(content), repr(content)
@@ -1,7 +1,11 @@
 """Tests for data models."""
 
+import dataclasses
+import pickle
+from functools import partial
+
 import pytest
-from reportminer.models import TestResult, TestStatus, JiraIssueData
+from reportminer.models import ReasonTable, TestResult, TestStatus, JiraIssueData
 
 
 class TestTestStatus:
@@ -26,13 +30,24 @@ class TestTestStatus:
     def test_from_string_with_whitespace(self):
         assert TestStatus.from_string("  passed  ") == TestStatus.PASSED
 
+    @pytest.mark.parametrize("spelling, expected", [
+        ("Passed", TestStatus.PASSED),
+        ("XFailed", TestStatus.XFAILED),
+        ("XPassed", TestStatus.XPASSED),
+        ("Rerun", TestStatus.RERUN),
+        ("xFaIlEd", TestStatus.XFAILED),
+        (" Error\n", TestStatus.ERROR),
+    ])
+    def test_from_string_report_spellings(self, spelling, expected):
+        assert TestStatus.from_string(spelling) is expected
+
     def test_from_string_invalid(self):
         with pytest.raises(ValueError, match="Unknown test status"):
             TestStatus.from_string("invalid")
 
 
 class TestTestResult:
-    """Tests for TestResult dataclass."""
+    """Tests for the TestResult model."""
 
     def test_tms_jira_format(self, sample_test_result):
         assert sample_test_result.tms_jira_format == "TMS-12345"
@@ -81,6 +96,152 @@ class TestTestResult:
         assert result.execution_log is None
 
 
+class TestCompactTestResult:
+    """Tests for TestResult's slotted, string-sharing representation."""
+
+    def _result(self, **kwargs):
+        fields = dict(tms_number="TMS_1", test_name="test_a", test_id="mod.py::test_a", status=TestStatus.FAILED)
+        fields.update(kwargs)
+        return TestResult(**fields)
+
+    def test_has_no_instance_dict(self):
+        result = self._result()
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.unknown_field = 1
+
+    def test_shares_identifier_strings(self):
+        # Built at runtime so they start out as separate objects
+        first = self._result(test_id="".join(["mod.py::", "test_a"]), duration="".join(["00:", "01"]))
+        second = self._result(test_id="".join(["mod.py::", "test_a"]), duration="".join(["00:", "01"]))
+        assert first.test_id is second.test_id
+        assert first.duration is second.duration
+
+    def test_shares_failure_reasons(self):
+        reasons = ReasonTable()
+        first = reasons.share("".join(["Assertion", "Error"]))
+        second = reasons.share("".join(["Assertion", "Error"]))
+        assert first is second
+
+    def test_reason_table_is_bounded(self, monkeypatch):
+        monkeypatch.setattr("reportminer.models.MAX_SHARED_REASONS", 1)
+        reasons = ReasonTable()
+        reasons.share("first reason")
+        first = reasons.share("".join(["unique ", "reason"]))
+        second = reasons.share("".join(["unique ", "reason"]))
+        assert first == second
+        assert first is not second
+
+    def test_reason_tables_are_independent(self):
+        first = ReasonTable().share("".join(["Assertion", "Error"]))
+        second = ReasonTable().share("".join(["Assertion", "Error"]))
+        assert first is not second
+
+    def test_keeps_non_string_values(self):
+        result = self._result(duration=1.25, timestamp=None)
+        assert result.duration == 1.25
+        assert result.timestamp is None
+
+    def test_equality_and_repr(self):
+        result = self._result(duration="1s")
+        assert result == self._result(duration="1s")
+        assert result != self._result(duration="2s")
+        assert repr(result).startswith("TestResult(tms_number='TMS_1', test_name='test_a'")
+        assert "execution_log=None" in repr(result)
+
+    def test_dataclass_api(self):
+        result = self._result(failure_reason="boom", duration="1s")
+        assert [field.name for field in dataclasses.fields(result)] == list(TestResult.FIELDS)
+        assert dataclasses.asdict(result)["failure_reason"] == "boom"
+        assert dataclasses.replace(result, duration="2s") == self._result(failure_reason="boom", duration="2s")
+
+    def test_fields_keep_their_defaults(self):
+        defaults = {field.name: field.default for field in dataclasses.fields(TestResult)}
+        assert defaults["failure_reason"] is None
+        assert defaults["execution_log"] is None
+        assert defaults["tms_number"] is dataclasses.MISSING
+
+    def test_replace_builds_pending_log(self):
+        result = self._result()
+        result.defer_execution_log(partial(str, "log text"))
+        assert dataclasses.replace(result, duration="2s").execution_log == "log text"
+
+    def test_pickle_keeps_pending_loader(self):
+        result = self._result(failure_reason="boom")
+        result.defer_execution_log(partial(str, "log text"))
+        restored = pickle.loads(pickle.dumps(result))
+        assert restored.log_loader is not None
+        assert restored.test_id is result.test_id
+        assert restored == result
+        assert restored.execution_log == "log text"
+
+    def test_reason_key_is_computed_once(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr("reportminer.models.reason_key", lambda reason: calls.append(reason) or "key")
+        result = self._result(failure_reason="Expected 200 but got 500")
+        assert result.reason_key == "key"
+        assert result.reason_key == "key"
+        assert calls == ["Expected 200 but got 500"]
+
+    def test_reason_key_follows_failure_reason(self):
+        result = self._result(failure_reason="Expected 200 but got 500")
+        assert result.reason_key == "Expected <n> but got <n>"
+        result.failure_reason = None
+        assert result.reason_key == "No failure reason"
+
+    def test_reason_key_is_not_a_field(self):
+        result = self._result(failure_reason="boom 1")
+        result.reason_key
+        assert result == self._result(failure_reason="boom 1")
+        assert "reason_key" not in repr(result)
+        assert pickle.loads(pickle.dumps(result))._reason_key is None
+
+
+class TestLazyExecutionLog:
+    """Tests for deferred execution log building."""
+
+    def _result(self):
+        return TestResult(
+            tms_number="TMS_1",
+            test_name="test",
+            test_id="test",
+            status=TestStatus.FAILED,
+        )
+
+    def test_loader_runs_once_on_first_access(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return "log text"
+
+        result = self._result()
+        result.defer_execution_log(loader)
+        assert calls == []
+        assert result.execution_log == "log text"
+        assert result.execution_log == "log text"
+        assert calls == [1]
+        assert result.log_loader is None
+
+    def test_assignment_replaces_pending_loader(self):
+        result = self._result()
+        result.defer_execution_log(lambda: "from loader")
+        result.execution_log = "assigned"
+        assert result.execution_log == "assigned"
+        assert result.log_loader is None
+
+    def test_constructor_value(self):
+        result = TestResult(
+            tms_number="TMS_1",
+            test_name="test",
+            test_id="test",
+            status=TestStatus.FAILED,
+            execution_log="given",
+        )
+        assert result.execution_log == "given"
+        assert result.log_loader is None
+
+
 class TestJiraIssueData:
     """Tests for JiraIssueData dataclass."""
 
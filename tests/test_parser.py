@@ -1,19 +1,37 @@
 """Tests for HTML report parsing."""
 
+import gc
+import gzip
+import html
+import json
+import lzma
+import tarfile
+import types
+from datetime import datetime
+import zipfile
+
 import pytest
 from pathlib import Path
+from bs4 import BeautifulSoup
 
 from reportminer.parser import (
     parse_reports,
     parse_report,
     collect_html_files,
     extract_json_data,
+    read_json_data,
+    scan_json_blob,
     parse_tms_from_row,
     parse_test_name_from_id,
     parse_failure_reason,
     extract_execution_log,
+    html_fragment_text,
+    iter_pre_texts,
+    parse_test_result,
+    read_report_time,
 )
 from reportminer.models import TestStatus
+from reportminer.sources import ArchiveMember
 
 
 class TestParseTmsFromRow:
@@ -69,6 +87,51 @@ class TestParseFailureReason:
         assert "Bold" in result and "error" in result
 
 
+FRAGMENTS = [
+    "<td>Error message</td>",
+    "<td></td>",
+    "<td><b>Bold</b> error</td>",
+    "<td>AssertionError: Expected [200] but got [500]</td>",
+    "<td>  spaced   text  </td>",
+    "<td>x &lt; y &amp; z&nbsp;w &#60;tag&#62;</td>",
+    "<td>a<!-- comment -->b</td>",
+    "<td>a < b</td>",
+    '<td><a title="x>y">link</a></td>',
+    "<td><script>var a = 1 < 2;</script>shown</td>",
+    "<td><STYLE>p {}</STYLE>styled</td>",
+    "<div class='log'><pre>line one\nline two</pre><pre>second &lt;block&gt;</pre></div>",
+    '<td><PRE class="x">upper case block</PRE></td>',
+    "<td><pre>unclosed block",
+]
+
+
+class TestHtmlFragmentText:
+    """Parity tests for the soup-free cell text extractor."""
+
+    @pytest.mark.parametrize("fragment", FRAGMENTS)
+    def test_matches_beautifulsoup_stripped_text(self, fragment):
+        expected = BeautifulSoup(fragment, "html.parser").get_text(strip=True)
+        assert html_fragment_text(fragment, strip=True) == expected
+
+    @pytest.mark.parametrize("fragment", FRAGMENTS)
+    def test_matches_beautifulsoup_pre_blocks(self, fragment):
+        soup = BeautifulSoup(fragment, "html.parser")
+        assert list(iter_pre_texts(fragment)) == [pre.get_text() for pre in soup.find_all("pre")]
+
+    @pytest.mark.parametrize("fixture_name", [
+        "sample_html_report",
+        "sample_html_report_with_logs",
+        "second_html_report",
+    ])
+    def test_matches_beautifulsoup_on_fixtures(self, fixture_name, request):
+        html_content = request.getfixturevalue(fixture_name).read_text()
+        for test_runs in extract_json_data(html_content)["tests"].values():
+            for test_data in test_runs:
+                reason_cell = test_data["resultsTableRow"][3]
+                expected = BeautifulSoup(reason_cell, "html.parser").get_text(strip=True) or None
+                assert parse_failure_reason(test_data["resultsTableRow"]) == expected
+
+
 class TestExtractExecutionLog:
     """Tests for execution log extraction."""
 
@@ -89,6 +152,14 @@ class TestExtractExecutionLog:
         assert "STDOUT" in result
         assert "stdout output" in result
 
+    def test_extracts_pre_blocks_from_row(self):
+        row = ["<td>TMS_1</td>", "<td class='log'><pre>INFO first &lt;line&gt;\r\nDEBUG second</pre></td>"]
+        result = extract_execution_log({}, row)
+        assert result == "INFO first <line>\nDEBUG second"
+
+    def test_skips_tiny_pre_blocks(self):
+        assert extract_execution_log({}, ["<td><pre>tiny</pre></td>"]) is None
+
     def test_returns_none_when_no_logs(self):
         result = extract_execution_log({}, [])
         assert result is None
@@ -108,6 +179,107 @@ class TestExtractJsonData:
             extract_json_data(html)
 
 
+GENERATED_LINE = (
+    '<p>Report generated on 16-Jan-2024 at 09:05:30 by '
+    '<a href="https://pypi.python.org/pypi/pytest-html">pytest-html</a> v4.1.1</p>'
+)
+
+
+class TestReadReportTime:
+    """Tests for reading when a report was generated."""
+
+    def test_reads_generated_line(self, tmp_path):
+        report = tmp_path / "report.html"
+        report.write_text(f"<html><body><h1>report.html</h1>{GENERATED_LINE}</body></html>")
+        assert read_report_time(report) == datetime(2024, 1, 16, 9, 5, 30)
+
+    def test_line_split_across_chunks(self, tmp_path, monkeypatch):
+        report = tmp_path / "report.html.gz"
+        report.write_bytes(gzip.compress(f"<html><body>{GENERATED_LINE}</body></html>".encode()))
+        monkeypatch.setattr("reportminer.parser.STREAM_CHUNK_SIZE", 7)
+        assert read_report_time(report) == datetime(2024, 1, 16, 9, 5, 30)
+
+    def test_missing_line(self, sample_html_report):
+        assert read_report_time(sample_html_report) is None
+
+    def test_unreadable_date(self, tmp_path):
+        report = tmp_path / "report.html"
+        report.write_text("<p>Report generated on 31-Foo-2024 at 09:05:30 by pytest-html</p>")
+        assert read_report_time(report) is None
+
+
+def _soup_json_blob(html_content):
+    """Reference lookup using a full BeautifulSoup parse."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    container = soup.find(id="data-container") or soup.find(attrs={"data-jsonblob": True})
+    return container.get("data-jsonblob") if container else None
+
+
+class TestScanJsonBlob:
+    """Parity tests for the fast data container scan."""
+
+    @pytest.mark.parametrize("fixture_name", [
+        "sample_html_report",
+        "sample_html_report_with_logs",
+        "second_html_report",
+    ])
+    def test_matches_beautifulsoup_on_fixtures(self, fixture_name, request):
+        html_content = request.getfixturevalue(fixture_name).read_text()
+        assert scan_json_blob(html_content) == _soup_json_blob(html_content)
+
+    @pytest.mark.parametrize("html_content", [
+        # pytest-html style: double quotes with escaped entities
+        '<div id="data-container" data-jsonblob="{&#34;tests&#34;: {&#34;a&#34;: &#34;&lt;td&gt;&amp;&#34;}}"></div>',
+        # Attribute order reversed, raw markup inside single quotes
+        """<div data-jsonblob='{"tests": {"a": "<td>x</td>"}}' id="data-container"></div>""",
+        # No id, found by attribute only
+        """<p>intro</p><span class="x" data-jsonblob='{"tests": {}}'></span>""",
+        # Unquoted attribute value
+        '<div id=data-container data-jsonblob={}></div>',
+    ])
+    def test_matches_beautifulsoup_on_markup_variants(self, html_content):
+        assert scan_json_blob(html_content) == _soup_json_blob(html_content)
+
+    @pytest.mark.parametrize("html_content", [
+        '<div id="data-container" data-jsonblob="{&#34;tests&#34;: {&#34;\u00e9\u2713&#34;: 1}}"></div>',
+        """<div data-jsonblob='{"tests": {"a": "<td>x</td>"}}' id="data-container"></div>""",
+        '<div id=data-container data-jsonblob={}></div>',
+    ])
+    def test_bytes_scan_matches_text_scan(self, html_content):
+        assert scan_json_blob(html_content.encode("utf-8")) == scan_json_blob(html_content)
+
+    def test_read_json_data_from_file(self, sample_html_report):
+        assert read_json_data(sample_html_report) == extract_json_data(sample_html_report.read_text())
+
+    def test_read_json_data_empty_file(self, tmp_path):
+        empty = tmp_path / "empty.html"
+        empty.write_text("")
+        with pytest.raises(ValueError, match="Could not find data container"):
+            read_json_data(empty)
+
+    def test_returns_none_without_container(self):
+        assert scan_json_blob("<html><body></body></html>") is None
+
+    def test_returns_none_for_container_without_blob(self):
+        html_content = '<div id="data-container"></div><div data-jsonblob="{}"></div>'
+        assert scan_json_blob(html_content) is None
+
+    def test_extract_falls_back_for_uppercase_markup(self):
+        html_content = """<DIV ID="data-container" DATA-JSONBLOB='{"tests": {}}'></DIV>"""
+        assert scan_json_blob(html_content) is None
+        assert extract_json_data(html_content) == {"tests": {}}
+
+    def test_extract_falls_back_to_full_parse(self):
+        html_content = '<div id="data-container"></div>'
+        with pytest.raises(ValueError, match="Could not find JSON data blob"):
+            extract_json_data(html_content)
+
+    def test_extract_decodes_escaped_blob(self):
+        blob = html.escape(json.dumps({"tests": {"t": [{"result": "passed"}]}}))
+        data = extract_json_data(f'<div id="data-container" data-jsonblob="{blob}"></div>')
+        assert data["tests"]["t"][0]["result"] == "passed"
+
+
 class TestParseReport:
     """Tests for single report parsing."""
 
@@ -139,6 +311,317 @@ class TestParseReport:
         assert results[0].execution_log is not None
         assert "kafka-consumer" in results[0].execution_log
 
+    def test_defers_execution_log_extraction(self, sample_html_report_with_logs, monkeypatch):
+        calls = []
+        original = extract_execution_log
+
+        def counting_extract(test_data, row_cells):
+            calls.append(1)
+            return original(test_data, row_cells)
+
+        monkeypatch.setattr("reportminer.parser.extract_execution_log", counting_extract)
+        results = list(parse_report(sample_html_report_with_logs))
+        assert calls == []
+        assert "kafka-consumer" in results[0].execution_log
+        assert calls == [1]
+
+    def test_shares_repeated_failure_reasons(self, tmp_path):
+        row = ["<td>TMS_1</td>", "<td>Failed</td>", "<td>1s</td>", "<td>AssertionError: boom</td>"]
+        tests = {f"tests/test_a.py::test_{i}": [{"result": "Failed", "resultsTableRow": row}] for i in range(2)}
+        report = tmp_path / "report.html"
+        report.write_text(f"<div id=\"data-container\" data-jsonblob='{json.dumps({'tests': tests})}'></div>")
+        first, second = parse_report(report)
+        assert first.failure_reason == "AssertionError: boom"
+        assert first.failure_reason is second.failure_reason
+
+    def test_log_loader_keeps_only_log_fragments(self):
+        test_data = {
+            "result": "failed",
+            "log": "INFO worker started",
+            "extras": [
+                {"name": "stdout", "content": "printed output", "format_type": "text"},
+                {"name": "screenshot", "content": "aGVsbG8=", "format_type": "image"},
+            ],
+            "resultsTableRow": [
+                "<td>TMS_1</td>",
+                "<td>Failed</td>",
+                "<td class='log'><pre>DEBUG first line of the log</pre></td>",
+            ],
+        }
+        result = parse_test_result("tests/test_a.py::test_one", test_data)
+
+        log_data, log_cells = result.log_loader.args
+        assert log_data == {
+            "extras": [{"name": "stdout", "content": "printed output"}],
+            "log": "INFO worker started",
+        }
+        assert log_cells == [test_data["resultsTableRow"][2]]
+        assert result.execution_log == extract_execution_log(test_data, test_data["resultsTableRow"])
+
+    def test_no_log_loader_without_logs(self, sample_html_report):
+        results = list(parse_report(sample_html_report))
+        assert all(r.log_loader is None and r.execution_log is None for r in results)
+
+
+def _keep_login(test_name):
+    """Module-level name filter, picklable for parallel parsing."""
+    return "login" in test_name
+
+
+class TestParseFilters:
+    """Tests for filters applied while parsing."""
+
+    def test_status_filter(self, sample_html_report):
+        results = list(parse_report(sample_html_report, statuses={TestStatus.FAILED}))
+        assert {r.tms_number for r in results} == {"TMS_67890", "TMS_11111"}
+
+    def test_status_filter_skips_row_scanning(self, sample_html_report, monkeypatch):
+        scanned = []
+
+        def counting_parse_tms(row_html):
+            scanned.append(row_html)
+            return None
+
+        monkeypatch.setattr("reportminer.parser.parse_tms_from_row", counting_parse_tms)
+        list(parse_report(sample_html_report, statuses={TestStatus.ERROR}))
+        assert scanned == []
+
+    def test_detail_statuses_keep_other_tests_bare(self, sample_html_report_with_logs):
+        [full] = parse_report(sample_html_report_with_logs)
+        assert full.execution_log
+        [bare] = parse_report(sample_html_report_with_logs, detail_statuses={TestStatus.FAILED})
+        assert (bare.tms_number, bare.status) == (full.tms_number, full.status)
+        assert bare.execution_log is None
+
+    def test_detail_statuses_skip_reason_extraction(self, sample_html_report, monkeypatch):
+        extracted = []
+
+        def counting_parse_reason(row):
+            extracted.append(row)
+            return None
+
+        monkeypatch.setattr("reportminer.parser.parse_failure_reason", counting_parse_reason)
+        results = list(parse_report(sample_html_report, detail_statuses={TestStatus.PASSED}))
+        assert len(results) == 3
+        assert len(extracted) == 1
+
+    def test_tms_filter(self, sample_html_report):
+        results = list(parse_report(sample_html_report, tms_filter=lambda tms: tms == "TMS_11111"))
+        assert [r.tms_number for r in results] == ["TMS_11111"]
+
+    def test_name_filter(self, sample_html_report):
+        results = list(parse_report(sample_html_report, name_filter=_keep_login))
+        assert [r.tms_number for r in results] == ["TMS_12345"]
+
+    def test_filters_in_parallel(self, sample_html_report, second_html_report):
+        results = parse_reports(
+            [sample_html_report, second_html_report],
+            jobs=2,
+            statuses={TestStatus.PASSED},
+            name_filter=_keep_login,
+        )
+        assert [r.tms_number for r in results] == ["TMS_12345", "TMS_12345"]
+
+    def test_filtered_run_uses_unfiltered_cache_entry(self, sample_html_report, monkeypatch):
+        parse_reports([sample_html_report], use_cache=True)
+
+        def fail(*args):
+            raise AssertionError("report should have been loaded from cache")
+
+        monkeypatch.setattr("reportminer.parser.parse_report", fail)
+        results = parse_reports([sample_html_report], use_cache=True, statuses={TestStatus.PASSED})
+        assert [r.tms_number for r in results] == ["TMS_12345"]
+
+
+    def test_detail_run_uses_unfiltered_cache_entry(self, sample_html_report, monkeypatch):
+        full = parse_reports([sample_html_report], use_cache=True)
+
+        def fail(*args):
+            raise AssertionError("report should have been loaded from cache")
+
+        monkeypatch.setattr("reportminer.parser.parse_report", fail)
+        assert parse_reports([sample_html_report], use_cache=True, detail_statuses={TestStatus.PASSED}) == full
+
+    def test_detail_entry_is_not_served_unfiltered(self, sample_html_report):
+        parse_reports([sample_html_report], use_cache=True, detail_statuses={TestStatus.PASSED})
+        results = parse_reports([sample_html_report], use_cache=True)
+        assert all(r.failure_reason for r in results if r.status == TestStatus.FAILED)
+
+def _reachable(root) -> list:
+    """Objects reachable from root, not following into code or modules."""
+    stop = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)
+    seen = {id(root)}
+    found = []
+    pending = [root]
+    while pending:
+        for obj in gc.get_referents(pending.pop()):
+            if id(obj) in seen or isinstance(obj, stop):
+                continue
+            seen.add(id(obj))
+            found.append(obj)
+            pending.append(obj)
+    return found
+
+
+class TestLowMemoryParsing:
+    """Tests for streaming the JSON blob from disk."""
+
+    def test_results_do_not_retain_raw_entries(self, tmp_path):
+        """Only extracted fields and log fragments outlive parsing."""
+        tests = {
+            f"tests/test_a.py::test_TMS_{i}_case": [{
+                "result": "Failed",
+                "log": f"INFO step {i}",
+                "extras": [{"name": "screenshot", "content": "aGVsbG8=" * 100}],
+                "resultsTableRow": [
+                    f"<td>TMS_{i}</td>",
+                    "<td>Failed</td>",
+                    "<td>AssertionError: boom</td>",
+                    f"<td><pre>DEBUG a longer log line {i}</pre></td>",
+                ],
+            }]
+            for i in range(50)
+        }
+        report = tmp_path / "report.html"
+        report.write_text(
+            f"<div id=\"data-container\" data-jsonblob='{html.escape(json.dumps({'tests': tests}))}'></div>"
+        )
+
+        results = list(parse_report(report, low_memory=True))
+
+        assert len(results) == 50
+        retained = _reachable(results)
+        assert not any(isinstance(obj, dict) and "resultsTableRow" in obj for obj in retained)
+        assert not any(isinstance(obj, str) and obj.startswith("aGVsbG8=") for obj in retained)
+        assert not any(isinstance(obj, str) and obj == "<td>Failed</td>" for obj in retained)
+        assert results[0].execution_log == "=== LOG ===\n\nINFO step 0\n\nDEBUG a longer log line 0"
+
+    @pytest.mark.parametrize("fixture_name", [
+        "sample_html_report",
+        "sample_html_report_with_logs",
+        "second_html_report",
+    ])
+    def test_matches_full_parse(self, fixture_name, request, monkeypatch):
+        report = request.getfixturevalue(fixture_name)
+        expected = list(parse_report(report))
+        # Tiny chunks so markers, entities and values straddle chunk boundaries
+        monkeypatch.setattr("reportminer.parser.STREAM_CHUNK_SIZE", 5)
+        assert list(parse_report(report, low_memory=True)) == expected
+
+    def test_decodes_escaped_blob_across_chunks(self, tmp_path, monkeypatch):
+        data = {"tests": {"tests/t.py::test_TMS_1_x": [{
+            "result": "Failed",
+            "resultsTableRow": ["<td>TMS_1</td>", "", "", "<td>a &amp; b \"quoted\"</td>"],
+        }]}}
+        report = tmp_path / "escaped.html"
+        report.write_text(f'<div id="data-container" data-jsonblob="{html.escape(json.dumps(data))}"></div>')
+        monkeypatch.setattr("reportminer.parser.STREAM_CHUNK_SIZE", 3)
+        results = list(parse_report(report, low_memory=True))
+        assert results[0].failure_reason == 'a & b "quoted"'
+
+    def test_falls_back_without_streamable_blob(self, tmp_path):
+        report = tmp_path / "upper.html"
+        report.write_text("""<DIV ID="data-container" DATA-JSONBLOB='{"tests": {}}'></DIV>""")
+        assert list(parse_report(report, low_memory=True)) == []
+
+    def test_raises_for_missing_container(self, tmp_path):
+        report = tmp_path / "empty.html"
+        report.write_text("<html><body></body></html>")
+        with pytest.raises(ValueError, match="Could not find data container"):
+            list(parse_report(report, low_memory=True))
+
+    def test_parse_reports_low_memory(self, sample_html_report, second_html_report):
+        files = [sample_html_report, second_html_report]
+        assert parse_reports(files, jobs=2, low_memory=True) == parse_reports(files, jobs=1)
+
+
+class TestCompressedReports:
+    """Tests for parsing compressed reports."""
+
+    @pytest.mark.parametrize("suffix, compress", [
+        (".html.gz", gzip.compress),
+        (".html.xz", lzma.compress),
+    ])
+    @pytest.mark.parametrize("low_memory", [False, True])
+    def test_matches_plain_report(self, sample_html_report, tmp_path, suffix, compress, low_memory):
+        compressed = tmp_path / f"compressed{suffix}"
+        compressed.write_bytes(compress(sample_html_report.read_bytes()))
+        expected = list(parse_report(sample_html_report))
+        assert list(parse_report(compressed, low_memory=low_memory)) == expected
+
+    def test_zstd_report(self, sample_html_report, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        compressed = tmp_path / "compressed.html.zst"
+        compressed.write_bytes(zstandard.ZstdCompressor().compress(sample_html_report.read_bytes()))
+        assert list(parse_report(compressed)) == list(parse_report(sample_html_report))
+
+    def test_falls_back_to_full_parse(self, tmp_path):
+        compressed = tmp_path / "upper.html.gz"
+        compressed.write_bytes(gzip.compress(b"""<DIV ID="data-container" DATA-JSONBLOB='{"tests": {}}'></DIV>"""))
+        assert list(parse_report(compressed)) == []
+
+    def test_missing_container(self, tmp_path):
+        compressed = tmp_path / "empty.html.gz"
+        compressed.write_bytes(gzip.compress(b"<html></html>"))
+        with pytest.raises(ValueError, match="Could not find data container"):
+            list(parse_report(compressed))
+
+
+class TestArchiveReports:
+    """Tests for parsing reports inside zip and tar archives."""
+
+    @pytest.fixture
+    def artifacts_zip(self, sample_html_report, second_html_report, tmp_path):
+        archive = tmp_path / "artifacts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.write(sample_html_report, "shard1/report.html")
+            zf.writestr("shard2/report.html.gz", gzip.compress(second_html_report.read_bytes()))
+            zf.writestr("shard2/coverage.xml", "<coverage/>")
+        return archive
+
+    @pytest.mark.parametrize("low_memory", [False, True])
+    def test_matches_plain_reports(self, artifacts_zip, sample_html_report, second_html_report, low_memory):
+        members = collect_html_files([str(artifacts_zip)])
+        expected = parse_reports([sample_html_report, second_html_report])
+        assert parse_reports(members, jobs=1, low_memory=low_memory) == expected
+
+    def test_parses_members_in_parallel(self, artifacts_zip):
+        members = collect_html_files([str(artifacts_zip)])
+        assert parse_reports(members, jobs=2) == parse_reports(members, jobs=1)
+
+    def test_tar_archive(self, sample_html_report, tmp_path):
+        archive = tmp_path / "artifacts.tar.gz"
+        with tarfile.open(archive, "w:gz") as tf:
+            tf.add(sample_html_report, "report.html")
+        members = collect_html_files([str(archive)])
+        assert parse_reports(members) == parse_reports([sample_html_report])
+
+    def test_parses_tar_members_in_parallel(self, sample_html_report, second_html_report, tmp_path):
+        archive = tmp_path / "artifacts.tar.gz"
+        with tarfile.open(archive, "w:gz") as tf:
+            for shard in range(16):
+                report = sample_html_report if shard % 2 else second_html_report
+                tf.add(report, f"shard{shard:02d}/report.html")
+        members = collect_html_files([str(archive)])
+        assert parse_reports(members, jobs=4) == parse_reports(members, jobs=1)
+
+    def test_caches_members(self, artifacts_zip, monkeypatch):
+        members = collect_html_files([str(artifacts_zip)])
+        first = parse_reports(members, use_cache=True)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("should be served from cache")
+
+        monkeypatch.setattr("reportminer.parser.parse_report", fail)
+        assert parse_reports(members, use_cache=True, jobs=1) == first
+
+    def test_failure_names_member(self, tmp_path):
+        archive = tmp_path / "artifacts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("broken/report.html", "<html></html>")
+        with pytest.raises(RuntimeError, match="artifacts.zip!/broken/report.html"):
+            parse_reports(collect_html_files([str(archive)]))
+
 
 class TestParseReports:
     """Tests for multiple report parsing."""
@@ -156,6 +639,41 @@ class TestParseReports:
         parse_reports([sample_html_report], progress_callback=callback)
         assert len(callback_calls) >= 1
 
+    def test_parallel_keeps_file_order(self, sample_html_report, second_html_report):
+        files = [second_html_report, sample_html_report, second_html_report]
+        sequential = parse_reports(files, jobs=1)
+        parallel = parse_reports(files, jobs=3)
+        assert [r.test_id for r in parallel] == [r.test_id for r in sequential]
+        assert [r.timestamp for r in parallel] == [r.timestamp for r in sequential]
+
+    def test_parallel_reports_progress_in_order(self, sample_html_report, second_html_report):
+        callback_calls = []
+
+        def callback(current, total, name):
+            callback_calls.append((current, total, name))
+
+        parse_reports([sample_html_report, second_html_report], progress_callback=callback, jobs=2)
+        assert callback_calls == [
+            (0, 2, sample_html_report.name),
+            (1, 2, second_html_report.name),
+            (2, 2, "complete"),
+        ]
+
+    def test_uses_parse_cache(self, sample_html_report, monkeypatch):
+        first = parse_reports([sample_html_report], use_cache=True)
+
+        def fail(*args):
+            raise AssertionError("report should have been loaded from cache")
+
+        monkeypatch.setattr("reportminer.parser.parse_report", fail)
+        assert parse_reports([sample_html_report], use_cache=True) == first
+
+    def test_parallel_wraps_failures(self, sample_html_report, tmp_path):
+        broken = tmp_path / "broken.html"
+        broken.write_text("<html><body>No data container</body></html>")
+        with pytest.raises(RuntimeError, match="Failed to parse .*broken.html"):
+            parse_reports([sample_html_report, broken], jobs=2)
+
 
 class TestCollectHtmlFiles:
     """Tests for HTML file collection."""
@@ -171,6 +689,30 @@ class TestCollectHtmlFiles:
         files = collect_html_files([str(tmp_path)])
         assert len(files) >= 1
 
+    def test_collects_compressed_files(self, tmp_path, sample_html_report):
+        (tmp_path / "shard1.html.gz").write_bytes(gzip.compress(b"<html></html>"))
+        (tmp_path / "shard2.html.xz").write_bytes(lzma.compress(b"<html></html>"))
+        (tmp_path / "notes.gz").write_bytes(gzip.compress(b"notes"))
+        names = {path.name for path in collect_html_files([str(tmp_path)])}
+        assert names == {sample_html_report.name, "shard1.html.gz", "shard2.html.xz"}
+
+    def test_collects_single_compressed_file(self, tmp_path):
+        report = tmp_path / "report.html.gz"
+        report.write_bytes(gzip.compress(b"<html></html>"))
+        assert collect_html_files([str(report)]) == [report]
+
+    def test_collects_archive_members(self, tmp_path, sample_html_report):
+        archive = tmp_path / "artifacts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("b/report.html", "<html></html>")
+            zf.writestr("a/report.html.gz", gzip.compress(b"<html></html>"))
+        files = collect_html_files([str(archive), str(sample_html_report)])
+        assert files == [
+            ArchiveMember(archive, "a/report.html.gz"),
+            ArchiveMember(archive, "b/report.html"),
+            sample_html_report,
+        ]
+
     def test_raises_for_non_html_file(self, tmp_path):
         txt_file = tmp_path / "test.txt"
         txt_file.write_text("not html")
@@ -0,0 +1,156 @@
+"""Tests for failure signatures."""
+
+import random
+
+import pytest
+
+from reportminer.signatures import (
+    MAX_KEY_LENGTH,
+    MAX_SIGNATURE_LENGTH,
+    NO_REASON,
+    TOKEN_PATTERN,
+    cluster_signatures,
+    failure_signature,
+    reason_key,
+)
+
+
+class TestFailureSignature:
+    """Tests for masking run-specific details out of failure reasons."""
+
+    @pytest.mark.parametrize("reason", [None, "", "   \n  "])
+    def test_blank_reason_has_no_signature(self, reason):
+        assert failure_signature(reason) is None
+
+    def test_masks_numbers(self):
+        assert failure_signature("Expected 200 but got 500") == "Expected <n> but got <n>"
+
+    def test_masks_timestamps(self):
+        assert failure_signature("Timed out at 2024-01-15T10:32:01.123Z") == "Timed out at <time>"
+
+    def test_masks_uuids(self):
+        reason = "Order 3f2b8c1e-9d4a-4b6e-8f1a-2c3d4e5f6a7b not found"
+        assert failure_signature(reason) == "Order <uuid> not found"
+
+    def test_masks_hex_ids(self):
+        assert failure_signature("object at 0x7f3a2b1c") == "object at <hex>"
+        assert failure_signature("commit deadbeef1234abcd") == "commit <hex>"
+
+    @pytest.mark.parametrize("reason, expected", [
+        ("FileNotFoundError: /tmp/run-12/out.log missing", "FileNotFoundError: <path> missing"),
+        ("failed in tests/api/test_login.py:42", "failed in <path>:<n>"),
+        ("cannot open C:\\build\\out\\app.dll", "cannot open <path>"),
+        ("see ./logs/a.txt and ~/b.txt", "see <path> and <path>"),
+    ])
+    def test_masks_paths(self, reason, expected):
+        assert failure_signature(reason) == expected
+
+    def test_keeps_single_slash_words(self):
+        assert failure_signature("Unexpected text/html response") == "Unexpected text/html response"
+
+    def test_masks_ip_addresses(self):
+        assert failure_signature("connect to 10.0.0.12:8080 refused") == "connect to <ip> refused"
+
+    def test_keeps_words_that_look_like_hex(self):
+        assert failure_signature("deadbeefcafe failed") == "deadbeefcafe failed"
+
+    def test_keeps_first_line_only(self):
+        reason = "AssertionError: bad value\nTraceback (most recent call last):\n  line 12"
+        assert failure_signature(reason) == "AssertionError: bad value"
+
+    def test_collapses_whitespace(self):
+        assert failure_signature("  Error:   too\tmany   spaces ") == "Error: too many spaces"
+
+    def test_repeats_of_one_failure_match(self):
+        first = failure_signature("TimeoutError: waited 30.5s for device 17")
+        second = failure_signature("TimeoutError: waited 31.2s for device 4")
+        assert first == second
+
+    def test_truncates_long_reasons(self):
+        assert len(failure_signature("x" * 1000)) == MAX_SIGNATURE_LENGTH
+
+
+class TestReasonKey:
+    """Tests for group keys of failure reasons."""
+
+    @pytest.mark.parametrize("reason", [None, "", "  "])
+    def test_missing_reason(self, reason):
+        assert reason_key(reason) == NO_REASON
+
+    def test_uses_signature(self):
+        assert reason_key("Expected 200 but got 500\ntraceback") == "Expected <n> but got <n>"
+
+    def test_long_keys_are_cut(self):
+        key = reason_key("AssertionError: " + "x" * 200)
+        assert len(key) == MAX_KEY_LENGTH
+        assert key.endswith("...")
+
+
+class TestClusterSignatures:
+    """Tests for merging similar signatures."""
+
+    def test_merges_similar_signatures_into_most_common(self):
+        counts = {
+            "AssertionError: element login_button not visible on page home": 2,
+            "AssertionError: element logout_button not visible on page home": 5,
+        }
+        clusters = cluster_signatures(counts, threshold=0.7)
+        assert set(clusters.values()) == {"AssertionError: element logout_button not visible on page home"}
+
+    def test_keeps_dissimilar_signatures_apart(self):
+        counts = {"AssertionError: login failed": 1, "AssertionError: cart total mismatch": 1}
+        clusters = cluster_signatures(counts, threshold=0.7)
+        assert clusters == {signature: signature for signature in counts}
+
+    def test_only_merges_same_exception_type(self):
+        counts = {
+            "TimeoutError: element login not visible on page home": 1,
+            "AssertionError: element login not visible on page home": 1,
+        }
+        assert len(set(cluster_signatures(counts, threshold=0.5).values())) == 2
+
+    def test_threshold_one_merges_only_same_tokens(self):
+        counts = {"Error: a b c": 1, "Error: c b a": 1, "Error: a b d": 1}
+        clusters = cluster_signatures(counts, threshold=1.0)
+        assert clusters["Error: c b a"] == "Error: a b c"
+        assert clusters["Error: a b d"] == "Error: a b d"
+
+    def test_uses_configured_threshold(self, monkeypatch):
+        counts = {"Error: a b c d": 1, "Error: a b c e": 1}
+        monkeypatch.setattr("reportminer.config.CLUSTER_THRESHOLD", 0.5)
+        assert len(set(cluster_signatures(counts).values())) == 1
+        monkeypatch.setattr("reportminer.config.CLUSTER_THRESHOLD", 0.9)
+        assert len(set(cluster_signatures(counts).values())) == 2
+
+    def test_signature_without_tokens(self):
+        assert cluster_signatures({"...": 1}) == {"...": "..."}
+
+    def test_matches_pairwise_clustering(self):
+        rng = random.Random(1)
+        words = ["alpha", "beta", "gamma", "delta", "eps", "zeta", "eta", "theta"]
+        counts = {
+            f"{rng.choice(['AssertionError', 'KeyError'])}: {' '.join(rng.sample(words, rng.randint(2, 6)))}": rng.randint(1, 9)
+            for _ in range(200)
+        }
+        assert cluster_signatures(counts, threshold=0.6) == pairwise_clusters(counts, threshold=0.6)
+
+
+def pairwise_clusters(counts, threshold):
+    """Reference: compare each signature with every earlier cluster."""
+    leaders = []
+    clusters = {}
+    for signature in sorted(counts, key=lambda s: (-counts[s], s)):
+        tokens = TOKEN_PATTERN.findall(signature)
+        best, best_score = None, threshold
+        for leader, leader_tokens in leaders:
+            if leader_tokens[0] != tokens[0]:
+                continue
+            a, b = set(tokens), set(leader_tokens)
+            score = len(a & b) / len(a | b)
+            if score > best_score or (best is None and score >= best_score):
+                best, best_score = leader, score
+        if best is None:
+            best = signature
+            leaders.append((signature, tokens))
+        clusters[signature] = best
+    return clusters
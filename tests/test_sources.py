@@ -0,0 +1,219 @@
+"""Tests for opening plain, compressed and archived reports."""
+
+import gzip
+import io
+import lzma
+import tarfile
+import zipfile
+
+import pytest
+
+from reportminer.sources import (
+    ArchiveMember,
+    is_archive,
+    is_compressed,
+    list_archive_reports,
+    open_report_bytes,
+    open_report_text,
+    read_report_text,
+    report_suffix,
+)
+
+
+CONTENT = "<html><body>résumé ✓</body></html>" * 100
+
+
+def compress_zstd(data):
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+COMPRESSORS = {
+    ".html.gz": gzip.compress,
+    ".html.xz": lzma.compress,
+    ".html.zst": compress_zstd,
+}
+
+
+def write_tar(path, members, mode="w"):
+    with tarfile.open(path, mode) as tf:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+
+class TestReportSuffix:
+    """Tests for report name detection."""
+
+    @pytest.mark.parametrize("name, expected", [
+        ("report.html", ".html"),
+        ("REPORT.HTML", ".html"),
+        ("report.html.gz", ".html.gz"),
+        ("report.html.xz", ".html.xz"),
+        ("report.html.zst", ".html.zst"),
+        ("report.txt", None),
+        ("report.gz", None),
+        ("report.html.bz2", None),
+    ])
+    def test_report_suffix(self, name, expected):
+        assert report_suffix(name) == expected
+
+    def test_is_compressed(self):
+        assert is_compressed("report.html.gz")
+        assert not is_compressed("report.html")
+        assert not is_compressed("report.txt")
+
+
+class TestOpenReportText:
+    """Tests for streaming report text."""
+
+    def test_reads_plain_file(self, tmp_path):
+        path = tmp_path / "report.html"
+        path.write_text(CONTENT, encoding="utf-8")
+        assert read_report_text(path) == CONTENT
+
+    @pytest.mark.parametrize("suffix", COMPRESSORS)
+    def test_reads_compressed_file(self, tmp_path, suffix):
+        path = tmp_path / f"report{suffix}"
+        path.write_bytes(COMPRESSORS[suffix](CONTENT.encode("utf-8")))
+        assert read_report_text(path) == CONTENT
+
+    @pytest.mark.parametrize("suffix", COMPRESSORS)
+    def test_streams_in_chunks(self, tmp_path, suffix):
+        path = tmp_path / f"report{suffix}"
+        path.write_bytes(COMPRESSORS[suffix](CONTENT.encode("utf-8")))
+        with open_report_text(path) as stream:
+            chunks = iter(lambda: stream.read(17), "")
+            assert "".join(chunks) == CONTENT
+
+    @pytest.mark.parametrize("suffix", COMPRESSORS)
+    def test_bytes_are_stored_bytes(self, tmp_path, suffix):
+        path = tmp_path / f"report{suffix}"
+        data = COMPRESSORS[suffix](CONTENT.encode("utf-8"))
+        path.write_bytes(data)
+        with open_report_bytes(path) as stream:
+            assert stream.read() == data
+
+
+class TestArchives:
+    """Tests for reports inside zip and tar archives."""
+
+    @pytest.mark.parametrize("name, expected", [
+        ("artifacts.zip", True),
+        ("artifacts.tar", True),
+        ("artifacts.tar.gz", True),
+        ("ARTIFACTS.TGZ", True),
+        ("artifacts.tar.xz", True),
+        ("report.html.gz", False),
+        ("artifacts.gz", False),
+    ])
+    def test_is_archive(self, name, expected):
+        assert is_archive(name) == expected
+
+    def test_archive_member_acts_like_path(self, tmp_path):
+        archive = tmp_path / "artifacts.zip"
+        archive.write_bytes(b"")
+        member = ArchiveMember(archive, "shard1/report.html.gz")
+        assert member.name == "report.html.gz"
+        assert str(member) == f"{archive}!/shard1/report.html.gz"
+        assert member.stat().st_mtime_ns == archive.stat().st_mtime_ns
+
+    def test_lists_zip_reports(self, tmp_path):
+        archive = tmp_path / "artifacts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("shard1/report.html", CONTENT)
+            zf.writestr("shard2/report.html.gz", gzip.compress(CONTENT.encode("utf-8")))
+            zf.writestr("shard2/junit.xml", "<testsuite/>")
+            zf.writestr("empty/", "")
+
+        assert list_archive_reports(archive) == [
+            ArchiveMember(archive, "shard1/report.html"),
+            ArchiveMember(archive, "shard2/report.html.gz"),
+        ]
+
+    @pytest.mark.parametrize("suffix, mode", [(".tar", "w"), (".tar.gz", "w:gz"), (".tar.xz", "w:xz")])
+    def test_lists_tar_reports(self, tmp_path, suffix, mode):
+        archive = tmp_path / f"artifacts{suffix}"
+        write_tar(archive, {"a/report.html": b"", "a/log.txt": b""}, mode)
+        assert list_archive_reports(archive) == [ArchiveMember(archive, "a/report.html")]
+
+    def test_rejects_non_archive(self, tmp_path):
+        archive = tmp_path / "artifacts.zip"
+        archive.write_bytes(b"not an archive")
+        with pytest.raises(ValueError, match="Not a zip or tar archive"):
+            list_archive_reports(archive)
+
+    def test_reads_zip_members(self, tmp_path):
+        archive = tmp_path / "artifacts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("plain.html", CONTENT)
+            zf.writestr("nested.html.xz", lzma.compress(CONTENT.encode("utf-8")))
+
+        for member in list_archive_reports(archive):
+            assert read_report_text(member) == CONTENT
+
+    @pytest.mark.parametrize("suffix, mode", [(".tar", "w"), (".tar.gz", "w:gz")])
+    def test_reads_tar_members(self, tmp_path, suffix, mode):
+        archive = tmp_path / f"artifacts{suffix}"
+        write_tar(archive, {
+            "plain.html": CONTENT.encode("utf-8"),
+            "nested.html.gz": gzip.compress(CONTENT.encode("utf-8")),
+        }, mode)
+
+        for member in list_archive_reports(archive):
+            assert read_report_text(member) == CONTENT
+
+    def test_reads_tar_members_from_one_open_archive(self, tmp_path, monkeypatch):
+        archive = tmp_path / "artifacts.tar.gz"
+        write_tar(archive, {f"shard{i}/report.html": CONTENT.encode("utf-8") for i in range(20)}, "w:gz")
+        opened = []
+        original_open = tarfile.open
+
+        def counting_open(*args, **kwargs):
+            opened.append(args)
+            return original_open(*args, **kwargs)
+
+        monkeypatch.setattr("reportminer.sources.tarfile.open", counting_open)
+        members = list_archive_reports(archive)
+        assert [read_report_text(member) for member in members] == [CONTENT] * 20
+        assert len(opened) == 1
+
+    def test_forked_worker_opens_its_own_tar(self, tmp_path, monkeypatch):
+        archive = tmp_path / "artifacts.tar.gz"
+        write_tar(archive, {"report.html": CONTENT.encode("utf-8")}, "w:gz")
+        opened = []
+        original_open = tarfile.open
+
+        def recording_open(*args, **kwargs):
+            opened.append(original_open(*args, **kwargs))
+            return opened[-1]
+
+        monkeypatch.setattr("reportminer.sources.tarfile.open", recording_open)
+        [member] = list_archive_reports(archive)
+        monkeypatch.setattr("reportminer.sources.os.getpid", lambda: -1)
+        assert read_report_text(member) == CONTENT
+        assert len(opened) == 2
+        # The parent's archive is neither shared nor closed by the worker
+        assert not opened[0].closed
+
+    def test_rewritten_tar_is_reopened(self, tmp_path):
+        archive = tmp_path / "artifacts.tar"
+        write_tar(archive, {"report.html": b"<html>old</html>"})
+        assert read_report_text(ArchiveMember(archive, "report.html")) == "<html>old</html>"
+
+        write_tar(archive, {"report.html": b"<html>newer</html>"})
+        assert read_report_text(ArchiveMember(archive, "report.html")) == "<html>newer</html>"
+
+    def test_missing_tar_member(self, tmp_path):
+        archive = tmp_path / "artifacts.tar"
+        write_tar(archive, {"report.html": CONTENT.encode("utf-8")})
+        with pytest.raises(KeyError):
+            read_report_text(ArchiveMember(archive, "other.html"))
+
+    def test_missing_member(self, tmp_path):
+        archive = tmp_path / "artifacts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("report.html", CONTENT)
+        with pytest.raises(KeyError):
+            read_report_text(ArchiveMember(archive, "other.html"))
@@ -0,0 +1,180 @@
+"""Tests for the columnar result table."""
+
+import pytest
+
+from reportminer.models import TestResult, TestStatus
+from reportminer.table import ResultTable, result_batches, result_columns
+
+
+def make_result(tms, status=TestStatus.FAILED, reason=None, name=None):
+    name = name or f"test_{tms.lower()}"
+    return TestResult(
+        tms_number=tms,
+        test_name=name,
+        test_id=f"tests/test_mod.py::{name}",
+        status=status,
+        failure_reason=reason,
+        duration="1s",
+    )
+
+
+@pytest.fixture
+def results():
+    return [
+        make_result("TMS_300", reason="AssertionError: a"),
+        make_result("TMS_100", TestStatus.PASSED),
+        make_result("TMS_20", reason="TimeoutError"),
+        make_result("TMS_100", reason="AssertionError: a"),
+        make_result("TMS_400", TestStatus.SKIPPED),
+    ]
+
+
+@pytest.fixture
+def table(results):
+    return ResultTable.from_results(results)
+
+
+class TestResultTable:
+    """Tests for building and reading tables."""
+
+    def test_round_trip(self, results, table):
+        assert len(table) == 5
+        assert table.to_results() == results
+        assert table.row(2) == results[2]
+
+    def test_columns(self, results, table):
+        assert table.column("tms_number") == [r.tms_number for r in results]
+        assert table.column("status") == [r.status for r in results]
+        assert table.column("failure_reason") == [r.failure_reason for r in results]
+        assert table.column("tms_jira_format")[0] == "TMS-300"
+        assert list(table.tms_numbers()) == [300, 100, 20, 100, 400]
+
+    def test_unknown_column(self, table):
+        with pytest.raises(KeyError, match="Unknown column"):
+            table.column("nope")
+
+    def test_stores_distinct_strings_once(self, table):
+        assert table._strings["duration"].values == [None, "1s"]
+
+    def test_keeps_tms_spelling(self):
+        table = ResultTable.from_results([make_result("TMS_00042")])
+        assert table.column("tms_number") == ["TMS_00042"]
+        assert table.row(0).tms_number == "TMS_00042"
+
+    def test_keeps_numbers_too_long_for_int64(self):
+        tms = "TMS_" + "9" * 25
+        table = ResultTable.from_results([make_result(tms), make_result("TMS_1")])
+        assert table.column("tms_number") == [tms, "TMS_1"]
+        assert table.sort_by_tms().column("tms_number") == ["TMS_1", tms]
+        assert table.tms_numbers() == [int("9" * 25), 1]
+
+    def test_keeps_pending_logs_pending(self):
+        calls = []
+        result = make_result("TMS_1")
+        result.defer_execution_log(lambda: calls.append(1) or "log")
+        table = ResultTable.from_results([result])
+        row = table.row(0)
+        assert calls == []
+        assert row.execution_log == "log"
+        assert calls == [1]
+
+    def test_status_counts(self, table):
+        counts = table.status_counts()
+        assert counts[TestStatus.FAILED] == 3
+        assert counts[TestStatus.PASSED] == 1
+        assert counts[TestStatus.ERROR] == 0
+
+    def test_empty_table(self):
+        table = ResultTable.from_results([])
+        assert not table
+        assert table.dedupe().to_results() == []
+        assert table.sort_by_tms().to_results() == []
+
+
+class TestResultTableOperations:
+    """Tests for filtering, sorting, deduplication and grouping."""
+
+    def test_filter_status(self, results, table):
+        failed = table.filter_status({TestStatus.FAILED})
+        assert failed.to_results() == [r for r in results if r.status == TestStatus.FAILED]
+        both = table.filter_status({TestStatus.PASSED, TestStatus.SKIPPED})
+        assert both.column("tms_number") == ["TMS_100", "TMS_400"]
+
+    def test_filter_tms(self, table):
+        assert table.filter_tms({"TMS_100"}).column("status") == [TestStatus.PASSED, TestStatus.FAILED]
+
+    def test_dedupe_keeps_first(self, results, table):
+        unique = table.dedupe()
+        assert unique.column("tms_number") == ["TMS_300", "TMS_100", "TMS_20", "TMS_400"]
+        assert unique.row(1) == results[1]
+
+    def test_dedupe_keeps_differently_spelled_numbers(self):
+        results = [make_result("TMS_007"), make_result("TMS_7"), make_result("TMS_007")]
+        table = ResultTable.from_results(results)
+        assert table.dedupe().column("tms_number") == ["TMS_007", "TMS_7"]
+        assert table.filter_tms({"TMS_7"}).to_results() == [results[1]]
+        assert table.sort_by_tms().column("tms_number") == ["TMS_007", "TMS_007", "TMS_7"]
+
+    def test_sort_matches_list_sort(self, results, table):
+        expected = sorted(results, key=lambda r: r.tms_number)
+        assert table.sort_by_tms().to_results() == expected
+
+    def test_group_by_calls_key_once_per_value(self, table):
+        calls = []
+
+        def key(reason):
+            calls.append(reason)
+            return (reason or "none").split(":")[0]
+
+        groups = table.group_by("failure_reason", key=key)
+        assert list(groups) == ["AssertionError", "none", "TimeoutError"]
+        assert groups["AssertionError"].column("tms_number") == ["TMS_300", "TMS_100"]
+        assert len(calls) == 3  # None and two distinct reasons
+
+    def test_group_by_status(self, table):
+        groups = table.group_by("status")
+        assert len(groups[TestStatus.FAILED]) == 3
+
+    def test_partition(self, table):
+        groups = table.partition(["b", "a", "b", "a", "c"])
+        assert list(groups) == ["b", "a", "c"]
+        assert groups["a"].column("tms_number") == ["TMS_100", "TMS_100"]
+
+    def test_reason_key_column(self, results, table):
+        assert table.column("reason_key") == [r.reason_key for r in results]
+        # Kept on the shared column, so selections reuse it
+        assert table._strings["failure_reason"].reason_keys is not None
+        assert table.dedupe().column("reason_key") == [
+            "AssertionError: a", "No failure reason", "TimeoutError", "No failure reason",
+        ]
+
+    def test_operations_do_not_change_table(self, results, table):
+        table.filter_status({TestStatus.PASSED}).dedupe().sort_by_tms()
+        assert table.to_results() == results
+
+    def test_execution_logs_without_keeping(self, table):
+        table._logs[1] = lambda: "built"
+        assert table.execution_logs(keep=False)[1] == "built"
+        assert callable(table._logs[1])
+        assert table.execution_logs()[1] == "built"
+        assert table._logs[1] == "built"
+
+
+class TestResultColumns:
+    """Tests for reading columns from tables and lists alike."""
+
+    def test_same_for_list_and_table(self, results, table):
+        names = ("tms_number", "test_name", "status")
+        assert result_columns(results, *names) == result_columns(table, *names)
+
+
+class TestResultBatches:
+    """Tests for splitting results into consecutive batches."""
+
+    def test_list_and_table(self, results, table):
+        assert [len(batch) for batch in result_batches(results, 2)] == [2, 2, 1]
+        batches = [batch.to_results() for batch in result_batches(table, 2)]
+        assert batches == list(result_batches(results, 2))
+
+    def test_empty(self):
+        assert list(result_batches([], 10)) == []
@@ -0,0 +1,214 @@
+"""Tests for multi-run trend analysis."""
+
+import os
+import random
+
+import pytest
+
+from reportminer import trend as trend_module
+from reportminer.models import TestResult, TestStatus
+from reportminer.sources import ArchiveMember
+from reportminer.table import ResultTable
+from reportminer.trend import (
+    RunHistory,
+    TestTrend,
+    build_history,
+    format_trends,
+    order_runs,
+    run_labels,
+    sort_trends,
+)
+
+
+P, F, E, S = TestStatus.PASSED, TestStatus.FAILED, TestStatus.ERROR, TestStatus.SKIPPED
+
+
+def history_of(*runs):
+    """RunHistory from runs given as {tms_number: status or [statuses]}."""
+    history = RunHistory()
+    for i, run in enumerate(runs):
+        tms_numbers, statuses = [], []
+        for tms, status in run.items():
+            for s in status if isinstance(status, list) else [status]:
+                tms_numbers.append(tms)
+                statuses.append(s)
+        history.add_run(f"run{i}", tms_numbers, statuses)
+    return history
+
+
+def naive_trend(runs, tms):
+    """Reference computation: outcome per run, then counts and flips."""
+    outcomes = []
+    for run in runs:
+        statuses = run.get(tms, [])
+        statuses = statuses if isinstance(statuses, list) else [statuses]
+        if any(s in (F, E) for s in statuses):
+            outcomes.append("F")
+        elif any(s is P for s in statuses):
+            outcomes.append(".")
+        else:
+            outcomes.append(" ")
+    seen = [o for o in outcomes if o != " "]
+    flips = sum(a != b for a, b in zip(seen, seen[1:]))
+    return "".join(outcomes), len(seen), outcomes.count("F"), flips
+
+
+class TestRunHistory:
+    """Tests for building per-test histories."""
+
+    def test_counts_and_flips(self):
+        history = history_of({"TMS_1": P}, {"TMS_1": F}, {"TMS_1": F}, {"TMS_1": P})
+        trend = history.trend("TMS_1")
+        assert (trend.runs, trend.failures, trend.flips) == (4, 2, 2)
+        assert trend.flakiness == pytest.approx(2 / 3)
+        assert history.outcomes("TMS_1") == ".FF."
+
+    def test_errors_count_as_failures(self):
+        history = history_of({"TMS_1": P}, {"TMS_1": E})
+        assert history.trend("TMS_1").failures == 1
+
+    def test_skipped_and_missing_runs_have_no_outcome(self):
+        history = history_of({"TMS_1": F}, {"TMS_1": S}, {"TMS_2": P}, {"TMS_1": F})
+        trend = history.trend("TMS_1")
+        assert (trend.runs, trend.flips) == (2, 0)
+        assert history.outcomes("TMS_1") == "F  F"
+        assert history.outcomes("TMS_2") == "  . "
+
+    def test_any_failing_result_fails_the_run(self):
+        history = history_of({"TMS_1": [P, F, P]}, {"TMS_1": [P, P]})
+        assert history.outcomes("TMS_1") == "F."
+
+    def test_first_failure_and_failing_since(self):
+        history = history_of({"TMS_1": F}, {"TMS_1": P}, {"TMS_1": F}, {}, {"TMS_1": F})
+        trend = history.trend("TMS_1")
+        assert trend.first_failure == "run0"
+        assert trend.failing_since == "run2"
+
+    def test_not_failing_since_when_latest_passed(self):
+        history = history_of({"TMS_1": F}, {"TMS_1": P})
+        assert history.trend("TMS_1").failing_since is None
+
+    def test_never_failed(self):
+        trend = history_of({"TMS_1": P}, {"TMS_1": P}).trend("TMS_1")
+        assert trend.first_failure is None
+        assert trend.flakiness == 0.0
+
+    def test_single_run_is_not_flaky(self):
+        assert history_of({"TMS_1": F}).trend("TMS_1").flakiness == 0.0
+
+    def test_outcomes_last_runs(self):
+        history = history_of({"TMS_1": P}, {"TMS_1": F}, {"TMS_1": P})
+        assert history.outcomes("TMS_1", last=2) == "F."
+
+    def test_trends_in_first_seen_order(self):
+        history = history_of({"TMS_3": P, "TMS_1": F}, {"TMS_2": F})
+        assert [t.tms_number for t in history.trends()] == ["TMS_3", "TMS_1", "TMS_2"]
+        assert [t.tms_number for t in history.trends(failing_only=True)] == ["TMS_1", "TMS_2"]
+
+    def test_reordered_runs(self):
+        history = RunHistory()
+        history.add_run("a", ["TMS_1", "TMS_2"], [P, F])
+        history.add_run("b", ["TMS_2", "TMS_1"], [P, F])
+        assert history.outcomes("TMS_1") == ".F"
+        assert history.outcomes("TMS_2") == "F."
+
+    def test_add_results_from_list_and_table(self):
+        results = [
+            TestResult(tms_number="TMS_1", test_name="a", test_id="a", status=F),
+            TestResult(tms_number="TMS_2", test_name="b", test_id="b", status=P),
+        ]
+        history = RunHistory()
+        history.add_results("run0", results)
+        history.add_results("run1", ResultTable.from_results(results))
+        assert history.outcomes("TMS_1") == "FF"
+        assert len(history) == 2
+
+    @pytest.mark.parametrize("block_runs", [1, 3, 256])
+    def test_matches_naive_computation(self, monkeypatch, block_runs):
+        monkeypatch.setattr(trend_module, "BLOCK_RUNS", block_runs)
+        rng = random.Random(block_runs)
+        tms_pool = [f"TMS_{i}" for i in range(12)]
+        runs = []
+        for _ in range(20):
+            run = {}
+            for tms in rng.sample(tms_pool, rng.randint(0, len(tms_pool))):
+                run[tms] = [rng.choice([P, P, F, E, S]) for _ in range(rng.randint(1, 2))]
+            runs.append(run)
+
+        history = history_of(*runs)
+        for trend in history.trends():
+            outcomes, ran, failures, flips = naive_trend(runs, trend.tms_number)
+            assert history.outcomes(trend.tms_number) == outcomes
+            assert (trend.runs, trend.failures, trend.flips) == (ran, failures, flips)
+
+
+class TestSortAndFormat:
+    """Tests for ordering and printing trends."""
+
+    def test_flakiest_first(self):
+        history = history_of(
+            {"TMS_1": F, "TMS_2": P, "TMS_3": F},
+            {"TMS_1": F, "TMS_2": F, "TMS_3": P},
+            {"TMS_1": F, "TMS_2": P, "TMS_3": P},
+        )
+        ordered = sort_trends(history.trends())
+        assert [t.tms_number for t in ordered] == ["TMS_2", "TMS_3", "TMS_1"]
+
+    def test_by_tms(self):
+        trends = [TestTrend("TMS_2", 1, 0, 0, None, None), TestTrend("TMS_1", 1, 1, 0, "r", "r")]
+        assert [t.tms_number for t in sort_trends(trends, by_tms=True)] == ["TMS_1", "TMS_2"]
+
+    def test_format(self):
+        history = history_of({"TMS_1": P}, {"TMS_1": F})
+        text = format_trends(history, history.trends())
+        assert "TREND (2 runs, run0 .. run1):" in text
+        assert ".F" in text
+        assert "run1" in text.splitlines()[2]
+        assert "Failing in their latest run: 1" in text
+
+
+class TestBuildHistory:
+    """Tests for building a history from report files."""
+
+    def test_orders_runs_by_modification_time(self, sample_html_report, second_html_report):
+        os.utime(sample_html_report, (2_000_000_000, 2_000_000_000))
+        os.utime(second_html_report, (1_000_000_000, 1_000_000_000))
+        assert order_runs([sample_html_report, second_html_report]) == [second_html_report, sample_html_report]
+
+    def test_orders_runs_by_generated_time(self, sample_html_report, second_html_report):
+        sample_html_report.write_text(sample_html_report.read_text().replace(
+            "<body>", "<body><p>Report generated on 16-Jan-2024 at 09:00:00 by pytest-html</p>",
+        ))
+        second_html_report.write_text(second_html_report.read_text().replace(
+            "<body>", "<body><p>Report generated on 15-Jan-2024 at 09:00:00 by pytest-html</p>",
+        ))
+        os.utime(sample_html_report, (1_000_000_000, 1_000_000_000))
+        os.utime(second_html_report, (2_000_000_000, 2_000_000_000))
+        assert order_runs([sample_html_report, second_html_report]) == [second_html_report, sample_html_report]
+
+    def test_same_named_shards_are_separate_runs(self, sample_html_report, second_html_report, tmp_path):
+        shards = []
+        for shard, report in (("shard1", sample_html_report), ("shard2", second_html_report)):
+            path = tmp_path / shard / "report.html"
+            path.parent.mkdir()
+            path.write_bytes(report.read_bytes())
+            shards.append(path)
+
+        history = build_history(shards, jobs=1)
+        assert history.runs == ["shard1/report.html", "shard2/report.html"]
+        assert history.outcomes("TMS_67890") == "F."
+
+    def test_run_labels(self, tmp_path):
+        archive = tmp_path / "artifacts.zip"
+        sources = [tmp_path / "a" / "report.html", ArchiveMember(archive, "shard1/report.html")]
+        assert run_labels(sources) == ["a/report.html", "artifacts.zip!/shard1/report.html"]
+        assert run_labels(sources[:1]) == ["report.html"]
+
+    def test_builds_from_reports(self, sample_html_report, second_html_report):
+        os.utime(sample_html_report, (1_000_000_000, 1_000_000_000))
+        os.utime(second_html_report, (2_000_000_000, 2_000_000_000))
+        history = build_history([second_html_report, sample_html_report], jobs=1)
+        assert history.runs == [sample_html_report.name, second_html_report.name]
+        assert history.outcomes("TMS_67890") == "F."
+        assert history.outcomes("TMS_99999") == " F"
+        assert history.trend("TMS_99999").failing_since == second_html_report.name
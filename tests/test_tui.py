@@ -76,6 +76,7 @@ class TestTestDetailPanel:
         assert "TMS-67890" in plain
         assert "failed" in plain
         assert "AssertionError" in plain
+        assert "Group: " in plain
 
     def test_handles_brackets_in_logs(self, test_result_with_logs):
         """Ensure brackets in logs don't cause markup errors."""
@@ -448,6 +449,30 @@ class TestTUIMarking:
         assert "*:2" in status
 
 
+class TestTUIReasonFilter:
+    """Tests for showing the tests that share a failure reason."""
+
+    def test_reason_filter(self, test_results):
+        extra = TestResult(
+            tms_number="TMS_004",
+            test_name="test_also_failed",
+            test_id="tests/test.py::test_also_failed",
+            status=TestStatus.FAILED,
+            failure_reason="Error: [code=502]",
+        )
+        app = ReportViewerApp(test_results + [extra])
+        app.current_filter = "reason"
+        app.reason_filter = test_results[2].reason_key
+        assert [r.tms_number for r in app._filtered()] == ["TMS_003", "TMS_004"]
+
+    def test_reason_filter_with_search(self, test_results):
+        app = ReportViewerApp(test_results)
+        app.current_filter = "reason"
+        app.reason_filter = test_results[1].reason_key
+        app.search_query = "003"
+        assert app._filtered() == []
+
+
 class TestTUIListItem:
     """Additional tests for TestListItem widget."""
 
@@ -0,0 +1,162 @@
+"""Tests for the results warehouse."""
+
+import os
+import sqlite3
+import zipfile
+
+import pytest
+
+from reportminer.models import TestStatus
+from reportminer.sources import ArchiveMember
+from reportminer.warehouse import SCHEMA_VERSION, Warehouse, report_digest
+
+
+@pytest.fixture
+def warehouse(isolated_warehouse):
+    with Warehouse() as warehouse:
+        yield warehouse
+
+
+def set_mtime(path, timestamp):
+    os.utime(path, (timestamp, timestamp))
+
+
+def set_generated(path, generated):
+    """Add pytest-html's "Report generated on" line to a report."""
+    path.write_text(path.read_text().replace(
+        "<body>", f"<body>\n<p>Report generated on {generated} by pytest-html v4.1.1</p>", 1,
+    ))
+
+
+class TestIngest:
+    """Tests for storing reports."""
+
+    def test_uses_configured_path(self, warehouse, isolated_warehouse, sample_html_report):
+        warehouse.ingest([sample_html_report], jobs=1)
+        assert warehouse.path == isolated_warehouse
+        assert isolated_warehouse.exists()
+
+    def test_stores_one_run_per_report(self, warehouse, sample_html_report, second_html_report):
+        assert warehouse.ingest([sample_html_report, second_html_report], jobs=1) == (2, 0)
+        assert warehouse.run_count() == 2
+        assert len(warehouse.query()) == 6
+
+    def test_skips_ingested_reports(self, warehouse, sample_html_report):
+        warehouse.ingest([sample_html_report], jobs=1)
+        assert warehouse.ingest([sample_html_report], jobs=1) == (0, 1)
+        assert warehouse.run_count() == 1
+
+    def test_skips_copies_by_content(self, warehouse, tmp_path, sample_html_report):
+        copy = tmp_path / "copy" / "renamed.html"
+        copy.parent.mkdir()
+        copy.write_bytes(sample_html_report.read_bytes())
+        assert warehouse.ingest([sample_html_report, copy], jobs=1) == (1, 1)
+
+    def test_ingests_archive_members(self, warehouse, tmp_path, sample_html_report):
+        archive = tmp_path / "artifacts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.write(sample_html_report, "shard1/report.html")
+        member = ArchiveMember(archive, "shard1/report.html")
+
+        assert report_digest(member) == report_digest(sample_html_report)
+        warehouse.ingest([member], jobs=1)
+        assert len(warehouse.query()) == 3
+
+    def test_keeps_runs_across_connections(self, isolated_warehouse, sample_html_report):
+        with Warehouse() as warehouse:
+            warehouse.ingest([sample_html_report], jobs=1)
+        with Warehouse(isolated_warehouse) as warehouse:
+            assert warehouse.run_count() == 1
+
+    def test_does_not_store_logs(self, warehouse, sample_html_report_with_logs):
+        warehouse.ingest([sample_html_report_with_logs], jobs=1)
+        assert warehouse.query()[0].execution_log is None
+
+    def test_stores_signatures(self, warehouse, sample_html_report):
+        warehouse.ingest([sample_html_report], jobs=1)
+        signatures = {row[0] for row in warehouse.conn.execute("SELECT signature FROM results")}
+        assert signatures == {None, "AssertionError: Expected [<n>] but got [<n>]", "TimeoutError: Connection timed out"}
+
+    def test_rejects_newer_schema(self, isolated_warehouse):
+        conn = sqlite3.connect(isolated_warehouse)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        conn.close()
+        with pytest.raises(ValueError, match="schema version"):
+            Warehouse().run_count()
+
+
+class TestQuery:
+    """Tests for reading results back."""
+
+    @pytest.fixture
+    def filled(self, warehouse, sample_html_report, second_html_report):
+        # The second report is the more recent run
+        set_mtime(sample_html_report, 1_700_000_000)
+        set_mtime(second_html_report, 1_700_086_400)
+        warehouse.ingest([sample_html_report, second_html_report], jobs=1)
+        return warehouse
+
+    def test_orders_runs_by_generated_time(self, warehouse, sample_html_report, second_html_report):
+        # Copied artifacts: the older run has the newer modification time
+        set_generated(sample_html_report, "16-Jan-2024 at 09:00:00")
+        set_generated(second_html_report, "15-Jan-2024 at 09:00:00")
+        set_mtime(sample_html_report, 1_700_000_000)
+        set_mtime(second_html_report, 1_700_086_400)
+        warehouse.ingest([sample_html_report, second_html_report], jobs=1)
+
+        assert {r.timestamp for r in warehouse.query(last_runs=1)} == {"2024-01-15"}
+        run_times = [row[0] for row in warehouse.conn.execute("SELECT run_time FROM runs ORDER BY run_time")]
+        assert run_times == ["2024-01-15T09:00:00", "2024-01-16T09:00:00"]
+
+    def test_round_trips_fields(self, filled):
+        result = next(r for r in filled.query() if r.tms_number == "TMS_67890" and r.status == TestStatus.FAILED)
+        assert result.test_name == "test_TMS_67890_checkout"
+        assert result.test_id == "tests/test_example.py::test_TMS_67890_checkout"
+        assert result.failure_reason == "AssertionError: Expected [200] but got [500]"
+        assert result.duration == "2.45s"
+        assert result.timestamp == "2024-01-15"
+
+    def test_newest_run_first(self, filled):
+        timestamps = [r.timestamp for r in filled.query()]
+        assert timestamps == ["2024-01-16"] * 3 + ["2024-01-15"] * 3
+
+    def test_filters_status(self, filled):
+        failed = filled.query(statuses={TestStatus.FAILED})
+        assert sorted(r.tms_number for r in failed) == ["TMS_11111", "TMS_67890", "TMS_99999"]
+
+    def test_filters_tms(self, filled):
+        results = filled.query(tms_numbers=["TMS_12345"])
+        assert [r.timestamp for r in results] == ["2024-01-16", "2024-01-15"]
+
+    def test_last_runs(self, filled):
+        results = filled.query(last_runs=1)
+        assert {r.timestamp for r in results} == {"2024-01-16"}
+
+    def test_combined_filters(self, filled):
+        results = filled.query(statuses={TestStatus.PASSED}, last_runs=1, tms_numbers=["TMS_67890"])
+        assert [(r.tms_number, r.status) for r in results] == [("TMS_67890", TestStatus.PASSED)]
+
+    def test_latest_per_tms(self, filled):
+        results = filled.query(latest=True)
+        assert [(r.tms_number, r.timestamp) for r in results] == [
+            ("TMS_12345", "2024-01-16"),
+            ("TMS_67890", "2024-01-16"),
+            ("TMS_99999", "2024-01-16"),
+            ("TMS_11111", "2024-01-15"),
+        ]
+
+    def test_latest_is_picked_before_status_filter(self, filled):
+        # TMS_67890 failed in the older run but passed in the latest one
+        failed = filled.query(statuses={TestStatus.FAILED}, latest=True)
+        assert [r.tms_number for r in failed] == ["TMS_99999", "TMS_11111"]
+
+    def test_empty_warehouse(self, warehouse):
+        assert warehouse.query() == []
+
+    def test_uses_indexes(self, filled):
+        plan = " ".join(
+            row[-1] for row in filled.conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM results WHERE tms_number = ?", ("TMS_1",)
+            )
+        )
+        assert "results_tms" in plan